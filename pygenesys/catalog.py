@@ -0,0 +1,133 @@
+"""
+This file contains the catalog of library technologies and commodities.
+
+The objects in the library modules (e.g. ``NUCLEAR_ELC`` or ``ELC_DEMAND``)
+are changed by the input files that use them. The catalog holds a frozen
+template of every library object, built from freshly imported library
+modules, and hands out independent copies. Copies share unchanged data
+with their template, so many model variants can be built in one process,
+or concurrently in threads, without interfering with each other.
+
+```py
+from pygenesys import catalog
+NUCLEAR_ELC = catalog.instance('NUCLEAR_ELC')
+ELC_DEMAND = catalog.instance('ELC_DEMAND')
+```
+"""
+
+import contextlib
+import importlib
+import sys
+import threading
+import types
+
+from pygenesys.technology.technology import Technology
+from pygenesys.commodity.commodity import Commodity
+
+library_modules = ['pygenesys.commodity.resource',
+                   'pygenesys.commodity.demand',
+                   'pygenesys.commodity.emissions',
+                   'pygenesys.technology.electric',
+                   'pygenesys.technology.storage',
+                   'pygenesys.technology.supply',
+                   'pygenesys.technology.thermal',
+                   'pygenesys.technology.transmission']
+
+# modules that define classes are shared, every other module in these
+# packages holds library objects and is re-imported by ``fresh_library``
+library_packages = ('pygenesys.technology.', 'pygenesys.commodity.')
+class_modules = ('pygenesys.technology.technology',
+                 'pygenesys.commodity.commodity')
+
+_templates = {}
+_templates_lock = threading.Lock()
+_modules_lock = threading.RLock()
+
+
+def _is_library_module(name):
+    """
+    Returns ``True`` if the module holds library technologies or
+    commodities.
+    """
+    return name.startswith(library_packages) and (name not in class_modules)
+
+
+@contextlib.contextmanager
+def fresh_library():
+    """
+    Within this context, library modules are imported anew, so their
+    technologies and commodities start empty. The previously imported
+    library modules are restored afterwards.
+    """
+    with _modules_lock:
+        saved = {name: module for name, module in sys.modules.items()
+                 if _is_library_module(name)}
+        for name in saved:
+            del sys.modules[name]
+
+        try:
+            yield
+        finally:
+            for name in [n for n in sys.modules if _is_library_module(n)]:
+                del sys.modules[name]
+                parent, _, child = name.rpartition('.')
+                if (name not in saved) and \
+                   hasattr(sys.modules[parent], child):
+                    delattr(sys.modules[parent], child)
+            for name, module in saved.items():
+                sys.modules[name] = module
+                parent, _, child = name.rpartition('.')
+                setattr(sys.modules[parent], child, module)
+
+
+def templates():
+    """
+    Returns the frozen templates of every library technology and
+    commodity, keyed by their variable names. The templates are built
+    the first time this function is called.
+
+    Returns
+    -------
+    templates : mapping
+        A read-only mapping of names to frozen templates.
+    """
+    with _templates_lock:
+        if not _templates:
+            with fresh_library():
+                for module_name in library_modules:
+                    module = importlib.import_module(module_name)
+                    for name, obj in vars(module).items():
+                        if isinstance(obj, (Technology, Commodity)) and \
+                           (name not in _templates):
+                            _templates[name] = obj.freeze()
+
+    return types.MappingProxyType(_templates)
+
+
+def get_template(name):
+    """
+    Returns the frozen template of a library technology or commodity.
+
+    Parameters
+    ----------
+    name : string
+        The variable name in the library, e.g. 'NUCLEAR_ELC'.
+    """
+    catalog = templates()
+    if name not in catalog:
+        raise ValueError((f"{name} is not in the catalog. Options are "
+                          f"{sorted(catalog)}."))
+
+    return catalog[name]
+
+
+def instance(name):
+    """
+    Returns a new, mutable copy of a library technology or commodity.
+
+    Parameters
+    ----------
+    name : string
+        The variable name in the library, e.g. 'NUCLEAR_ELC'.
+    """
+    return get_template(name).instance()
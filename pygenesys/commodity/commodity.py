@@ -1,5 +1,5 @@
-from pygenesys.utils.growth_model import choose_growth_method
-from pygenesys.utils.tsprocess import aggregate
+from pygenesys.utils.growth_model import choose_growth_method, project_growth
+from pygenesys.utils import template
 import numpy as np
 
 # ==============================================================================
@@ -15,6 +15,8 @@ class Commodity(object):
     This class contains information about a commodity used in a
     Temoa model.
     """
+    __slots__ = ('comm_name', 'comm_label', 'units', 'description',
+                 '_frozen')
 
     def __init__(self,
                  comm_name,
@@ -54,6 +56,24 @@ class Commodity(object):
                 f"\"{self.comm_label}\"," +
                 f"\"{self.description} in {self.units}\")")
 
+    def __setattr__(self, name, value):
+        template.check_mutable(self)
+        object.__setattr__(self, name, value)
+
+    def freeze(self):
+        """
+        Makes this commodity an immutable template. Returns the
+        commodity.
+        """
+        return template.freeze(self)
+
+    def instance(self):
+        """
+        Returns a mutable copy of this commodity that shares
+        its per-region data until they are replaced.
+        """
+        return template.instance(self)
+
     def _db_entry(self):
         return (self.comm_name,
                 self.comm_label,
@@ -70,6 +90,7 @@ class DemandCommodity(Commodity):
     """
     This class holds data for a demand commodity in Temoa.
     """
+    __slots__ = ('demand', 'distribution', 'seg_frac')
 
     def __init__(self,
                  comm_name,
@@ -99,6 +120,10 @@ class DemandCommodity(Commodity):
         demand : dictionary
             The dictionary containing the commodity demand for a given
             region.
+        seg_frac : dictionary
+            The fraction of the year represented by each time slice of
+            the distribution in a given region. Only set when the
+            distribution is calculated from data.
         """
         super().__init__(comm_name,
                          units,
@@ -106,6 +131,7 @@ class DemandCommodity(Commodity):
                          description,)
         self.demand = {}
         self.distribution = {}
+        self.seg_frac = {}
 
         return
 
@@ -139,6 +165,7 @@ class DemandCommodity(Commodity):
         growth_method : string
             Specifies how the future demand will grow. Default is linear.
         """
+        template.check_mutable(self)
 
         growth_calculator = choose_growth_method(growth_method)
         demand_forecast = growth_calculator(init_demand,
@@ -155,6 +182,79 @@ class DemandCommodity(Commodity):
 
         return
 
+    def add_demands(self,
+                    regions,
+                    init_demand,
+                    start_year,
+                    end_year,
+                    N_years,
+                    growth_rate=0.0,
+                    growth_method='linear',
+                    cap=None,
+                    ):
+        """
+        Updates the ``demand`` dictionary with many regions at once. The
+        forecasts for every region are calculated in a single call to
+        ``growth_model.project_growth``.
+
+        Parameters
+        ----------
+        regions : list of strings
+            The labels for each region.
+        init_demand : float or array
+            The demand in the first year of the simulation, for each region.
+        start_year : integer
+            The first year of the simulation.
+        end_year : integer
+            The last year of the simulation.
+        N_years : integer
+            The number of years simulated between ``start_year`` and
+            ``end_year``.
+        growth_rate : float or array
+            The rate of growth, for each region. Default is zero growth.
+        growth_method : string
+            Specifies how the future demand will grow. Default is linear.
+        cap : float or array
+            The maximum demand for each region. Only used for logistic
+            growth.
+        """
+        template.check_mutable(self)
+        init_demand = np.broadcast_to(init_demand, (len(regions),))
+        demand_forecast = project_growth(init_demand,
+                                         growth_rate,
+                                         start_year,
+                                         end_year,
+                                         N_years,
+                                         growth_method,
+                                         cap)
+        self.set_demands(regions, demand_forecast)
+
+        return
+
+    def set_demands(self, regions, demand_forecast):
+        """
+        Assigns precalculated demand forecasts to many regions. Use this
+        function to assign one scenario from ``growth_model.project_growth``.
+
+        Parameters
+        ----------
+        regions : list of strings
+            The labels for each region.
+        demand_forecast : numpy array
+            The (region x year) array of demands.
+        """
+        template.check_mutable(self)
+        if len(regions) != len(demand_forecast):
+            raise ValueError(f"Got {len(regions)} regions and "
+                             f"{len(demand_forecast)} demand forecasts.")
+
+        overwritten = [r for r in regions if r in self.demand]
+        if len(overwritten) > 0:
+            print(f'Regions {overwritten} already in database. Overwriting.')
+        self.demand.update(zip(regions, demand_forecast))
+
+        return
+
     def set_distribution(self,
                          region,
                          data,
@@ -165,14 +265,17 @@ class DemandCommodity(Commodity):
                          groupby='season',
                          add_peak=False,
                          add_weekend=False,
-                         how=None):
+                         how=None,
+                         hour_boundaries=None):
         """
         This function generates a distribution time series. The sum
         of this distribution must be equal to unity. If users
         do not specify a distribution, the demand will be uniform in
-        each time slice. If data is supplied, it should have at least
-        the same temporal resolution as the number of hours and number
-        of seasons.
+        each time slice. When the distribution is calculated from data,
+        the fraction of the year each time slice represents is saved
+        in ``seg_frac`` and used for the "SegFrac" table. If data is
+        supplied, it should have at least the same temporal resolution
+        as the number of hours and number of seasons.
         E.g.
         Suppose:
             N_seasons = 4
@@ -199,17 +302,27 @@ class DemandCommodity(Commodity):
             each period.
         how : string
             The aggregation method. Only for use with the `tsam` package.
+        hour_boundaries : list of integers
+            The first hour of each time of day block when ``n_hours`` is
+            less than 24. E.g. ``[0, 7, 11, 17, 21]``. Default is uniform
+            blocks.
         """
+        template.check_mutable(self)
         if normalize:
-            distribution = aggregate(data,
-                                     n_seasons,
-                                     n_hours,
-                                     kind,
-                                     groupby,
-                                     add_peak,
-                                     add_weekend,
-                                     how
-                                     )
+            # pandas is only imported when a distribution is built from data
+            from pygenesys.utils.tsprocess import aggregate
+            distribution, seg_frac = aggregate(data,
+                                               n_seasons,
+                                               n_hours,
+                                               kind,
+                                               groupby,
+                                               add_peak,
+                                               add_weekend,
+                                               how,
+                                               hour_boundaries=hour_boundaries,
+                                               return_weights=True,
+                                               )
+            self.seg_frac[region] = seg_frac.flatten()
         elif not normalize:
             distribution = data
 
@@ -228,6 +341,7 @@ class EmissionsCommodity(Commodity):
     """
     This class holds data for an emissions commodity in Temoa.
     """
+    __slots__ = ('emissions_limit',)
 
     def __init__(self,
                  comm_name,
@@ -290,6 +404,7 @@ class EmissionsCommodity(Commodity):
                  requiring the constraint year be exactly 2026 or
                  similar.
         """
+        template.check_mutable(self)
 
         if region in self.emissions_limit:
             print(f'Region {region} already in database. Overwriting.')
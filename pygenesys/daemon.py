@@ -0,0 +1,276 @@
+"""
+This file contains the ``BuildDaemon``, which rebuilds a model whenever
+its input file or data files change.
+
+The daemon runs in one long-lived process, so the library, the parsed
+time series, and the aggregated profiles stay in memory between builds.
+Only files whose modification time changed are read again. Every build
+still runs the whole input file and writes every table; only the parsing
+of unchanged data files is skipped. Each build writes the SQLite database
+to a temporary file and then replaces the old database, so Temoa never
+sees a half-written database.
+
+A small HTTP API on ``localhost`` reports the status of the daemon and
+triggers builds:
+    * ``GET /status`` : the state of the daemon and the last build.
+    * ``POST /build`` : builds the model and returns the result.
+
+Start the daemon with
+
+```bash
+$ genesys --infile my_model.py --daemon --port 8765
+```
+"""
+
+import http.server
+import json
+import os
+import threading
+import time
+
+from pygenesys import driver
+from pygenesys.model_file import is_model_file, read_model_file
+from pygenesys.session import BuildSession
+from pygenesys.utils import tsprocess
+
+
+class BuildDaemon(object):
+    """
+    This class watches a PyGenesys input file and rebuilds the model
+    when it, or a time series it reads, changes.
+    """
+
+    def __init__(self, infile_path, interval=1.0):
+        """
+        Initialize the daemon.
+
+        Parameters
+        ----------
+        infile_path : string
+            The path to a Python input file or a declarative model file.
+        interval : float
+            The number of seconds between checks for changed files.
+        """
+        self.infile_path = os.path.abspath(infile_path)
+        self.interval = interval
+        self.session = BuildSession()
+        self.last_build = None
+        self.N_builds = 0
+        self._mtimes = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server = None
+
+        return
+
+    def watched_files(self):
+        """
+        Returns the input file and every time series file read by
+        the process.
+        """
+        files = {self.infile_path}
+        files.update(tsprocess.cached_files())
+
+        return sorted(files)
+
+    def _snapshot(self):
+        """
+        Returns the modification time of every watched file.
+        """
+        mtimes = {}
+        for path in self.watched_files():
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+
+        return mtimes
+
+    def changed_files(self):
+        """
+        Returns the watched files that changed since the last build.
+        """
+        mtimes = self._snapshot()
+
+        return [path for path, mtime in mtimes.items()
+                if self._mtimes.get(path, -1) != mtime]
+
+    def build(self):
+        """
+        Builds the model and writes the database and Temoa config file.
+
+        Returns
+        -------
+        result : dictionary
+            The build status ('ok' or 'error'), the time it took in
+            seconds, the database path, the files that changed, and
+            the error message if the build failed.
+        """
+        with self._lock:
+            changed = self.changed_files()
+            start = time.perf_counter()
+            result = {'status': 'ok',
+                      'changed': changed,
+                      'output_db': None,
+                      'error': None}
+            try:
+                result['output_db'] = self._write()
+            except Exception as error:
+                result['status'] = 'error'
+                result['error'] = f'{type(error).__name__}: {error}'
+            result['seconds'] = time.perf_counter() - start
+            result['finished'] = time.time()
+
+            # files read for the first time during this build are
+            # recorded as well
+            self._mtimes = self._snapshot()
+            self.last_build = result
+            self.N_builds += 1
+
+        return result
+
+    def _write(self):
+        """
+        Writes the database to a temporary file, replaces the old
+        database, and writes the config file. Returns the database path.
+        """
+        if is_model_file(self.infile_path):
+            spec = read_model_file(self.infile_path)
+            out_path = os.path.join(os.path.dirname(self.infile_path),
+                                    spec['model']['database_filename'])
+            tmp_path = out_path + '.building'
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            model, infile = driver.build_model_file(self.infile_path,
+                                                    output_db=tmp_path)
+        else:
+            infile = self.session.load(self.infile_path)
+            out_path = driver.output_path(infile)
+            tmp_path = out_path + '.building'
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            driver.build_model(infile, output_db=tmp_path)
+
+        os.replace(tmp_path, out_path)
+        driver.write_config(infile)
+
+        return out_path
+
+    def poll(self):
+        """
+        Builds the model if a watched file changed.
+
+        Returns
+        -------
+        result : dictionary or None
+            The build result, or ``None`` if nothing changed.
+        """
+        if len(self.changed_files()) == 0:
+            return None
+
+        return self.build()
+
+    def status(self):
+        """
+        Returns the state of the daemon and the result of the last build.
+        """
+        return {'infile': self.infile_path,
+                'N_builds': self.N_builds,
+                'watched_files': self.watched_files(),
+                'last_build': self.last_build}
+
+    def serve(self, host='127.0.0.1', port=8765):
+        """
+        Starts the HTTP API in a background thread.
+
+        Parameters
+        ----------
+        host : string
+            The address to listen on. Default is localhost only.
+        port : integer
+            The port to listen on. Zero picks a free port.
+
+        Returns
+        -------
+        address : tuple
+            The (host, port) the API is listening on.
+        """
+        daemon = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+
+            def _respond(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == '/status':
+                    self._respond(200, daemon.status())
+                else:
+                    self._respond(404, {'error': f'Unknown path {self.path}'})
+
+            def do_POST(self):
+                if self.path == '/build':
+                    self._respond(200, daemon.build())
+                else:
+                    self._respond(404, {'error': f'Unknown path {self.path}'})
+
+            def log_message(self, format, *args):
+                return
+
+        self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=self._server.serve_forever,
+                                  daemon=True)
+        thread.start()
+
+        return self._server.server_address
+
+    def run(self, host='127.0.0.1', port=8765):
+        """
+        Builds the model, starts the HTTP API, and rebuilds the model
+        whenever a watched file changes. Runs until ``stop`` is called
+        or the process is interrupted.
+
+        Parameters
+        ----------
+        host : string
+            The address to listen on.
+        port : integer
+            The port to listen on.
+        """
+        result = self.build()
+        print(f"Build {result['status']} in {result['seconds']:.2f} s")
+        address = self.serve(host, port)
+        print(f"Watching {self.infile_path}. API at "
+              f"http://{address[0]}:{address[1]}")
+
+        try:
+            while not self._stop.wait(self.interval):
+                result = self.poll()
+                if result is not None:
+                    print(f"Build {result['status']} in "
+                          f"{result['seconds']:.2f} s")
+                    if result['error'] is not None:
+                        print(result['error'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+        return
+
+    def stop(self):
+        """
+        Stops the watch loop and the HTTP API.
+        """
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+        return
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import os
+import re
 from datetime import date
 
 months = [
@@ -18,6 +19,38 @@ months = [
     "december",
 ]
 
+generator_columns = [
+    "Entity ID",
+    "Entity Name",
+    "Plant Name",
+    "Sector",
+    "Plant State",
+    "Nameplate Capacity (MW)",
+    "Technology",
+    "Operating Year",
+    "Status",
+    "Balancing Authority Code",
+    "County",
+]
+
+generator_dtypes = {
+    "Entity Name": str,
+    "Plant Name": str,
+    "Sector": str,
+    "Plant State": str,
+    "Nameplate Capacity (MW)": float,
+    "Technology": str,
+    "Operating Year": int,
+    "Status": str,
+    "Balancing Authority Code": str,
+    "County": str,
+}
+
+cache_dir = os.environ.get("PYGENESYS_CACHE",
+                           os.path.join(os.path.expanduser("~"),
+                                        ".pygenesys",
+                                        "eia860m"))
+
 eia_techs = [
     "Petroleum Liquids",
     "Onshore Wind Turbine",
@@ -92,7 +125,152 @@ def capitalize_string(name_string):
     return cap_string
 
 
-def get_eia_generators(month=None, year=None):
+def read_eia_workbook(workbook):
+    """
+    Parses the "Operating" sheet of an EIA form 860M workbook. The
+    number of header rows has changed between releases, so two
+    formats are tried.
+
+    Parameters
+    ----------
+    workbook : string
+        The url or path to the ``.xlsx`` file.
+
+    Returns
+    -------
+    df : pandas dataframe
+        Holds the data from EIA form 860M, indexed by "Entity ID".
+    """
+    try:
+        df = pd.read_excel(
+            workbook,
+            sheet_name="Operating",
+            skipfooter=2,
+            skiprows=2,
+            usecols=generator_columns,
+            index_col="Entity ID",
+        )
+    except BaseException:
+        print("Reading failed. Trying different sheet format.")
+        df = pd.read_excel(
+            workbook,
+            sheet_name="Operating",
+            skipfooter=2,
+            skiprows=1,
+            usecols=generator_columns,
+            index_col="Entity ID",
+        )
+
+    df = df.dropna(subset=["Nameplate Capacity (MW)", "Operating Year"])
+    for column, dtype in generator_dtypes.items():
+        if dtype is str:
+            # keep missing values missing
+            df[column] = df[column].astype(str).where(df[column].notna())
+        else:
+            df[column] = df[column].astype(dtype)
+
+    return df
+
+
+def _cache_path(month, year, directory=None, extension="parquet"):
+    """
+    Returns the path to the cached 860M data for a month and year.
+    """
+    if directory is None:
+        directory = cache_dir
+
+    return os.path.join(directory,
+                        f"{month.lower()}_generator{year}.{extension}")
+
+
+def _find_cache(month, year, directory=None):
+    """
+    Returns the path to an existing cache file, or ``None``.
+    """
+    for extension in ["parquet", "pkl"]:
+        path = _cache_path(month, year, directory, extension)
+        if os.path.exists(path):
+            return path
+
+    return None
+
+
+def _read_cache(path, columns=None):
+    """
+    Reads cached 860M data. Parquet files only load the requested columns.
+    """
+    if columns is not None:
+        columns = [c for c in columns if c != "Entity ID"]
+
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = pd.read_pickle(path)
+        if columns is not None:
+            df = df[columns]
+
+    return df
+
+
+def cache_eia_generators(workbook, month=None, year=None, directory=None):
+    """
+    Converts an EIA form 860M workbook into a typed columnar cache file.
+    Parquet is used if ``pyarrow`` is installed (``pip install
+    .[parquet]``), otherwise the dataframe is pickled.
+
+    Parameters
+    ----------
+    workbook : string or pandas dataframe
+        The url or path to the ``.xlsx`` file (e.g.
+        ``pygenesys.data.library.eia_electric_generators``) or an already
+        parsed dataframe.
+    month : string
+        The month of the data. If ``None``, it is read from a file name
+        such as ``april_generator2021.xlsx``.
+    year : integer
+        The year of the data. If ``None``, it is read from the file name.
+    directory : string
+        The cache directory. Default is ``eia_data.cache_dir``, which may
+        be set with the ``PYGENESYS_CACHE`` environment variable.
+
+    Returns
+    -------
+    path : string
+        The path to the cache file.
+    """
+    if (month is None) or (year is None):
+        match = re.match(r"([a-z]+)_generator(\d{4})",
+                         os.path.basename(str(workbook)).lower())
+        if match is None:
+            raise ValueError(("Please specify a month and a year. They "
+                              f"cannot be read from {workbook}."))
+        month, year = match.group(1), int(match.group(2))
+
+    if isinstance(workbook, pd.DataFrame):
+        df = workbook
+    else:
+        df = read_eia_workbook(workbook)
+
+    if directory is None:
+        directory = cache_dir
+    os.makedirs(directory, exist_ok=True)
+
+    path = _cache_path(month, year, directory)
+    try:
+        df.to_parquet(path)
+    except ImportError:
+        path = _cache_path(month, year, directory, extension="pkl")
+        df.to_pickle(path)
+
+    return path
+
+
+def get_eia_generators(month=None,
+                       year=None,
+                       columns=None,
+                       use_cache=True,
+                       offline=False,
+                       directory=None):
     """
     This function returns a pandas dataframe containing information on
     all electric generators in the United States from a recent EIA form
@@ -100,31 +278,32 @@ def get_eia_generators(month=None, year=None):
     subtracts four months from the current month to guarantee the file
     exists to be downloaded.
 
+    The first time a (month, year) is requested, the workbook is
+    downloaded and converted into a local cache file. Later calls read
+    the cache instead of downloading and parsing the workbook.
+
     Parameters
     ----------
     month : string
         The month of interest
     year : string
         The year of interest
+    columns : list of strings
+        The columns to load. Default is all of the columns.
+    use_cache : boolean
+        Read from and write to the local cache. Default is True.
+    offline : boolean
+        Never access the network. Raises a ``ValueError`` if the data
+        are not in the cache. See ``cache_eia_generators`` to build the
+        cache from a local workbook.
+    directory : string
+        The cache directory. Default is ``eia_data.cache_dir``.
 
     Returns
     -------
     df : pandas dataframe
         Holds the data from EIA form 860M
     """
-    columns = [
-        "Entity ID",
-        "Entity Name",
-        "Plant Name",
-        "Sector",
-        "Plant State",
-        "Nameplate Capacity (MW)",
-        "Technology",
-        "Operating Year",
-        "Status",
-        "Balancing Authority Code",
-        "County",
-    ]
 
     # initialize with invalid options
     m = "thermidor"
@@ -148,6 +327,17 @@ def get_eia_generators(month=None, year=None):
         print(f"Month {month} / Year {year}")
         raise ValueError(("Please specify a month and a year."))
 
+    if use_cache or offline:
+        path = _find_cache(m, y, directory)
+        if path is not None:
+            return _read_cache(path, columns)
+
+    if offline:
+        raise ValueError(
+            f"No cached data for Month: {m} and Year: {y}. "
+            + "Use eia_data.cache_eia_generators to build the cache."
+        )
+
     url = (
         f"https://www.eia.gov/electricity/data/eia860m/archive/xls/"
         + f"{m}_generator{y}.xlsx"
@@ -155,33 +345,20 @@ def get_eia_generators(month=None, year=None):
 
     try:
         print(f"Downloading from {url}\n")
-        df = pd.read_excel(
-            url,
-            sheet_name="Operating",
-            skipfooter=2,
-            skiprows=2,
-            usecols=columns,
-            index_col="Entity ID",
-        )
+        df = read_eia_workbook(url)
         print("Download successful.")
     except BaseException:
-        print("Download failed. Trying different sheet format.")
-        try:
-            df = pd.read_excel(
-                url,
-                sheet_name="Operating",
-                skipfooter=2,
-                skiprows=1,
-                usecols=columns,
-                index_col="Entity ID",
-            )
-            print("Download successful.")
-        except ValueError:
-            fail_str = (
-                f"Download failed. File not found"
-                + f" for Month: {month} and Year: {year}"
-            )
-            raise ValueError(fail_str)
+        fail_str = (
+            f"Download failed. File not found"
+            + f" for Month: {month} and Year: {year}"
+        )
+        raise ValueError(fail_str)
+
+    if use_cache:
+        cache_eia_generators(df, m, y, directory)
+
+    if columns is not None:
+        df = df[[c for c in columns if c != "Entity ID"]]
 
     return df
 
@@ -314,3 +491,145 @@ def get_existing_capacity(df, region, technology):
     )
 
     return existing_capacity
+
+
+class CapacityCube(object):
+    """
+    This class holds the existing capacity from EIA form 860M summed
+    by region, technology, and operating year. The cube is built with a
+    single groupby, so looking up the existing capacity of any region
+    and technology does not scan the 860M data again.
+    """
+
+    def __init__(self, df):
+        """
+        Builds the capacity cube.
+
+        Parameters
+        ----------
+        df : pandas dataframe
+            The dataframe for EIA form 860M
+        """
+        grouped = df.groupby(["Plant State",
+                              "County",
+                              "Technology",
+                              "Operating Year"],
+                             dropna=False)[
+            "Nameplate Capacity (MW)"].sum()
+
+        state_cap = grouped.groupby(level=["Plant State",
+                                           "Technology",
+                                           "Operating Year"]).sum()
+        county_cap = grouped.groupby(level=["County",
+                                            "Technology",
+                                            "Operating Year"]).sum()
+
+        self.states = self._nested_dict(state_cap)
+        self.counties = self._nested_dict(county_cap)
+        self.technologies = set(df["Technology"].dropna())
+
+        return
+
+    @staticmethod
+    def _nested_dict(capacity):
+        """
+        Converts a (region, technology, year) series into nested
+        dictionaries, ``{region: {technology: {year: capacity}}}``,
+        keeping only positive capacities.
+        """
+        nested = {}
+        capacity = capacity[capacity > 0.0]
+        for (region, tech, year), cap in capacity.items():
+            if pd.isna(region) or pd.isna(tech):
+                continue
+            region_dict = nested.setdefault(region, {})
+            region_dict.setdefault(tech, {})[int(year)] = cap
+
+        return nested
+
+    def _region_dict(self, region):
+        """
+        Returns the technologies and capacities in a region. Region may
+        be state or county, following ``get_region_techs``.
+        """
+        if len(region) == 2:
+            try:
+                return self.states[region.upper()]
+            except KeyError:
+                raise ValueError(
+                    f"Detected state abbreviation."
+                    + f" Abbreviation {region} not found."
+                )
+        else:
+            try:
+                return self.counties[capitalize_string(region)]
+            except KeyError:
+                raise ValueError(
+                    f"Detected county name."
+                    + f"County name {region} not found."
+                )
+
+    def existing_capacity(self, region, technology):
+        """
+        Gets the existing capacity for a particular technology and region.
+        Returns the same result as ``get_existing_capacity``.
+
+        Parameters
+        ----------
+        region : string
+            The region of interest. Region may be state or county. The
+            state must be given as an abbreviation a county must be
+            provided as a full name.
+        technology : string
+            The electric generating technology of interest. E.g. "Nuclear"
+
+        Returns
+        -------
+        existing_capacity : dictionary
+            A dictionary containing existing capacity with years
+            as keys and capacity, in MW, as values.
+        """
+        region_dict = self._region_dict(region)
+        technology = capitalize_string(technology)
+        if technology not in region_dict:
+            raise ValueError(
+                f"Technology {technology} does not exist "
+                + f"within specified region.\n"
+                + f"The following technologies are accepted:\n"
+                + f"{eia_techs}"
+            )
+
+        return dict(region_dict[technology])
+
+    def bulk_existing_capacity(self, regions, technologies=None):
+        """
+        Gets the existing capacity of many technologies in many regions.
+
+        Parameters
+        ----------
+        regions : list of strings
+            The regions of interest. Each region may be a state or county.
+        technologies : list of strings
+            The technologies of interest. Default is ``eia_techs``.
+
+        Returns
+        -------
+        existing_capacity : dictionary
+            ``{technology: {region: {year: capacity}}}``. The inner
+            dictionaries can be passed directly as
+            ``Technology.add_regional_data(region, existing=...)``.
+            Technologies without capacity in a region are left out.
+        """
+        if technologies is None:
+            technologies = eia_techs
+
+        existing_capacity = {}
+        for region in regions:
+            region_dict = self._region_dict(region)
+            for technology in technologies:
+                tech_key = capitalize_string(technology)
+                if tech_key in region_dict:
+                    tech_dict = existing_capacity.setdefault(technology, {})
+                    tech_dict[region] = dict(region_dict[tech_key])
+
+        return existing_capacity
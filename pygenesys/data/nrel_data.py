@@ -1,6 +1,8 @@
 from pygenesys.data.library import nrel_electric_costs
 import pandas as pd
 import numpy as np
+import json
+import os
 
 
 renewable_techs = ['LandbasedWind',
@@ -13,6 +15,234 @@ renewable_techs = ['LandbasedWind',
                    'CSP',]
 
 
+atb_columns = ['atb_year',
+               'core_metric_parameter',
+               'core_metric_case',
+               'technology',
+               'techdetail',
+               'scenario',
+               'core_metric_variable',
+               'value']
+
+# the store is sorted by these columns, in this order
+atb_index = ['atb_year',
+             'technology',
+             'techdetail',
+             'scenario',
+             'core_metric_parameter',
+             'year']
+
+atb_categories = ['core_metric_parameter',
+                  'core_metric_case',
+                  'technology',
+                  'techdetail',
+                  'scenario']
+
+cache_dir = os.environ.get("PYGENESYS_ATB_CACHE",
+                           os.path.join(os.path.expanduser("~"),
+                                        ".pygenesys",
+                                        "atb"))
+
+# stores that could not be read with filters, loaded once per process and
+# keyed by ``_file_key`` of the store
+_loaded_stores = {}
+
+
+def _store_path(directory=None, extension="parquet"):
+    """
+    Returns the path to the ATB store.
+    """
+    if directory is None:
+        directory = cache_dir
+
+    return os.path.join(directory, f"ATBe.{extension}")
+
+
+def _file_key(path):
+    """
+    Identifies a file by its absolute path and modification time, so
+    the store is rebuilt when its source changes.
+    """
+    return [os.path.abspath(path), os.path.getmtime(path)]
+
+
+def _read_source(directory=None):
+    """
+    Returns the key of the ``.csv`` file the store was built from, or
+    ``None`` if it was not recorded.
+    """
+    try:
+        with open(_store_path(directory, extension="source")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _find_store(directory=None, csv=None):
+    """
+    Returns the path to an existing ATB store, or ``None`` if there is
+    no store or it is out of date.
+
+    The store is out of date if ``csv`` is not the file it was built
+    from, or if that file was modified since. With ``csv=None``, the
+    recorded source is checked if it still exists.
+    """
+    for extension in ["parquet", "pkl"]:
+        path = _store_path(directory, extension)
+        if os.path.exists(path):
+            break
+    else:
+        return None
+
+    source = _read_source(directory)
+    if csv is None and source is not None and os.path.exists(source[0]):
+        csv = source[0]
+    if csv is not None and os.path.exists(csv):
+        if source != _file_key(csv):
+            return None
+
+    return path
+
+
+def build_atb_store(csv=nrel_electric_costs, directory=None):
+    """
+    Converts the NREL ATB ``.csv`` file into a compact store. Text
+    columns are categorical and the rows are sorted by ``atb_index``.
+    Parquet is used if ``pyarrow`` is installed, otherwise the dataframe
+    is pickled.
+
+    Parameters
+    ----------
+    csv : string
+        The path to the ATB ``.csv`` file. Default is
+        ``pygenesys.data.library.nrel_electric_costs``.
+    directory : string
+        The store directory. Default is ``nrel_data.cache_dir``, which
+        may be set with the ``PYGENESYS_ATB_CACHE`` environment variable.
+
+    Returns
+    -------
+    path : string
+        The path to the store.
+    """
+    df = pd.read_csv(csv,
+                     usecols=atb_columns,
+                     dtype={c: 'category' for c in atb_categories})
+
+    df.rename(columns={'core_metric_variable': 'year'}, inplace=True)
+    df['year'] = pd.to_numeric(df['year'], errors='coerce')
+    df['value'] = pd.to_numeric(df['value'], errors='coerce')
+    df.dropna(subset=['atb_year', 'year', 'value'], inplace=True)
+    df = df.astype({'atb_year': int, 'year': int})
+
+    df.sort_values(by=atb_index, inplace=True, ignore_index=True)
+
+    if directory is None:
+        directory = cache_dir
+    os.makedirs(directory, exist_ok=True)
+
+    path = _store_path(directory)
+    try:
+        # small row groups let filtered reads skip most of the file
+        df.to_parquet(path, index=False, row_group_size=20000)
+    except ImportError:
+        path = _store_path(directory, extension="pkl")
+        df.to_pickle(path)
+    for extension in ["parquet", "pkl"]:
+        stale = _store_path(directory, extension)
+        if stale != path and os.path.exists(stale):
+            os.remove(stale)
+    for key in [k for k in _loaded_stores if k[0] == os.path.abspath(path)]:
+        del _loaded_stores[key]
+
+    with open(_store_path(directory, extension="source"), "w") as f:
+        json.dump(_file_key(csv), f)
+
+    return path
+
+
+def load_atb(atb_year=2021,
+             technology=None,
+             techdetail=None,
+             scenario=None,
+             core_metric_parameter=None,
+             core_metric_case=None,
+             csv=None,
+             directory=None):
+    """
+    Returns the rows of the NREL ATB that match the filters. The store
+    is built from ``csv`` the first time it is needed, and built again
+    if ``csv`` is modified or a different file is given. With a Parquet
+    store, the filters are applied while reading, so only matching rows
+    are loaded.
+
+    Each filter is a string or a list of strings. ``None`` keeps every
+    value.
+
+    Parameters
+    ----------
+    atb_year : integer
+        Indicates the ATB version. Default is 2021.
+    technology : string or list of strings
+        The technologies, e.g. 'Nuclear' or ['Nuclear', 'UtilityPV'].
+    techdetail : string or list of strings
+        The technology details, e.g. 'Class1'.
+    scenario : string or list of strings
+        The scenarios: 'Advanced', 'Conservative', or 'Moderate'.
+    core_metric_parameter : string or list of strings
+        The metrics, e.g. 'CAPEX', 'Fixed O&M', or 'Variable O&M'.
+    core_metric_case : string or list of strings
+        The financial case: 'Market' or 'R&D'.
+    csv : string
+        The path to the ATB ``.csv`` file used to build the store.
+        Default is the file the store was built from or, without a
+        store, ``pygenesys.data.library.nrel_electric_costs``.
+    directory : string
+        The store directory. Default is ``nrel_data.cache_dir``.
+
+    Returns
+    -------
+    df : pandas dataframe
+        The matching rows, indexed by ``atb_index``.
+    """
+    path = _find_store(directory, csv)
+    if path is None:
+        if csv is None:
+            csv = nrel_electric_costs
+        path = build_atb_store(csv, directory)
+
+    filters = {'atb_year': atb_year,
+               'technology': technology,
+               'techdetail': techdetail,
+               'scenario': scenario,
+               'core_metric_parameter': core_metric_parameter,
+               'core_metric_case': core_metric_case}
+    filters = {column: list(np.atleast_1d(values))
+               for column, values in filters.items() if values is not None}
+
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path,
+                             filters=[(column, 'in', values)
+                                      for column, values in filters.items()])
+    else:
+        key = tuple(_file_key(path))
+        if key not in _loaded_stores:
+            _loaded_stores[key] = pd.read_pickle(path)
+        df = _loaded_stores[key]
+        mask = np.ones(len(df), dtype=bool)
+        for column, values in filters.items():
+            mask &= df[column].isin(values).values
+        df = df[mask]
+
+    df = df.astype({c: 'category' for c in atb_categories})
+    for column in atb_categories:
+        df[column] = df[column].cat.remove_unused_categories()
+
+    df = df.set_index(atb_index).sort_index()
+
+    return df
+
+
 def read_atb_data(atb_year=2021):
     """
     This function returns the NREL Annual Technology
@@ -25,22 +255,10 @@ def read_atb_data(atb_year=2021):
         Indicates the ATB version. Default is 2021.
     """
 
-    df = pd.read_csv(nrel_electric_costs,
-                     usecols=['atb_year',
-                              'core_metric_parameter',
-                              'core_metric_case',
-                              'technology',
-                              'techdetail',
-                              'scenario',
-                              'core_metric_variable',
-                              'value'],)
+    df = load_atb(atb_year=atb_year)
+    df = df.reset_index().set_index('year')
 
     df.dropna(axis=1, inplace=True)
-    df.rename(columns={'core_metric_variable':'year'}, inplace=True)
-    df.set_index('year', inplace=True)
-
-    df = df[df['atb_year']==atb_year]
-
     df = df.drop('atb_year', axis=1)
 
     return df
@@ -81,14 +299,23 @@ def get_nrel_techs(df):
 def nrel_cost_projection(tech,
                          cost_metric,
                          tech_detail=None,
-                         scenario='Moderate',):
+                         scenario='Moderate',
+                         time_horizon=None,
+                         core_metric_case='Market',
+                         atb_year=2021,
+                         scale=1.0,
+                         directory=None):
     """
     Returns cost projections from the NREL Annual
     Technology Baseline.
 
+    Every technology is read from the ATB store in one filtered read.
+    The projections are linearly interpolated onto ``time_horizon``.
+    Years outside of the ATB projection hold the first or last value.
+
     Parameters
     ----------
-    tech : string
+    tech : string or list of strings
         The name of the technology in the NREL ATB.
         Accepted keys:
         * 'Commercial Battery Storage' : Li-ion battery storage
@@ -107,9 +334,82 @@ def nrel_cost_projection(tech,
         * 'ResPV' : Residential rooftop PV solar
         * 'UtilityPV' : Utility scale PV solar
     cost_metric : string
-        The string indicating the cost metric
+        The string indicating the cost metric, e.g. 'CAPEX' ($/kW),
+        'Fixed O&M' ($/kW-yr), or 'Variable O&M' ($/MWh).
+    tech_detail : string or dictionary
+        The technology detail, e.g. 'Class1'. A dictionary maps each
+        technology to its detail. If ``None`` and a technology has more
+        than one detail, the first detail is used and a warning is printed.
+    scenario : string
+        Specifies the scenario of interest. Must be
+        * Advanced
+        * Conservative
+        * Moderate
+    time_horizon : array-like
+        The model years, e.g. ``ModelInfo.time_horizon``. Default is
+        the years in the ATB.
+    core_metric_case : string
+        The financial case: 'Market' or 'R&D'. Default is 'Market'.
+    atb_year : integer
+        Indicates the ATB version. Default is 2021.
+    scale : float
+        Multiplies every value, to convert units. E.g. ``1e-3`` converts
+        CAPEX from $/kW to M$/MW.
+    directory : string
+        The store directory. Default is ``nrel_data.cache_dir``.
+
+    Returns
+    -------
+    projection : dictionary
+        The cost in each year, ``{year: cost}``, which may be passed as
+        ``cost_invest``, ``cost_fixed``, or ``cost_variable`` to
+        ``Technology.add_regional_data``. If ``tech`` is a list, the
+        dictionary is keyed by technology, ``{tech: {year: cost}}``.
     """
-    return
+    techs = list(np.atleast_1d(tech))
+    df = load_atb(atb_year=atb_year,
+                  technology=techs,
+                  scenario=scenario,
+                  core_metric_parameter=cost_metric,
+                  core_metric_case=core_metric_case,
+                  directory=directory)
+
+    projection = {}
+    for t in techs:
+        if t not in df.index.get_level_values('technology'):
+            raise ValueError((f"Technology {t} has no {cost_metric} data in "
+                              f"the {atb_year} ATB {scenario} scenario."))
+        data = df.xs(t, level='technology')
+
+        details = data.index.get_level_values('techdetail').unique()
+        if isinstance(tech_detail, dict):
+            detail = tech_detail.get(t, None)
+        else:
+            detail = tech_detail
+        if detail is None:
+            detail = sorted(details)[0]
+            if len(details) > 1:
+                print(f'Warning: {t} has {len(details)} technology details. '
+                      f'Using {detail}.')
+        elif detail not in details:
+            raise ValueError((f"Technology detail {detail} not found for {t}. "
+                              f"Options are {list(details)}."))
+        data = data.xs(detail, level='techdetail')
+
+        # rows that differ only by columns outside the index are averaged
+        costs = data['value'].groupby(level='year').mean()
+        if time_horizon is None:
+            years = costs.index.values
+        else:
+            years = np.asarray(time_horizon)
+        values = np.interp(years, costs.index.values, costs.values) * scale
+
+        projection[t] = {int(y): float(v) for y, v in zip(years, values)}
+
+    if isinstance(tech, str):
+        return projection[tech]
+
+    return projection
 
 
 if __name__ == "__main__":
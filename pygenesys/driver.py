@@ -2,14 +2,18 @@
 
 import numpy as np
 import importlib
-import inspect
 import argparse
 import os
 import sys
 import sqlite3
+import types
 
 # custom imports
 from pygenesys import model_info
+from pygenesys.registry import ModelRegistry
+from pygenesys.model_file import (build_model_info,
+                                  is_model_file,
+                                  read_model_file)
 from pygenesys.technology.technology import Technology
 from pygenesys.commodity.commodity import *
 from pygenesys.make_config import *
@@ -57,119 +61,54 @@ def load_infile(infile_path):
     return infile
 
 
-def collect_technologies(module_name):
+def collect_registry(module_name):
     """
-    Collects the technologies from the PyGenesys input file.
+    Collects the technologies and commodities from the PyGenesys input file.
 
     Parameters
     ----------
     module_name : python module
         The PyGenesys input file once imported. Should be "infile."
-    """
-    try:
-        technologies = module_name.tech_list
-        print(("Warning: Importing from technology list -- duplicate technologies\n"
-               " may result in compilation errors."))
-    except:
-        technologies = []
 
+    Returns
+    -------
+    registry : ``ModelRegistry``
+        Holds the unique technologies in the input file and the
+        commodities they use.
+    """
     print("Collecting technologies from input file... \n")
-    for member, attrib in inspect.getmembers(module_name):
-        try:
-            string_attr = str(attrib)
-        except BaseException:
-            string_attr = ''
+    registry = ModelRegistry()
+    registry.collect(module_name)
 
-        # if 'Technology' in string_attr:
-        if isinstance(attrib, Technology):
-            technologies.append(getattr(module_name, member))
+    return registry
 
-    return technologies
+
+def collect_technologies(module_name):
+    """
+    Collects the technologies from the PyGenesys input file.
+
+    Parameters
+    ----------
+    module_name : python module
+        The PyGenesys input file once imported. Should be "infile."
+    """
+    return collect_registry(module_name).technologies
 
 
 def _collect_commodities(technology_list):
     """
-    Collects the unique commodities from the PyGenesys input file.
-    Each list of commodities (demand, resource, emission) should be
-    a unique set. Numpy.unique cannot compare objects, so an empty
-    dictionary is initialized and populated with Commodity names
-    for keys and Commodity objects for values. Therefore only unique
-    commodities will be returned.
-
-    NOTE: This function fails to collect all commodities. Commodities must
-    be explicitly listed in the input file for now!
-
-
-    This function should be extended to account for cases where
-    the input and output commodities are lists (i.e. when there's
-    a ``techinputsplit``).
-    """
-
-    demand = {}
-    resource = {}
-    emission_dict = {}
-
-    for tech in technology_list:
-        for region in tech.regions:
-            print(f'REGION: {region}')
-            input_comm = tech.input_comm[region]
-            output_comm = tech.output_comm[region]
-
-            print(f'Commodity types for {tech.tech_name}')
-            print(f"{type(input_comm)}")
-            print(f"{type(output_comm)}")
-            # check the input commodity type
-            if isinstance(input_comm, Commodity):
-                # resource
-                if input_comm.comm_name not in resource:
-                    resource[input_comm.comm_name] = input_comm
-                    continue
-                else:
-                    continue
-            elif isinstance(input_comm, list):
-                for comm in input_comm:
-                    if (isinstance(comm, Commodity)) and \
-                       (comm.comm_name not in resource):
-                        resource[comm.comm_name] = comm
-                    else:
-                        continue
-            else:
-                print(f'Input commodity for {tech.tech_name} in {region} '
-                      'is not a resource. Check input file.')
-
-            if isinstance(output_comm, DemandCommodity):
-                # demand
-                demand[output_comm.comm_name] = output_comm
-            elif isinstance(output_comm, Commodity):
-                # resource
-                if output_comm.comm_name not in resource:
-                    resource[output_comm.comm_name] = output_comm
-                    continue
-                else:
-                    continue
-
-            elif isinstance(output_comm, EmissionsCommodity):
-                # emission
-                print(f"Warning: Output commodity of {tech.tech_name}"
-                      f"is an Emission Commodity. Check input file.")
-                continue
-            try:
-                emissions = tech.emissions[region]
-                print(f"{type(emissions)}")
-
-                # loop through emissions commodities
-                for emis in list(emissions.keys()):
-                    if (isinstance(emis, EmissionsCommodity)) and \
-                       (emis.comm_name not in emission_dict):
-                        emission_dict[emis.comm_name] = emis
-                    else:
-                        continue
-            except BaseException:
-                pass
-
-    resources = list(resource.values())
-    demands = list(demand.values())
-    emissions_list = list(emission_dict.values())
+    Collects the unique commodities used by a list of technologies.
+    Each list of commodities (demand, resource, emission) is a unique set.
+
+    Returns
+    -------
+    resources, demands, emissions_list : lists of ``Commodity``
+    """
+    registry = ModelRegistry(technologies=technology_list)
+
+    resources = registry.resources
+    demands = registry.demands
+    emissions_list = registry.emissions
 
     if len(demands) == 0:
         print('Warning: Input file has no technologies that satisfy demands.')
@@ -179,24 +118,189 @@ def _collect_commodities(technology_list):
     return resources, demands, emissions_list
 
 
-def main():
-
-    # Read commandline arguments
-    parser = argparse.ArgumentParser(description='PyGenesys Parameters')
-    parser.add_argument('--infile', help='the name of the input file')
-    args = parser.parse_args()
-    print(f"Reading input from {args.infile} \n")
+def output_path(infile):
+    """
+    Returns the path of the database described by an input file.
 
-    infile = load_infile(args.infile)
+    Parameters
+    ----------
+    infile : python module
+        The PyGenesys input file once imported.
+    """
     out_db = infile.database_filename
     try:
         out_path = infile.curr_dir + "/" + out_db
     except BaseException:
         out_path = "./" + out_db
 
-    # get infile technologies
-    technology_list = collect_technologies(infile)
+    return out_path
+
+
+def write_database(model, shards=None):
+    """
+    Writes a model's SQLite database, in one process or in parallel
+    shards of regions.
+    """
+    if shards is None:
+        model._write_sqlite_database()
+    else:
+        from pygenesys.shard import build_sharded
+        build_sharded(model, N_shards=shards)
+
+    return
+
+
+def build_model_file(path, output_db=None, shards=None):
+    """
+    Builds a declarative model file and writes its SQLite database.
+
+    Parameters
+    ----------
+    path : string
+        The path to a ``.json``, ``.toml``, or ``.yaml`` model file.
+    output_db : string
+        The path to the output database. Default is
+        ``model.database_filename`` next to the model file.
+    shards : integer
+        Builds this many groups of regions in parallel and merges
+        them. Default is None (one process).
+
+    Returns
+    -------
+    model : ``ModelInfo``
+        The model written to the database.
+    infile : namespace
+        The input file attributes used by ``write_config``.
+    """
+    spec = read_model_file(path)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    model = build_model_info(spec, base_dir, output_db)
+    print(f"Database will be exported to {model.output_db} \n")
+
+    write_database(model, shards)
+
+    print("Input file written successfully.\n")
+
+    infile = types.SimpleNamespace(
+        database_filename=spec['model']['database_filename'],
+        scenario_name=spec['model']['scenario_name'],
+        folder=spec['model'].get('folder', '.'),
+        myopic_periods=spec['model'].get('myopic_periods', None),
+        curr_dir=base_dir)
+
+    return model, infile
+
+
+def build_model(infile, output_db=None, shards=None):
+    """
+    Creates the model described by an input file and writes its
+    SQLite database.
+
+    Parameters
+    ----------
+    infile : python module
+        The PyGenesys input file once imported.
+    output_db : string
+        The path to the output database. Default is
+        ``database_filename`` in the input file.
+    shards : integer
+        Builds this many groups of regions in parallel and merges
+        them. Default is None (one process).
+
+    Returns
+    -------
+    model : ``ModelInfo``
+        The model written to the database.
+    """
+    model = create_model(infile, output_db)
+    print(f"Database will be exported to {model.output_db} \n")
+
+    write_database(model, shards)
 
+    print("Input file written successfully.\n")
+
+    return model
+
+
+def create_model(infile, output_db=None):
+    """
+    Creates the model described by an input file without writing it.
+
+    Parameters
+    ----------
+    infile : python module
+        The PyGenesys input file once imported.
+    output_db : string
+        The path to the output database. Default is
+        ``database_filename`` in the input file.
+
+    Returns
+    -------
+    model : ``ModelInfo``
+        The model, ready to be written.
+    """
+    if output_db is None:
+        out_path = output_path(infile)
+    else:
+        out_path = output_db
+
+    try:
+        hour_boundaries = infile.hour_boundaries
+    except BaseException:
+        hour_boundaries = None
+
+    try:
+        seg_frac = infile.seg_frac
+    except BaseException:
+        seg_frac = None
+
+    try:
+        prune = infile.prune
+    except BaseException:
+        prune = False
+
+    try:
+        skip_default_cf = infile.skip_default_cf
+    except BaseException:
+        skip_default_cf = False
+
+    try:
+        vintage_bins = infile.vintage_bins
+    except BaseException:
+        vintage_bins = None
+
+    try:
+        vintage_tolerance = infile.vintage_tolerance
+    except BaseException:
+        vintage_tolerance = None
+
+    try:
+        region_map = infile.region_map
+    except BaseException:
+        region_map = None
+
+    try:
+        myopic_periods = infile.myopic_periods
+    except BaseException:
+        myopic_periods = None
+
+    # get infile technologies and the commodities they use
+    registry = collect_registry(infile)
+    technology_list = registry.technologies
+
+    # explicit commodity lists take precedence over discovered commodities
+    try:
+        demands_list = infile.demands_list
+    except BaseException:
+        demands_list = registry.demands
+    try:
+        resources_list = infile.resources_list
+    except BaseException:
+        resources_list = registry.resources
+    try:
+        emissions_list = infile.emissions_list
+    except BaseException:
+        emissions_list = registry.emissions
 
     # create the model object
     model = model_info.ModelInfo(output_db=out_path,
@@ -206,30 +310,72 @@ def main():
                                  N_years=infile.N_years,
                                  N_seasons=infile.N_seasons,
                                  N_hours=infile.N_hours,
-                                 demands=infile.demands_list,
-                                 resources=infile.resources_list,
-                                 emissions=infile.emissions_list,
+                                 demands=demands_list,
+                                 resources=resources_list,
+                                 emissions=emissions_list,
                                  technologies=technology_list,
                                  reserve_margin=infile.reserve_margin,
-                                 global_discount=infile.discount_rate
+                                 global_discount=infile.discount_rate,
+                                 hour_boundaries=hour_boundaries,
+                                 seg_frac=seg_frac,
+                                 prune=prune,
+                                 skip_default_cf=skip_default_cf,
+                                 vintage_bins=vintage_bins,
+                                 vintage_tolerance=vintage_tolerance,
+                                 region_map=region_map,
+                                 myopic_periods=myopic_periods,
                                  )
-    print(f"Database will be exported to {model.output_db} \n")
 
+    return model
 
-    model._write_sqlite_database()
 
-    print("Input file written successfully.\n")
+def load_model(infile_path):
+    """
+    Creates the model described by a Python input file or a declarative
+    model file, without writing it.
 
-    # create the config file
+    Parameters
+    ----------
+    infile_path : string
+        The path to the input file or model file.
+
+    Returns
+    -------
+    model : ``ModelInfo``
+        The model, ready to be written.
+    """
+    if is_model_file(infile_path):
+        spec = read_model_file(infile_path)
+        base_dir = os.path.dirname(os.path.abspath(infile_path))
+        return build_model_info(spec, base_dir)
+
+    return create_model(load_infile(infile_path))
+
+
+def write_config(infile):
+    """
+    Writes the Temoa config file for an input file next to it.
+
+    Parameters
+    ----------
+    infile : python module
+        The PyGenesys input file once imported.
+    """
     print("Writing Temoa config file.\n")
 
+    out_db = infile.database_filename
     config_template = 'config_template.txt'
     fname = name_from_path(out_db)
     print(f'File name: {fname}\n')
     conf_name = f'run_{fname}.txt'
+    try:
+        myopic_periods = infile.myopic_periods
+    except BaseException:
+        myopic_periods = None
     vars = {'target_dir':infile.folder,
             'file_name':fname+'.sqlite',
-            'scenario':infile.scenario_name}
+            'scenario':infile.scenario_name,
+            'myopic_periods':myopic_periods}
 
     # outpath should be one folder up.
     path = infile.curr_dir
@@ -242,3 +388,86 @@ def main():
                             output_fname=conf_name)
 
     return
+
+
+def print_size_estimate(estimate):
+    """
+    Prints the result of ``ModelInfo.estimate_size``.
+    """
+    print("Rows per table:")
+    for table, rows in sorted(estimate['tables'].items(),
+                              key=lambda item: -item[1]):
+        if rows > 0:
+            print(f"    {table:<40}{rows:>12,}")
+    print(f"    {'Total':<40}{sum(estimate['tables'].values()):>12,}")
+    print("Estimated Temoa variables:")
+    for variable, count in estimate['variables'].items():
+        print(f"    {variable:<40}{count:>12,}")
+    print(f"Estimated database size: {estimate['bytes'] / 1e6:.2f} MB")
+
+    return
+
+
+def main():
+
+    # Read commandline arguments
+    parser = argparse.ArgumentParser(description='PyGenesys Parameters')
+    parser.add_argument('--infile',
+                        help=('the name of the input file, a Python file or '
+                              'a .json, .toml, or .yaml model file'))
+    parser.add_argument('--daemon',
+                        action='store_true',
+                        help='keep running and rebuild when files change')
+    parser.add_argument('--port',
+                        type=int,
+                        default=8765,
+                        help='the port of the daemon HTTP API')
+    parser.add_argument('--interval',
+                        type=float,
+                        default=1.0,
+                        help='seconds between checks for changed files')
+    parser.add_argument('--windows',
+                        type=int,
+                        default=None,
+                        help=('write one database per myopic window of '
+                              'this many periods'))
+    parser.add_argument('--shards',
+                        type=int,
+                        default=None,
+                        help=('build this many groups of regions in '
+                              'parallel processes'))
+    parser.add_argument('--dry-run',
+                        action='store_true',
+                        help=('print the size of the database without '
+                              'writing it'))
+    args = parser.parse_args()
+    print(f"Reading input from {args.infile} \n")
+
+    if args.dry_run:
+        model = load_model(args.infile)
+        print_size_estimate(model.estimate_size())
+        return
+
+    if args.windows is not None:
+        from pygenesys.myopic import build_windows
+        model = load_model(args.infile)
+        for path in build_windows(model, args.windows):
+            print(f"Window written to {path}")
+        return
+
+    if args.daemon:
+        from pygenesys.daemon import BuildDaemon
+        BuildDaemon(args.infile, interval=args.interval).run(port=args.port)
+        return
+
+    if is_model_file(args.infile):
+        # declarative model files are parsed, not executed
+        model, infile = build_model_file(args.infile, shards=args.shards)
+    else:
+        infile = load_infile(args.infile)
+        build_model(infile, shards=args.shards)
+
+    # create the config file
+    write_config(infile)
+
+    return
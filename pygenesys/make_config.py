@@ -1,4 +1,3 @@
-import jinja2
 import os
 import glob
 
@@ -18,6 +17,9 @@ def load_template(input_path, input_fname):
     -------
     output_template: jinja template object
     """
+    # imported here so loading the driver does not pay for jinja2
+    import jinja2
+
     if (input_path) == 'default' and (input_fname == 'default'):
         input = default_template
     else:
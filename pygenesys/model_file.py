@@ -0,0 +1,505 @@
+"""
+This file contains the loader for declarative model files.
+
+A model file describes the same model as a Python input file, but it is
+plain data (JSON, TOML, or YAML), so it can be validated, hashed, and
+loaded without running any code. A small JSON example:
+
+```json
+{
+  "model": {"database_filename": "my_temoadb.sqlite",
+            "scenario_name": "test",
+            "start_year": 2025, "end_year": 2050, "N_years": 6,
+            "N_seasons": 4, "N_hours": 24,
+            "reserve_margin": {"IL": 0.15}, "discount_rate": 0.05},
+  "commodities": {
+    "ethos": {"catalog": "ethos"},
+    "ELC_DEMAND": {"catalog": "ELC_DEMAND",
+                   "demand": {"IL": {"init_demand": 100.0,
+                                     "growth_rate": 0.01}},
+                   "distribution": {"IL": {"library": "campus_elc_demand"}}},
+    "co2eq": {"type": "emission", "units": "kT",
+              "limits": {"IL": {"2050": 0.0}}}
+  },
+  "technologies": {
+    "SOLAR_FARM": {"catalog": "SOLAR_FARM",
+                   "regions": {"IL": {"input_comm": "ethos",
+                                      "output_comm": "ELC_DEMAND",
+                                      "efficiency": 1.0,
+                                      "tech_lifetime": 25,
+                                      "capacity_factor_tech":
+                                          {"data": "solar.csv"}}}}
+  }
+}
+```
+
+Commodities and technologies either copy a library object with
+``"catalog"`` or are defined by their attributes. Data files are given
+relative to the model file (``"data"``) or by their name in
+``pygenesys.data.library`` (``"library"``).
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from pygenesys import catalog
+from pygenesys.model_info import ModelInfo
+from pygenesys.technology.technology import Technology
+from pygenesys.commodity.commodity import (Commodity,
+                                           DemandCommodity,
+                                           EmissionsCommodity)
+
+model_file_extensions = ['.json', '.toml', '.yaml', '.yml']
+
+required_model_keys = ['database_filename',
+                       'scenario_name',
+                       'start_year',
+                       'end_year',
+                       'N_years',
+                       'N_seasons',
+                       'N_hours']
+
+commodity_classes = {'resource': Commodity,
+                     'demand': DemandCommodity,
+                     'emission': EmissionsCommodity}
+
+technology_attributes = ['units',
+                         'capacity_to_activity',
+                         'tech_sector',
+                         'tech_label',
+                         'description',
+                         'category',
+                         'reserve_tech',
+                         'ramping_tech',
+                         'storage_tech',
+                         'curtailed_tech',
+                         'exchange_tech']
+
+regional_parameters = ['input_comm',
+                       'output_comm',
+                       'tech_lifetime',
+                       'loan_lifetime',
+                       'cost_variable',
+                       'cost_fixed',
+                       'cost_invest',
+                       'efficiency',
+                       'existing',
+                       'capacity_factor_tech',
+                       'ramp_up',
+                       'ramp_down',
+                       'storage_duration',
+                       'emissions',
+                       'max_capacity',
+                       'min_capacity']
+
+# keyword arguments passed from a data reference to ``tsprocess.aggregate``
+aggregate_options = ['groupby', 'add_peak', 'add_weekend']
+
+
+def is_model_file(path):
+    """
+    Returns ``True`` if the path has a model file extension.
+    """
+    return os.path.splitext(path)[1].lower() in model_file_extensions
+
+
+def read_model_file(path):
+    """
+    Parses a model file. TOML files need Python 3.11 or the ``tomli``
+    package, and YAML files need the ``PyYAML`` package.
+
+    Parameters
+    ----------
+    path : string
+        The path to a ``.json``, ``.toml``, ``.yaml``, or ``.yml`` file.
+
+    Returns
+    -------
+    spec : dictionary
+        The model specification.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        with open(path, 'r') as f:
+            spec = json.load(f)
+    elif extension == '.toml':
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+        with open(path, 'rb') as f:
+            spec = tomllib.load(f)
+    elif extension in ['.yaml', '.yml']:
+        import yaml
+        with open(path, 'r') as f:
+            spec = yaml.safe_load(f)
+    else:
+        raise ValueError((f"Unknown model file type {extension}. Options "
+                          f"are {model_file_extensions}."))
+
+    return spec
+
+
+def _is_data_reference(value):
+    """
+    Returns ``True`` if the value refers to a time series file.
+    """
+    return isinstance(value, dict) and (('data' in value) or
+                                        ('library' in value))
+
+
+def _data_path(reference, base_dir):
+    """
+    Returns the path to the file a data reference points to.
+    """
+    if 'library' in reference:
+        from pygenesys.data import library
+        return getattr(library, reference['library'])
+
+    return os.path.join(base_dir, reference['data'])
+
+
+def validate_model(spec, base_dir='.'):
+    """
+    Checks a model specification without building it. Every problem is
+    collected and reported at once.
+
+    Parameters
+    ----------
+    spec : dictionary
+        The model specification.
+    base_dir : string
+        The directory that data files are relative to.
+
+    Raises
+    ------
+    ValueError
+        If the specification has any problems.
+    """
+    errors = []
+
+    model = spec.get('model', None)
+    if not isinstance(model, dict):
+        errors.append("Missing the 'model' table.")
+        model = {}
+    for key in required_model_keys:
+        if key not in model:
+            errors.append(f"Missing model.{key}.")
+
+    commodities = spec.get('commodities', {})
+    technologies = spec.get('technologies', {})
+    templates = catalog.templates()
+
+    data_refs = []
+    for name, comm in commodities.items():
+        if 'catalog' in comm:
+            template = templates.get(comm['catalog'], None)
+            if not isinstance(template, Commodity):
+                errors.append(f"Commodity {name}: {comm['catalog']} is not "
+                              "a catalog commodity.")
+                continue
+            comm_class = type(template)
+        elif comm.get('type', None) not in commodity_classes:
+            errors.append(f"Commodity {name}: type must be one of "
+                          f"{list(commodity_classes)}.")
+            continue
+        else:
+            comm_class = commodity_classes[comm['type']]
+            if 'units' not in comm:
+                errors.append(f"Commodity {name}: missing units.")
+        for key, required in [('demand', DemandCommodity),
+                              ('distribution', DemandCommodity),
+                              ('limits', EmissionsCommodity)]:
+            if (key in comm) and not issubclass(comm_class, required):
+                errors.append(f"Commodity {name}: only "
+                              f"{required.__name__} accepts {key}.")
+        for region, demand in comm.get('demand', {}).items():
+            if ('values' not in demand) and ('init_demand' not in demand):
+                errors.append(f"Commodity {name}: the demand in {region} "
+                              "must have 'values' or 'init_demand'.")
+        for region, ref in comm.get('distribution', {}).items():
+            if not _is_data_reference(ref):
+                errors.append(f"Commodity {name}: the distribution in "
+                              f"{region} must have 'data' or 'library'.")
+            else:
+                data_refs.append((f"Commodity {name}", ref))
+
+    for name, tech in technologies.items():
+        if 'catalog' in tech:
+            if not isinstance(templates.get(tech['catalog'], None),
+                              Technology):
+                errors.append(f"Technology {name}: {tech['catalog']} is "
+                              "not a catalog technology.")
+        else:
+            for key in ['units', 'capacity_to_activity']:
+                if key not in tech:
+                    errors.append(f"Technology {name}: missing {key}.")
+        unknown = set(tech) - set(technology_attributes) - \
+            {'catalog', 'regions'}
+        if len(unknown) > 0:
+            errors.append(f"Technology {name}: unknown attributes "
+                          f"{sorted(unknown)}.")
+
+        for region, params in tech.get('regions', {}).items():
+            unknown = set(params) - set(regional_parameters)
+            if len(unknown) > 0:
+                errors.append(f"Technology {name} in {region}: unknown "
+                              f"parameters {sorted(unknown)}.")
+            for key in ['input_comm', 'output_comm']:
+                comms = np.atleast_1d(params.get(key, []))
+                for comm in comms:
+                    if comm not in commodities:
+                        errors.append(f"Technology {name} in {region}: "
+                                      f"{key} {comm} is not a commodity.")
+            for emis in params.get('emissions', {}):
+                if emis not in commodities:
+                    errors.append(f"Technology {name} in {region}: "
+                                  f"emission {emis} is not a commodity.")
+            cf = params.get('capacity_factor_tech', None)
+            if _is_data_reference(cf):
+                data_refs.append((f"Technology {name}", cf))
+
+    for owner, ref in data_refs:
+        try:
+            path = _data_path(ref, base_dir)
+        except AttributeError:
+            errors.append(f"{owner}: {ref['library']} is not in the "
+                          "data library.")
+            continue
+        if not os.path.exists(path):
+            errors.append(f"{owner}: data file {path} does not exist.")
+
+    if len(errors) > 0:
+        raise ValueError("Invalid model file:\n  " + "\n  ".join(errors))
+
+    return
+
+
+def model_hash(spec, base_dir='.'):
+    """
+    Returns a hash that identifies a model. It does not depend on the
+    order of keys in the file or on the file format, and it changes
+    when the contents of a referenced data file change.
+
+    Parameters
+    ----------
+    spec : dictionary
+        The model specification.
+    base_dir : string
+        The directory that data files are relative to.
+
+    Returns
+    -------
+    digest : string
+        The SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(spec, sort_keys=True, default=str).encode())
+
+    def add_files(value):
+        if _is_data_reference(value):
+            with open(_data_path(value, base_dir), 'rb') as f:
+                digest.update(f.read())
+        elif isinstance(value, dict):
+            for key in sorted(value):
+                add_files(value[key])
+
+    add_files(spec)
+
+    return digest.hexdigest()
+
+
+def _year_keys(value):
+    """
+    Converts the string keys of a year dictionary into integers, since
+    JSON and TOML keys are always strings.
+    """
+    if isinstance(value, dict):
+        return {(int(k) if str(k).isdigit() else k): _year_keys(v)
+                for k, v in value.items()}
+
+    return value
+
+
+def _aggregate_reference(reference, kind, model, base_dir):
+    """
+    Aggregates the time series a data reference points to.
+    """
+    from pygenesys.utils.tsprocess import aggregate
+
+    options = {key: reference[key] for key in aggregate_options
+               if key in reference}
+
+    return aggregate(_data_path(reference, base_dir),
+                     N_seasons=model['N_seasons'],
+                     N_hours=model['N_hours'],
+                     kind=kind,
+                     hour_boundaries=model.get('hour_boundaries', None),
+                     **options)
+
+
+def _build_commodity(name, comm, model, base_dir):
+    """
+    Creates a commodity and adds its regional data.
+    """
+    if 'catalog' in comm:
+        commodity = catalog.instance(comm['catalog'])
+    else:
+        comm_class = commodity_classes[comm['type']]
+        options = {key: comm[key] for key in ['comm_label', 'description']
+                   if key in comm}
+        commodity = comm_class(comm_name=name, units=comm['units'],
+                               **options)
+
+    for region, demand in comm.get('demand', {}).items():
+        if 'values' in demand:
+            commodity.set_demands([region], [demand['values']])
+        else:
+            commodity.add_demand(region=region,
+                                 init_demand=demand['init_demand'],
+                                 start_year=model['start_year'],
+                                 end_year=model['end_year'],
+                                 N_years=model['N_years'],
+                                 growth_rate=demand.get('growth_rate', 0.0),
+                                 growth_method=demand.get('growth_method',
+                                                          'linear'))
+
+    for region, ref in comm.get('distribution', {}).items():
+        options = {key: ref[key] for key in aggregate_options if key in ref}
+        commodity.set_distribution(region=region,
+                                   data=_data_path(ref, base_dir),
+                                   n_seasons=model['N_seasons'],
+                                   n_hours=model['N_hours'],
+                                   hour_boundaries=model.get(
+                                       'hour_boundaries', None),
+                                   **options)
+
+    for region, limits in comm.get('limits', {}).items():
+        commodity.add_regional_limit(region, _year_keys(limits))
+
+    return commodity
+
+
+def _build_technology(name, tech, commodities, model, base_dir):
+    """
+    Creates a technology and adds its regional data.
+    """
+    attributes = {key: tech[key] for key in technology_attributes
+                  if key in tech}
+    if 'catalog' in tech:
+        technology = catalog.instance(tech['catalog'])
+        for key, value in attributes.items():
+            setattr(technology, key, value)
+    else:
+        technology = Technology(tech_name=name, **attributes)
+
+    for region, params in tech.get('regions', {}).items():
+        data = {}
+        for key, value in params.items():
+            if key in ['input_comm', 'output_comm']:
+                if isinstance(value, list):
+                    value = [commodities[c] for c in value]
+                else:
+                    value = commodities[value]
+            elif key == 'emissions':
+                value = {commodities[c]: v for c, v in value.items()}
+            elif _is_data_reference(value):
+                value = _aggregate_reference(value, 'cf', model, base_dir)
+            else:
+                value = _year_keys(value)
+            data[key] = value
+        technology.add_regional_data(region=region, **data)
+
+    return technology
+
+
+def build_model_info(spec, base_dir='.', output_db=None):
+    """
+    Creates the ``ModelInfo`` described by a model specification.
+
+    Parameters
+    ----------
+    spec : dictionary
+        The model specification.
+    base_dir : string
+        The directory that data files and the database are relative to.
+    output_db : string
+        The path to the output database. Default is
+        ``model.database_filename`` relative to ``base_dir``.
+
+    Returns
+    -------
+    model_info : ``ModelInfo``
+        The model, ready to be written.
+    """
+    validate_model(spec, base_dir)
+
+    model = spec['model']
+    commodities = {name: _build_commodity(name, comm, model, base_dir)
+                   for name, comm in spec.get('commodities', {}).items()}
+    technologies = [_build_technology(name, tech, commodities, model,
+                                      base_dir)
+                    for name, tech in spec.get('technologies', {}).items()]
+
+    if output_db is None:
+        output_db = os.path.join(base_dir, model['database_filename'])
+
+    def of_type(comm_class):
+        return [c for c in commodities.values() if type(c) is comm_class]
+
+    seg_frac = model.get('seg_frac', None)
+    if seg_frac is not None:
+        seg_frac = np.array(seg_frac)
+
+    model_info = ModelInfo(output_db=output_db,
+                           scenario_name=model['scenario_name'],
+                           start_year=model['start_year'],
+                           end_year=model['end_year'],
+                           N_years=model['N_years'],
+                           N_seasons=model['N_seasons'],
+                           N_hours=model['N_hours'],
+                           technologies=technologies,
+                           demands=of_type(DemandCommodity),
+                           resources=of_type(Commodity),
+                           emissions=of_type(EmissionsCommodity),
+                           reserve_margin=model.get('reserve_margin', {}),
+                           global_discount=model.get('discount_rate', 0.05),
+                           hour_boundaries=model.get('hour_boundaries',
+                                                     None),
+                           seg_frac=seg_frac,
+                           prune=model.get('prune', False),
+                           skip_default_cf=model.get('skip_default_cf',
+                                                     False),
+                           vintage_bins=model.get('vintage_bins', None),
+                           vintage_tolerance=model.get('vintage_tolerance',
+                                                       None),
+                           region_map=model.get('region_map', None),
+                           myopic_periods=model.get('myopic_periods', None))
+
+    return model_info
+
+
+def load_model_file(path, output_db=None):
+    """
+    Reads, validates, and builds a model file.
+
+    Parameters
+    ----------
+    path : string
+        The path to the model file.
+    output_db : string
+        The path to the output database. Default is
+        ``model.database_filename`` next to the model file.
+
+    Returns
+    -------
+    model_info : ``ModelInfo``
+        The model, ready to be written.
+    """
+    spec = read_model_file(path)
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    return build_model_info(spec, base_dir, output_db)
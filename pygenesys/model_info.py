@@ -1,7 +1,21 @@
 import numpy as np
 import sqlite3
+from pygenesys.network import CommodityNetwork
+from pygenesys.validation import validate
+from pygenesys.utils.vintages import bin_vintages, retirement_error
+from pygenesys.utils import regions as zones
 from pygenesys.utils.db_creator import *
 
+# tables with one row per time slice, counted instead of written
+# during a dry run
+time_sliced_tables = ['SegFrac',
+                      'DemandSpecificDistribution',
+                      'CapacityFactorTech']
+
+# approximate size of one time sliced row on disk, including its
+# primary key index, in bytes
+sliced_row_bytes = 75
+
 
 class ModelInfo(object):
     """
@@ -22,7 +36,15 @@ class ModelInfo(object):
                  resources,
                  emissions,
                  reserve_margin,
-                 global_discount):
+                 global_discount,
+                 hour_boundaries=None,
+                 seg_frac=None,
+                 prune=False,
+                 skip_default_cf=False,
+                 vintage_bins=None,
+                 vintage_tolerance=None,
+                 region_map=None,
+                 myopic_periods=None):
         """
         Initalize the ModelInfo object
 
@@ -62,6 +84,42 @@ class ModelInfo(object):
             ensure reliability. E.g. reserve_margin = 0.3 corresponds to
             a Planning Reserve Margin of 30 percent, or total generating
             capacity that is 30 percent greater than the annual peak demand.
+        hour_boundaries : list of integers
+            The first hour of each time of day block when ``N_hours`` is
+            less than 24. E.g. ``[0, 7, 11, 17, 21]``. Default is uniform
+            blocks. Should match the boundaries used to aggregate the
+            demand and capacity factor data.
+        seg_frac : numpy array
+            The fraction of the year represented by each time slice, with
+            one row per season and one column per hour. If ``None``, the
+            fractions saved by ``DemandCommodity.set_distribution`` are
+            used. If no distribution was calculated from data, each season
+            represents an equal fraction of the year.
+        prune : boolean
+            Removes the technologies, in each region, whose output never
+            reaches a demand or whose input cannot be supplied. Their rows
+            are left out of every table. Default is False.
+        skip_default_cf : boolean
+            Leaves out the capacity factors equal to one, Temoa's default
+            for any missing time slice. Capacity factors below one are
+            still written for every time slice. Default is False.
+        vintage_bins : integer or list of integers
+            Merges the vintages of existing capacity into bins, given as
+            a bin width in years or a list of bin edges. See
+            ``pygenesys.utils.vintages``. Default is None (no binning).
+        vintage_tolerance : float
+            The largest allowed error in surviving capacity from
+            binning, as a fraction of the existing capacity of each
+            technology and region. Bins are split until the error is
+            within it. Default is None (no limit).
+        region_map : dictionary
+            Merges regions into zones, e.g. ``{'Cook': 'north'}``. The
+            database is written for the zones. See
+            ``pygenesys.utils.regions``. Default is None.
+        myopic_periods : integer
+            The number of periods Temoa solves at a time in its myopic
+            mode. Fills in the ``MyopicBaseyear`` table. Default is None
+            (perfect foresight).
         """
 
         self.output_db = output_db
@@ -79,16 +137,130 @@ class ModelInfo(object):
         self.technologies = technologies
         self.reserve_margin = reserve_margin
         self.global_discount = global_discount
+        self.hour_boundaries = hour_boundaries
+        self.skip_default_cf = skip_default_cf
+        self.myopic_periods = myopic_periods
+        # the year the last period ends; one year after it if None
+        self.boundary_year = None
+        self.pruned = []
+        self.vintage_report = {}
+        if region_map is not None:
+            self._aggregate_regions(region_map)
+        if prune:
+            self._prune_network()
 
         # derived quantities
         self.time_horizon = self._calculate_time_horizon()
+        if vintage_bins is not None:
+            self._bin_vintages(vintage_bins, vintage_tolerance)
         self.existing_years = self._collect_existing_years()
-        self.seg_frac = self._calculate_seg_frac()
+        self.seg_frac = self._calculate_seg_frac(seg_frac)
         self.regions = self._collect_regions()
         self.tech_sectors = self._collect_tech_sectors()
 
         return
 
+    def _aggregate_regions(self, region_map):
+        """
+        Replaces the technologies, commodities, and reserve margins with
+        copies whose regions are merged into zones.
+        """
+        weights = zones.region_weights(self.commodities['demand'])
+        technologies = [zones.aggregate_technology(tech, region_map)
+                        for tech in self.technologies]
+        self.technologies = [t for t in technologies if t is not None]
+        self.commodities['demand'] = [
+            zones.aggregate_demand(comm, region_map)
+            for comm in self.commodities['demand']]
+        self.commodities['emissions'] = [
+            zones.aggregate_emissions(comm, region_map)
+            for comm in self.commodities['emissions']]
+        if isinstance(self.reserve_margin, dict):
+            self.reserve_margin = zones.aggregate_reserve_margin(
+                self.reserve_margin, region_map, weights)
+
+        N_zones = len(set(zone for r, zone in region_map.items()))
+        print(f'Merged {len(region_map)} regions into {N_zones} zones.')
+
+        return
+
+    def _prune_network(self):
+        """
+        Removes the dead end and unreachable processes, and the resource
+        and emissions commodities only they used.
+        """
+        network = CommodityNetwork(self.technologies)
+        self.pruned = sorted(set(network.dead_ends()) |
+                             set(network.unreachable()))
+        if len(self.pruned) == 0:
+            return
+
+        print(f'Pruning {len(self.pruned)} technology regions that cannot '
+              'reach a demand or be supplied.')
+        self.technologies = network.prune()
+
+        used = {comm.comm_name for comm in
+                CommodityNetwork(self.technologies).commodities}
+        for key in ['resources', 'emissions']:
+            self.commodities[key] = [comm for comm in self.commodities[key]
+                                     if comm.comm_name in used]
+
+        return
+
+    def _bin_vintages(self, bins, tolerance=None):
+        """
+        Replaces each technology's existing capacity with binned
+        vintages. Vintages retired before the first period are dropped
+        first. The technologies are copied, so the originals are not
+        changed. With a ``tolerance``, bins are split until the error in
+        surviving capacity is within it.
+
+        ``vintage_report`` holds, for each technology and region, the
+        number of vintages before and after binning and the largest
+        error in surviving capacity over the model periods, as a
+        fraction of the existing capacity.
+        """
+        start = self.time_horizon[0]
+        technologies = []
+        for tech in self.technologies:
+            regions = [r for r, data in tech.existing_capacity.items()
+                       if isinstance(data, dict) and len(data) > 1]
+            if len(regions) == 0:
+                technologies.append(tech)
+                continue
+
+            new = tech.instance()
+            for region in regions:
+                lifetime = tech.tech_lifetime.get(region, np.inf)
+                existing = {year: cap for year, cap
+                            in tech.existing_capacity[region].items()
+                            if (start - year) < lifetime}
+                binned = bin_vintages(existing,
+                                      bins,
+                                      start,
+                                      tolerance=tolerance,
+                                      lifetime=lifetime,
+                                      periods=self.time_horizon)
+                new.existing_capacity[region] = binned
+                self.vintage_report[(tech.tech_name, region)] = {
+                    'vintages': (len(existing), len(binned)),
+                    'error': retirement_error(existing,
+                                              binned,
+                                              lifetime,
+                                              self.time_horizon)}
+            technologies.append(new)
+        self.technologies = technologies
+
+        if len(self.vintage_report) > 0:
+            reports = self.vintage_report.values()
+            before = sum(r['vintages'][0] for r in reports)
+            after = sum(r['vintages'][1] for r in reports)
+            error = max(r['error'] for r in reports)
+            print(f'Binned {before} existing vintages into {after}. Largest '
+                  f'error in surviving capacity: {error:.1%}.')
+
+        return
+
     def _calculate_time_horizon(self):
         """
         Calculates the complete simulation time horizon.
@@ -102,15 +274,52 @@ class ModelInfo(object):
 
         return years
 
-    def _calculate_seg_frac(self):
+    def _calculate_seg_frac(self, seg_frac=None):
         """
         Calculates the fraction of a year represented
         by each time slice.
         Defines the values for the "SegFrac" table
         in the Temoa database.
+
+        Returns an array with one row per season and one column per
+        time of day. The fractions come from, in order of priority,
+            * the ``seg_frac`` argument,
+            * the average of the fractions saved by
+              ``DemandCommodity.set_distribution`` (i.e. how many hours
+              of data each representative time slice stands for),
+            * equal seasons, with time of day blocks weighted by the
+              number of hours they span.
         """
+        shape = (self.N_seasons, self.N_hours)
+        if seg_frac is not None:
+            seg_frac = np.array(seg_frac, dtype=float).reshape(shape)
+            return seg_frac / seg_frac.sum()
+
+        data_fracs = []
+        for demand_comm in self.commodities['demand']:
+            for region in demand_comm.seg_frac:
+                frac = demand_comm.seg_frac[region]
+                if len(frac) == self.N_seasons * self.N_hours:
+                    data_fracs.append(frac)
+                else:
+                    print(f'Warning: SegFrac of {demand_comm.comm_name} in '
+                          f'{region} does not match the number of '
+                          'time slices. Ignoring.')
+        if len(data_fracs) > 0:
+            data_fracs = np.array(data_fracs)
+            if not np.allclose(data_fracs, data_fracs[0]):
+                print('Warning: Demand distributions represent different '
+                      'fractions of the year. Using the average SegFrac.')
+            seg_frac = data_fracs.mean(axis=0).reshape(shape)
+            return seg_frac / seg_frac.sum()
 
-        seg_frac = 1 / (self.N_seasons * self.N_hours)
+        if self.N_hours > 24:
+            day_frac = np.ones(self.N_hours) / self.N_hours
+        else:
+            from pygenesys.utils.tsprocess import hour_fractions
+            day_frac = hour_fractions(self.N_hours, self.hour_boundaries)
+        seg_frac = np.outer(np.ones(self.N_seasons) / self.N_seasons,
+                            day_frac)
 
         return seg_frac
 
@@ -151,20 +360,162 @@ class ModelInfo(object):
 
         return np.unique(years)
 
+    def validate(self):
+        """
+        Checks the model data before any table is written. Raises a
+        ``ValueError`` listing every violation.
+        """
+        errors = validate(self)
+        if len(errors) > 0:
+            raise ValueError((f"The model has {len(errors)} errors:\n" +
+                              "\n".join(errors)))
+
+        return
+
     def _write_sqlite_database(self):
         """
         Writes model info directly to an sqlite database.
         """
+        self.validate()
 
         conn = establish_connection(self.output_db)
+        self._write_tables(conn)
+        conn.close()
+        return
+
+    def _count_sliced_rows(self):
+        """
+        Counts the rows of the time sliced tables without creating them.
+        Follows the rules in ``db_creator``: each profile has one row per
+        time slice, and arrays longer than the number of time slices are
+        truncated. With ``skip_default_cf``, capacity factors equal to
+        Temoa's default of one are not counted.
+        """
+        N_slices = self.N_seasons * self.N_hours
+
+        counts = {'SegFrac': N_slices,
+                  'DemandSpecificDistribution': 0,
+                  'CapacityFactorTech': 0}
+        for demand in self.commodities['demand']:
+            for data in demand.distribution.values():
+                counts['DemandSpecificDistribution'] += min(np.size(data),
+                                                            N_slices)
+        default = temoa_defaults['CapacityFactorTech']
+        for tech in self.technologies:
+            for data in tech.capacity_factor_tech.values():
+                values = capacity_factor_values(data, N_slices)
+                if self.skip_default_cf:
+                    values = values[values != default]
+                counts['CapacityFactorTech'] += len(values)
+
+        return counts
+
+    def _count_variables(self, conn):
+        """
+        Estimates the number of flow and capacity variables Temoa
+        creates, from the processes in the ``Efficiency`` table. A process
+        is active in a period from its vintage until the end of its
+        lifetime (40 years if not given, as in Temoa).
+        """
+        N_slices = self.N_seasons * self.N_hours
+        periods = np.array(self.time_horizon)
+        storage = {t.tech_name for t in self.technologies if t.storage_tech}
+        curtailed = {t.tech_name for t in self.technologies
+                     if t.curtailed_tech}
+
+        lifetimes = {(r, t): life for r, t, life in
+                     conn.execute('SELECT regions, tech, life '
+                                  'FROM LifetimeTech')}
+        processes = conn.execute('SELECT DISTINCT regions, tech, vintage, '
+                                 'input_comm, output_comm FROM Efficiency')
+
+        variables = {'V_FlowOut': 0,
+                     'V_FlowIn': 0,
+                     'V_Curtailment': 0,
+                     'V_Capacity': 0,
+                     'V_CapacityAvailableByPeriodAndTech': 0}
+        new_capacity = set()
+        available = set()
+        for region, tech, vintage, i, o in processes:
+            life = lifetimes.get((region, tech), 40)
+            active = periods[(periods >= vintage) &
+                             (periods < vintage + life)]
+            N_flows = len(active) * N_slices
+            variables['V_FlowOut'] += N_flows
+            if tech in storage:
+                variables['V_FlowIn'] += N_flows
+            if tech in curtailed:
+                variables['V_Curtailment'] += N_flows
+            if vintage in periods:
+                new_capacity.add((region, tech, vintage))
+            available.update((region, p, tech) for p in active)
+        variables['V_Capacity'] = len(new_capacity)
+        variables['V_CapacityAvailableByPeriodAndTech'] = len(available)
+
+        return variables
+
+    def estimate_size(self):
+        """
+        Counts the rows of every table, estimates the number of Temoa
+        variables, and estimates the size of the database without
+        writing it to disk.
+
+        All tables except the time sliced ones are written to an
+        in-memory database and counted exactly. The time sliced tables
+        (``time_sliced_tables``), which grow with the number of seasons
+        and hours, are counted from the model data.
+
+        Returns
+        -------
+        estimate : dictionary
+            * ``tables`` : the number of rows in each table.
+            * ``variables`` : the estimated number of Temoa variables.
+            * ``bytes`` : the estimated size of the database on disk.
+        """
+        conn = sqlite3.connect(':memory:')
+        self._write_tables(conn, time_sliced=False)
+
+        names = [name for (name,) in
+                 conn.execute("SELECT name FROM sqlite_master "
+                              "WHERE type='table'")]
+        tables = {name: conn.execute(f'SELECT COUNT(*) FROM "{name}"'
+                                     ).fetchone()[0]
+                  for name in names}
+        sliced = self._count_sliced_rows()
+        tables.update(sliced)
+
+        page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        N_bytes = page_count * page_size + \
+            sum(sliced.values()) * sliced_row_bytes
+
+        variables = self._count_variables(conn)
+        conn.close()
+
+        estimate = {'tables': tables,
+                    'variables': variables,
+                    'bytes': N_bytes}
+
+        return estimate
+
+    def _write_tables(self, conn, time_sliced=True):
+        """
+        Writes every table to an open database connection. If
+        ``time_sliced`` is False, the tables in ``time_sliced_tables``
+        are skipped.
+        """
         conn.execute("PRAGMA foreign_keys = 1")
         # create fundamental tables
         seasons = create_time_season(conn, self.N_seasons)
         create_time_period_labels(conn)
-        create_time_periods(conn, self.time_horizon, self.existing_years)
+        create_time_periods(conn,
+                            self.time_horizon,
+                            self.existing_years,
+                            self.boundary_year)
         # create_existing_periods(conn, self.technology_list)
         time_slices = create_time_of_day(conn, self.N_hours)
-        create_segfrac(conn, self.seg_frac, seasons, time_slices)
+        if time_sliced:
+            create_segfrac(conn, self.seg_frac, seasons, time_slices)
         create_regions(conn, self.regions)
         create_commodity_labels(conn)
         create_commodities(conn, self.commodities)
@@ -174,10 +525,11 @@ class ModelInfo(object):
         create_demand_table(conn,
                             self.commodities['demand'],
                             self.time_horizon)
-        create_demand_specific_distribution(conn,
-                                            self.commodities['demand'],
-                                            time_slices,
-                                            seasons)
+        if time_sliced:
+            create_demand_specific_distribution(conn,
+                                                self.commodities['demand'],
+                                                time_slices,
+                                                seasons)
         create_technology_labels(conn)
         create_sectors(conn, self.tech_sectors)
         create_technologies(conn, self.technologies)
@@ -198,11 +550,16 @@ class ModelInfo(object):
         create_invest_cost(conn, self.technologies, self.time_horizon)
         create_variable_cost(conn, self.technologies, self.time_horizon)
         create_fixed_cost(conn, self.technologies, self.time_horizon)
-        create_capacity_factor_tech(conn,
-                                    self.technologies,
-                                    time_slices,
-                                    seasons)
-        create_MyopicBaseYear(conn)
+        if time_sliced:
+            create_capacity_factor_tech(conn,
+                                        self.technologies,
+                                        time_slices,
+                                        seasons,
+                                        skip_default=self.skip_default_cf)
+        if self.myopic_periods is None:
+            create_MyopicBaseYear(conn)
+        else:
+            create_MyopicBaseYear(conn, self.time_horizon[0])
         create_lifetime_process(conn)
 
         # output tables
@@ -215,5 +572,4 @@ class ModelInfo(object):
         create_output_costs(conn)
         create_output_duals(conn)
         create_output_capacitybyperiodtech(conn)
-        conn.close()
         return
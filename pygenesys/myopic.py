@@ -0,0 +1,187 @@
+"""
+This file splits one model into myopic windows.
+
+A perfect foresight model optimizes every period at once. A myopic run
+solves a few periods at a time, which is much faster for long horizons.
+PyGenesys supports two ways of doing this:
+    * Temoa's own myopic mode. Set ``myopic_periods`` in the input file
+      and the database gets its ``MyopicBaseyear`` and the Temoa config
+      file gets the ``--myopic`` options. Temoa carries the capacity
+      built in one window into the next.
+    * One database per window, built in parallel with
+      ``build_windows``. Each database has the periods of its window,
+      and the demands, emissions limits, and capacity limits of those
+      periods. Only the existing capacity from the input file is
+      included, so capacity built in an earlier window must be added
+      from its results.
+
+```bash
+$ genesys --infile my_model.py --windows 2
+```
+"""
+
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# technology parameters keyed by period
+period_parameters = ['max_capacity', 'min_capacity']
+
+
+def _window_path(output_db, index):
+    base, extension = os.path.splitext(output_db)
+
+    return f'{base}_window_{index}{extension}'
+
+
+def _select_years(data, years):
+    """
+    Returns the entries of a ``{year: value}`` dictionary for the given
+    years.
+    """
+    return {year: value for year, value in data.items() if year in years}
+
+
+def window_model(model, first, N_periods, output_db=None):
+    """
+    Returns a copy of a model with only the periods of one window.
+
+    Parameters
+    ----------
+    model : ``ModelInfo``
+        The full model.
+    first : integer
+        The index of the first period in the window.
+    N_periods : integer
+        The number of periods in the window.
+    output_db : string
+        The path of the window's database.
+
+    Returns
+    -------
+    window : ``ModelInfo``
+        The model of the window.
+    """
+    horizon = np.array(model.time_horizon)
+    last = min(first + N_periods, len(horizon))
+    years = set(horizon[first:last].tolist())
+
+    window = copy.copy(model)
+    window.time_horizon = horizon[first:last]
+    if last < len(horizon):
+        window.boundary_year = int(horizon[last])
+    else:
+        window.boundary_year = model.boundary_year
+    if output_db is not None:
+        window.output_db = output_db
+
+    demands = []
+    for comm in model.commodities['demand']:
+        new = comm.instance()
+        new.demand = {region: np.asarray(data)[first:last]
+                      for region, data in comm.demand.items()}
+        demands.append(new)
+    emissions = []
+    for comm in model.commodities['emissions']:
+        new = comm.instance()
+        new.emissions_limit = {region: _select_years(data, years)
+                               for region, data
+                               in comm.emissions_limit.items()}
+        emissions.append(new)
+    window.commodities = dict(model.commodities,
+                              demand=demands,
+                              emissions=emissions)
+
+    technologies = []
+    for tech in model.technologies:
+        if not any(len(getattr(tech, name)) > 0
+                   for name in period_parameters):
+            technologies.append(tech)
+            continue
+        new = tech.instance()
+        for name in period_parameters:
+            limits = getattr(new, name)
+            for region, data in limits.items():
+                limits[region] = _select_years(data, years)
+        technologies.append(new)
+    window.technologies = technologies
+
+    return window
+
+
+def myopic_windows(model, N_periods, step=None):
+    """
+    Splits a model into windows.
+
+    Parameters
+    ----------
+    model : ``ModelInfo``
+        The full model.
+    N_periods : integer
+        The number of periods in each window.
+    step : integer
+        The number of periods between the starts of two windows.
+        Default is ``N_periods`` (windows do not overlap).
+
+    Returns
+    -------
+    windows : list of ``ModelInfo``
+        One model per window. Each writes to ``<database>_window_<i>``.
+    """
+    if N_periods < 1:
+        raise ValueError(f"Windows need at least one period. "
+                         f"Got {N_periods}.")
+    if step is None:
+        step = N_periods
+
+    windows = []
+    for i, first in enumerate(range(0, len(model.time_horizon), step)):
+        windows.append(window_model(model,
+                                    first,
+                                    N_periods,
+                                    _window_path(model.output_db, i)))
+        if first + N_periods >= len(model.time_horizon):
+            break
+
+    return windows
+
+
+def _write_window(window):
+    if os.path.exists(window.output_db):
+        os.remove(window.output_db)
+    window._write_sqlite_database()
+
+    return window.output_db
+
+
+def build_windows(model, N_periods, step=None, max_workers=None):
+    """
+    Writes one database per window, in parallel processes.
+
+    Parameters
+    ----------
+    model : ``ModelInfo``
+        The full model.
+    N_periods : integer
+        The number of periods in each window.
+    step : integer
+        The number of periods between the starts of two windows.
+    max_workers : integer
+        The number of processes. Default is the number of CPUs.
+
+    Returns
+    -------
+    paths : list of strings
+        The window databases, in order.
+    """
+    windows = myopic_windows(model, N_periods, step)
+    # all windows are checked before any process starts
+    for window in windows:
+        window.validate()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        paths = list(executor.map(_write_window, windows))
+
+    return paths
@@ -0,0 +1,226 @@
+"""
+This file contains the ``CommodityNetwork``, a graph of the commodities
+and technologies in a PyGenesys model.
+
+Each node is a commodity in a region. Each technology in a region is a
+process with edges from its input commodities to its output commodities.
+An exchange technology in region ``'A-B'`` takes its input in ``A`` and
+delivers its output in ``B``, as in Temoa.
+
+The network is built once from ``input_comm`` and ``output_comm`` and
+answers two questions about every process:
+    * Is it useful? Its output must reach a demand, directly or through
+      other processes. Otherwise it is a *dead end*.
+    * Is it supplied? Its input must be reachable from ``ethos``, the
+      source of all raw resources. Otherwise it is *unreachable*.
+
+Processes that are dead ends or unreachable can never run in Temoa.
+``CommodityNetwork.prune`` removes them, which removes their rows from
+every table in the database.
+"""
+
+from collections import defaultdict
+
+from pygenesys.commodity.commodity import Commodity, DemandCommodity
+
+# name of the commodity that supplies raw resources
+source_name = 'ethos'
+
+
+def _as_list(comms):
+    """
+    Returns the commodities of an ``input_comm`` or ``output_comm`` entry
+    as a list.
+    """
+    if comms is None:
+        return []
+    if isinstance(comms, Commodity):
+        return [comms]
+    if isinstance(comms, dict):
+        comms = list(comms)
+
+    return [c for c in comms if isinstance(c, Commodity)]
+
+
+def _endpoints(tech, region):
+    """
+    Returns the regions where a process takes its input and delivers
+    its output.
+    """
+    if tech.exchange_tech and ('-' in region):
+        origin, destination = region.split('-', 1)
+        return origin, destination
+
+    return region, region
+
+
+class CommodityNetwork(object):
+    """
+    This class holds the commodity/technology graph of a model.
+    """
+
+    def __init__(self, technologies):
+        """
+        Initialize the network.
+
+        Parameters
+        ----------
+        technologies : list of ``Technology``
+            The technologies in the model.
+        """
+        self.technologies = list(technologies)
+        self.processes = {}
+        self._producers = defaultdict(list)
+        self._consumers = defaultdict(list)
+        self._commodities = {}
+
+        for i, tech in enumerate(self.technologies):
+            for region in tech.regions:
+                origin, destination = _endpoints(tech, region)
+                inputs = [(origin, c.comm_name) for c in
+                          self._add_comms(tech.input_comm.get(region))]
+                outputs = [(destination, c.comm_name) for c in
+                           self._add_comms(tech.output_comm.get(region))]
+                self._add_comms(tech.emissions.get(region))
+
+                key = (i, region)
+                self.processes[key] = (inputs, outputs)
+                for node in inputs:
+                    self._consumers[node].append(key)
+                for node in outputs:
+                    self._producers[node].append(key)
+
+        return
+
+    def __repr__(self):
+        return (f"CommodityNetwork({len(self.processes)} processes, "
+                f"{len(self._commodities)} commodities)")
+
+    def _add_comms(self, comms):
+        comms = _as_list(comms)
+        for comm in comms:
+            self._commodities.setdefault(id(comm), comm)
+
+        return comms
+
+    @property
+    def commodities(self):
+        """
+        The unique commodities used by the technologies as an input,
+        output, or emission.
+        """
+        return list(self._commodities.values())
+
+    def demand_nodes(self):
+        """
+        Returns the (region, commodity) nodes with a demand. A demand
+        commodity without demand data counts in every region.
+        """
+        nodes = set()
+        for comm in self.commodities:
+            if not isinstance(comm, DemandCommodity):
+                continue
+            for node in self._producers:
+                if node[1] != comm.comm_name:
+                    continue
+                if (len(comm.demand) == 0) or (node[0] in comm.demand):
+                    nodes.add(node)
+
+        return nodes
+
+    def source_nodes(self):
+        """
+        Returns the ``ethos`` nodes, which supply raw resources.
+        """
+        return {node for node in self._consumers if node[1] == source_name}
+
+    def _search(self, start, edges, reached):
+        """
+        Returns the processes reachable from the start nodes. ``edges``
+        maps a node to its neighbouring processes and ``reached``
+        selects the nodes a process leads to.
+        """
+        found = set()
+        visited = set(start)
+        stack = list(start)
+        while len(stack) > 0:
+            node = stack.pop()
+            for key in edges.get(node, ()):
+                if key in found:
+                    continue
+                found.add(key)
+                for next_node in reached(self.processes[key]):
+                    if next_node not in visited:
+                        visited.add(next_node)
+                        stack.append(next_node)
+
+        return found
+
+    def useful(self):
+        """
+        Returns the processes whose output reaches a demand.
+        """
+        return self._search(self.demand_nodes(),
+                            self._producers,
+                            lambda process: process[0])
+
+    def supplied(self):
+        """
+        Returns the processes whose input is reachable from ``ethos``.
+        If the model has no ``ethos`` commodity, every process counts as
+        supplied.
+        """
+        sources = self.source_nodes()
+        if len(sources) == 0:
+            return set(self.processes)
+
+        return self._search(sources,
+                            self._consumers,
+                            lambda process: process[1])
+
+    def _names(self, keys):
+        return sorted((self.technologies[i].tech_name, region)
+                      for i, region in keys)
+
+    def dead_ends(self):
+        """
+        Returns the (tech, region) pairs whose output never reaches a
+        demand.
+        """
+        return self._names(set(self.processes) - self.useful())
+
+    def unreachable(self):
+        """
+        Returns the (tech, region) pairs whose input cannot be supplied.
+        """
+        return self._names(set(self.processes) - self.supplied())
+
+    def prune(self):
+        """
+        Removes the processes that are dead ends or unreachable.
+
+        Returns
+        -------
+        technologies : list of ``Technology``
+            The technologies with at least one live region. A technology
+            that lost some of its regions is replaced by a copy with only
+            the live regions; the original is not changed.
+        """
+        live = self.useful() & self.supplied()
+        regions = defaultdict(list)
+        for i, region in self.processes:
+            if (i, region) in live:
+                regions[i].append(region)
+
+        technologies = []
+        for i, tech in enumerate(self.technologies):
+            if len(tech.regions) == 0:
+                continue
+            if len(regions[i]) == len(tech.regions):
+                technologies.append(tech)
+            elif len(regions[i]) > 0:
+                new = tech.instance()
+                new.parameters = tech.parameters.subset(regions[i])
+                technologies.append(new)
+
+        return technologies
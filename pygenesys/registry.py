@@ -0,0 +1,186 @@
+"""
+This file contains the ``ModelRegistry``, which holds the technologies and
+commodities in a PyGenesys model.
+
+Technologies are added explicitly with ``ModelRegistry.add`` or collected
+from an input file with ``ModelRegistry.collect``. Each object is stored
+once, keyed by its identity, so adding the same technology twice (e.g.
+through ``tech_list`` and as a module variable) does not duplicate it.
+Commodities are discovered from the registered technologies and keyed by
+name, since each name is one row of the ``commodities`` table.
+"""
+
+from pygenesys.technology.technology import Technology
+from pygenesys.commodity.commodity import (Commodity,
+                                           DemandCommodity,
+                                           EmissionsCommodity)
+
+
+def _add_commodity(commodities, comm):
+    """
+    Adds a commodity to a dictionary keyed by name. A second commodity
+    with the same name is dropped if it has the same type and database
+    entry, otherwise a ``ValueError`` is raised.
+    """
+    first = commodities.setdefault(comm.comm_name, comm)
+    if first is comm:
+        return
+
+    if (type(first) is not type(comm)) or (first._db_entry() !=
+                                           comm._db_entry()):
+        raise ValueError((f"Commodity {comm.comm_name} is defined twice: "
+                          f"{type(first).__name__}{first} and "
+                          f"{type(comm).__name__}{comm}."))
+    if isinstance(comm, (DemandCommodity, EmissionsCommodity)):
+        print(f"Warning: Commodity {comm.comm_name} is defined twice. "
+              f"Only the data of the first definition are used.")
+
+    return
+
+
+class ModelRegistry(object):
+    """
+    This class holds the unique technologies and commodities
+    in a PyGenesys model.
+    """
+
+    def __init__(self, technologies=None, commodities=None):
+        """
+        Initialize the registry.
+
+        Parameters
+        ----------
+        technologies : list of ``Technology``
+            The technologies in the model.
+        commodities : list of ``Commodity``
+            Commodities to include even if no technology uses them.
+        """
+        self._technologies = {}
+        self._commodities = {}
+
+        if technologies is not None:
+            self.add(technologies)
+        if commodities is not None:
+            self.add(commodities)
+
+        return
+
+    def __repr__(self):
+        return (f"ModelRegistry({len(self._technologies)} technologies, "
+                f"{len(self.commodities)} commodities)")
+
+    def __len__(self):
+        return len(self._technologies)
+
+    def __contains__(self, item):
+        return ((id(item) in self._technologies) or
+                (self._commodities.get(getattr(item, 'comm_name', None))
+                 is item))
+
+    def add(self, *items):
+        """
+        Adds technologies and commodities to the registry. Lists,
+        tuples, and other registries are added item by item.
+
+        Parameters
+        ----------
+        items : ``Technology``, ``Commodity``, list, or ``ModelRegistry``
+            The objects to add.
+        """
+        for item in items:
+            if isinstance(item, Technology):
+                self._technologies.setdefault(id(item), item)
+            elif isinstance(item, Commodity):
+                _add_commodity(self._commodities, item)
+            elif isinstance(item, ModelRegistry):
+                self.add(item.technologies, list(item._commodities.values()))
+            elif isinstance(item, (list, tuple)):
+                self.add(*item)
+            else:
+                raise ValueError((f"Cannot register {type(item)}. Only "
+                                  "technologies and commodities can be "
+                                  "added."))
+
+        return
+
+    def collect(self, module):
+        """
+        Adds the technologies defined in, or imported by, an input file.
+        Only the type of each module variable is checked, so large data
+        held in the input file does not slow collection down.
+
+        Registries and ``tech_list`` in the input file are added as well.
+
+        Parameters
+        ----------
+        module : python module
+            The PyGenesys input file once imported.
+        """
+        members = vars(module)
+
+        if 'tech_list' in members:
+            print(("Warning: Importing from technology list -- duplicate "
+                   "technologies are only added once."))
+            self.add(members['tech_list'])
+
+        for attrib in list(members.values()):
+            if isinstance(attrib, (Technology, ModelRegistry)):
+                self.add(attrib)
+
+        return
+
+    @property
+    def technologies(self):
+        """
+        The registered technologies, in the order they were added.
+        """
+        return list(self._technologies.values())
+
+    @property
+    def commodities(self):
+        """
+        The unique commodities added directly or used by a registered
+        technology as an input, output, or emission, one per name.
+        """
+        commodities = dict(self._commodities)
+
+        for tech in self._technologies.values():
+            for region in tech.regions:
+                for attribute in [tech.input_comm, tech.output_comm]:
+                    comms = attribute.get(region, [])
+                    if isinstance(comms, Commodity):
+                        comms = [comms]
+                    for comm in comms:
+                        if isinstance(comm, Commodity):
+                            _add_commodity(commodities, comm)
+                emissions = tech.emissions.get(region, {})
+                if isinstance(emissions, dict):
+                    for emis in emissions:
+                        if isinstance(emis, Commodity):
+                            _add_commodity(commodities, emis)
+
+        return list(commodities.values())
+
+    @property
+    def demands(self):
+        """
+        The demand commodities.
+        """
+        return [c for c in self.commodities
+                if isinstance(c, DemandCommodity)]
+
+    @property
+    def emissions(self):
+        """
+        The emissions commodities.
+        """
+        return [c for c in self.commodities
+                if isinstance(c, EmissionsCommodity)]
+
+    @property
+    def resources(self):
+        """
+        The commodities that are neither demands nor emissions.
+        """
+        return [c for c in self.commodities
+                if not isinstance(c, (DemandCommodity, EmissionsCommodity))]
@@ -0,0 +1,285 @@
+"""
+This file reports the range of the coefficients in a PyGenesys database
+and rescales their units.
+
+Coefficients that differ by many orders of magnitude (e.g. investment
+costs of 0.002 next to fixed costs of 100) make the linear program in
+Temoa poorly conditioned and slow to solve. ``coefficient_ranges`` and
+``technology_ranges`` report the smallest and largest nonzero value of
+every numeric column and of every technology.
+
+``rescale_database`` changes the units of costs, capacity, and activity
+consistently. For example, a capacity scale of 1000 (GW to MW)
+multiplies the existing capacity and capacity limits by 1000 and divides
+``CapacityToActivity``, ``CostInvest``, and ``CostFixed`` by 1000, so the
+solution is unchanged. Every column with units of cost, capacity, or
+activity is listed in ``scaled_columns``. The factors are recorded in the
+``ScalingFactors`` table. ``suggest_factors`` picks powers of ten that
+bring the scaled columns closest to one.
+
+```bash
+$ python -m pygenesys.scaling my_temoadb.sqlite --auto
+```
+"""
+
+import argparse
+import sqlite3
+
+import numpy as np
+
+# the power of each scale factor in each scaled column
+scaled_columns = {
+    ('CostInvest', 'cost_invest'): {'cost': 1, 'capacity': -1},
+    ('CostFixed', 'cost_fixed'): {'cost': 1, 'capacity': -1},
+    ('CostVariable', 'cost_variable'): {'cost': 1, 'activity': -1},
+    ('ExistingCapacity', 'exist_cap'): {'capacity': 1},
+    ('MaxCapacity', 'maxcap'): {'capacity': 1},
+    ('MinCapacity', 'maxcap'): {'capacity': 1},
+    ('GrowthRateSeed', 'growthrate_seed'): {'capacity': 1},
+    ('CapacityToActivity', 'c2a'): {'activity': 1, 'capacity': -1},
+    ('Demand', 'demand'): {'activity': 1},
+    ('MaxActivity', 'maxact'): {'activity': 1},
+    ('MinActivity', 'minact'): {'activity': 1},
+    ('MinGenGroupTarget', 'min_act_g'): {'activity': 1},
+    ('MaxResource', 'maxres'): {'activity': 1},
+    ('EmissionActivity', 'emis_act'): {'activity': -1},
+}
+
+scale_quantities = ['cost', 'capacity', 'activity']
+
+
+def _tables(conn):
+    return [name for (name,) in
+            conn.execute("SELECT name FROM sqlite_master "
+                         "WHERE type = 'table'")
+            if not name.startswith('Output') and name != 'ScalingFactors']
+
+
+def _real_columns(conn, table):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')
+            if row[2].upper() == 'REAL']
+
+
+def _columns(conn, table):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+
+def _range(conn, query):
+    """
+    Returns the smallest and largest nonzero absolute value, and the
+    number of nonzero values, of a query with one column.
+    """
+    row = conn.execute(f'SELECT MIN(ABS(value)), MAX(ABS(value)), COUNT(*) '
+                       f'FROM ({query}) WHERE value != 0').fetchone()
+
+    return row
+
+
+def coefficient_ranges(conn):
+    """
+    Returns the range of every numeric column in a database.
+
+    Parameters
+    ----------
+    conn : sqlite connector
+
+    Returns
+    -------
+    ranges : dictionary
+        ``{(table, column): (smallest, largest, count)}`` of the nonzero
+        absolute values. Columns without nonzero values are left out.
+    """
+    ranges = {}
+    for table in _tables(conn):
+        for column in _real_columns(conn, table):
+            low, high, count = _range(conn, f'SELECT "{column}" AS value '
+                                            f'FROM "{table}"')
+            if count > 0:
+                ranges[(table, column)] = (low, high, count)
+
+    return ranges
+
+
+def technology_ranges(conn):
+    """
+    Returns the range of the numeric values of each technology, over
+    every table with a ``tech`` column.
+
+    Returns
+    -------
+    ranges : dictionary
+        ``{tech: (smallest, largest, count)}`` of the nonzero absolute
+        values.
+    """
+    queries = []
+    for table in _tables(conn):
+        if 'tech' not in _columns(conn, table):
+            continue
+        queries += [f'SELECT tech, "{column}" AS value FROM "{table}"'
+                    for column in _real_columns(conn, table)]
+    if len(queries) == 0:
+        return {}
+
+    rows = conn.execute('SELECT tech, MIN(ABS(value)), MAX(ABS(value)), '
+                        'COUNT(*) FROM (' + ' UNION ALL '.join(queries) +
+                        ') WHERE value != 0 GROUP BY tech').fetchall()
+
+    return {tech: (low, high, count) for tech, low, high, count in rows}
+
+
+def orders_of_magnitude(low, high):
+    """
+    Returns the number of orders of magnitude between two positive
+    values.
+    """
+    return float(np.log10(high / low))
+
+
+def print_report(conn):
+    """
+    Prints the coefficient ranges of a database, by column and by
+    technology, widest first.
+    """
+    columns = coefficient_ranges(conn)
+    techs = technology_ranges(conn)
+
+    for title, ranges in [('Column', columns), ('Technology', techs)]:
+        print(f'{title:<40} {"min":>10} {"max":>10} {"orders":>7}')
+        for key, (low, high, count) in sorted(
+                ranges.items(),
+                key=lambda item: -orders_of_magnitude(*item[1][:2])):
+            label = '.'.join(key) if isinstance(key, tuple) else key
+            print(f'{label:<40} {low:>10.3g} {high:>10.3g} '
+                  f'{orders_of_magnitude(low, high):>7.1f}')
+        print()
+
+    if len(columns) > 0:
+        low = min(r[0] for r in columns.values())
+        high = max(r[1] for r in columns.values())
+        print(f'All coefficients: {low:.3g} to {high:.3g} '
+              f'({orders_of_magnitude(low, high):.1f} orders of magnitude)')
+
+    return
+
+
+def suggest_factors(conn):
+    """
+    Returns powers of ten for costs, capacity, and activity that bring
+    the logarithmic mean of each scaled column closest to zero, by least
+    squares.
+
+    Returns
+    -------
+    factors : dictionary
+        ``{quantity: factor}``
+    """
+    ranges = coefficient_ranges(conn)
+    powers = []
+    means = []
+    for key, exponents in scaled_columns.items():
+        if key not in ranges:
+            continue
+        table, column = key
+        logs = [np.log10(abs(v)) for (v,) in
+                conn.execute(f'SELECT "{column}" FROM "{table}" '
+                             f'WHERE "{column}" != 0')]
+        powers.append([exponents.get(q, 0) for q in scale_quantities])
+        means.append(np.mean(logs))
+    if len(powers) == 0:
+        return {q: 1.0 for q in scale_quantities}
+
+    # a scaled column's log mean becomes mean + powers @ log10(factors)
+    solution = np.linalg.lstsq(np.array(powers, dtype=float),
+                               -np.array(means),
+                               rcond=None)[0]
+
+    return {q: float(10.0 ** np.round(x))
+            for q, x in zip(scale_quantities, solution)}
+
+
+def _record_factors(conn, factors):
+    conn.execute('CREATE TABLE IF NOT EXISTS "ScalingFactors" ('
+                 '"quantity" text, "factor" real, "notes" text, '
+                 'PRIMARY KEY("quantity"))')
+    for quantity, factor in factors.items():
+        previous = conn.execute('SELECT factor FROM ScalingFactors '
+                                'WHERE quantity = ?', (quantity,)).fetchone()
+        if previous is not None:
+            factor = factor * previous[0]
+        conn.execute('INSERT OR REPLACE INTO ScalingFactors VALUES (?,?,?)',
+                     (quantity, factor,
+                      'new value = factor * value in the original units'))
+
+    return
+
+
+def rescale_database(conn, cost=1.0, capacity=1.0, activity=1.0):
+    """
+    Rescales the units of costs, capacity, and activity in a database.
+
+    Parameters
+    ----------
+    conn : sqlite connector
+    cost : float
+        New cost values are ``cost`` times the old ones.
+    capacity : float
+        New capacity values are ``capacity`` times the old ones.
+    activity : float
+        New activity values are ``activity`` times the old ones.
+
+    Returns
+    -------
+    factors : dictionary
+        The factor applied to each scaled column.
+    """
+    scale = {'cost': cost, 'capacity': capacity, 'activity': activity}
+    for quantity, factor in scale.items():
+        if factor <= 0:
+            raise ValueError(f"Scale factor for {quantity} must be "
+                             f"positive. Got {factor}.")
+
+    tables = _tables(conn)
+    applied = {}
+    for (table, column), exponents in scaled_columns.items():
+        if table not in tables:
+            continue
+        factor = float(np.prod([scale[q] ** p
+                                for q, p in exponents.items()]))
+        if factor != 1.0:
+            conn.execute(f'UPDATE "{table}" '
+                         f'SET "{column}" = "{column}" * ?', (factor,))
+        applied[(table, column)] = factor
+    _record_factors(conn, scale)
+    conn.commit()
+
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Report and rescale the coefficients of a database')
+    parser.add_argument('database', help='the PyGenesys database')
+    parser.add_argument('--auto', action='store_true',
+                        help='rescale with suggested powers of ten')
+    for quantity in scale_quantities:
+        parser.add_argument(f'--{quantity}', type=float, default=1.0,
+                            help=f'multiply {quantity} values by this')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.database)
+    print_report(conn)
+    if args.auto:
+        factors = suggest_factors(conn)
+    else:
+        factors = {q: getattr(args, q) for q in scale_quantities}
+    if any(factor != 1.0 for factor in factors.values()):
+        print(f'\nRescaling by {factors}\n')
+        rescale_database(conn, **factors)
+        print_report(conn)
+    conn.close()
+
+    return
+
+
+if __name__ == '__main__':
+    main()
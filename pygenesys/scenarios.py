@@ -0,0 +1,208 @@
+"""
+This file builds many scenarios of one model from a base database.
+
+Monte-Carlo studies change a few parameters across thousands of samples.
+Instead of writing every table again for each sample, the base database is
+written once and each scenario is a copy of it (with the SQLite backup API)
+where only the changed rows are updated.
+
+A scenario is a dictionary of changes:
+    * ``'discount_rate'``: the global discount rate.
+    * ``'reserve_margin'``: the planning reserve margin, for every region
+      (a float) or for some regions (``{region: margin}``).
+    * ``('cost_invest', tech_name)``: a multiplier on the investment cost
+      of a technology, in every region and vintage. Also accepts
+      ``cost_fixed`` and ``cost_variable``.
+    * ``('growth_rate', demand_name)``: the growth rate of a demand. The
+      demand in each region is projected again from its value in the
+      first year.
+
+```py
+from pygenesys.scenarios import sample_scenarios, build_scenarios
+scenarios = sample_scenarios({'discount_rate': ('uniform', 0.03, 0.07),
+                              ('cost_invest', 'NUCLEAR_ELC'):
+                              ('normal', 1.0, 0.1)},
+                             N_samples=1000, seed=42)
+paths = build_scenarios(model, scenarios)
+```
+"""
+
+import os
+import sqlite3
+
+import numpy as np
+
+from pygenesys.utils.growth_model import project_growth
+
+# cost tables that can be scaled, by parameter name
+cost_tables = {'cost_invest': 'CostInvest',
+               'cost_fixed': 'CostFixed',
+               'cost_variable': 'CostVariable'}
+
+
+def _scenario_path(output_db, index):
+    base, extension = os.path.splitext(output_db)
+
+    return f'{base}_scenario_{index}{extension}'
+
+
+def sample_scenarios(distributions, N_samples, seed=None):
+    """
+    Draws scenarios for the uncertain parameters. Every parameter is
+    sampled for all scenarios at once.
+
+    Parameters
+    ----------
+    distributions : dictionary
+        The distribution of each parameter, as a tuple of the name of a
+        ``numpy.random.Generator`` method and its arguments, e.g.
+        ``('uniform', 0.03, 0.07)`` or ``('normal', 1.0, 0.1)``.
+    N_samples : integer
+        The number of scenarios.
+    seed : integer
+        The seed of the random number generator.
+
+    Returns
+    -------
+    scenarios : list of dictionaries
+        One dictionary of parameter values per scenario.
+    """
+    rng = np.random.default_rng(seed)
+
+    samples = {}
+    for key, (method, *args) in distributions.items():
+        try:
+            draw = getattr(rng, method)
+        except AttributeError:
+            raise ValueError(f"Distribution {method} of {key} not "
+                             f"recognized.")
+        samples[key] = draw(*args, size=N_samples)
+
+    return [{key: float(values[i]) for key, values in samples.items()}
+            for i in range(N_samples)]
+
+
+def _set_discount_rate(conn, value):
+    conn.execute('UPDATE GlobalDiscountRate SET rate = ?', (value,))
+
+    return
+
+
+def _set_reserve_margin(conn, value):
+    if isinstance(value, dict):
+        margins = list(value.items())
+    else:
+        margins = [(region, value) for (region,) in
+                   conn.execute('SELECT regions FROM PlanningReserveMargin')]
+    conn.executemany('INSERT OR REPLACE INTO PlanningReserveMargin '
+                     'VALUES (?,?)', margins)
+
+    return
+
+
+def _scale_cost(conn, parameter, tech_name, factor):
+    table = cost_tables[parameter]
+    conn.execute(f'UPDATE "{table}" SET "{parameter}" = "{parameter}" * ? '
+                 f'WHERE tech = ?', (factor, tech_name))
+
+    return
+
+
+def _set_growth_rate(conn, model, demand_name, rate, growth_method):
+    rows = conn.execute('SELECT regions, demand FROM Demand '
+                        'WHERE demand_comm = ? AND periods = ?',
+                        (demand_name, int(model.start_year))).fetchall()
+    if len(rows) == 0:
+        raise ValueError(f"No demand for {demand_name} in "
+                         f"{model.start_year}.")
+    regions = [row[0] for row in rows]
+    init_demand = np.array([row[1] for row in rows])
+    demand = project_growth(init_demand,
+                            rate,
+                            model.start_year,
+                            model.end_year,
+                            model.N_years,
+                            growth_method)
+
+    years = np.asarray(model.time_horizon)
+    conn.executemany('UPDATE Demand SET demand = ? WHERE regions = ? '
+                     'AND periods = ? AND demand_comm = ?',
+                     [(float(demand[i, j]), region, int(year), demand_name)
+                      for i, region in enumerate(regions)
+                      for j, year in enumerate(years)])
+
+    return
+
+
+def apply_scenario(conn, model, scenario, growth_method='linear'):
+    """
+    Updates the rows of a database changed by a scenario.
+
+    Parameters
+    ----------
+    conn : sqlite connector
+        A connection to a copy of the base database.
+    model : ``ModelInfo``
+        The model of the base database.
+    scenario : dictionary
+        The changes (see the top of this file).
+    growth_method : string
+        The growth method of the demands. Accepts: linear, exponential.
+    """
+    for key, value in scenario.items():
+        if key == 'discount_rate':
+            _set_discount_rate(conn, value)
+        elif key == 'reserve_margin':
+            _set_reserve_margin(conn, value)
+        elif isinstance(key, tuple) and key[0] in cost_tables:
+            _scale_cost(conn, key[0], key[1], value)
+        elif isinstance(key, tuple) and key[0] == 'growth_rate':
+            _set_growth_rate(conn, model, key[1], value, growth_method)
+        else:
+            raise ValueError(f"Scenario parameter {key} not recognized. "
+                             f"Accepts: discount_rate, reserve_margin, "
+                             f"growth_rate, {', '.join(cost_tables)}.")
+    conn.commit()
+
+    return
+
+
+def build_scenarios(model, scenarios, growth_method='linear', build=True):
+    """
+    Writes the base database once, then one copy per scenario with the
+    scenario's changes.
+
+    Parameters
+    ----------
+    model : ``ModelInfo``
+        The base model.
+    scenarios : list of dictionaries
+        The changes of each scenario.
+    growth_method : string
+        The growth method of the demands. Accepts: linear, exponential.
+    build : boolean
+        Writes the base database. Set to False if ``model.output_db``
+        is already written.
+
+    Returns
+    -------
+    paths : list of strings
+        The scenario databases, ``<database>_scenario_<i>``, in order.
+    """
+    if build:
+        model._write_sqlite_database()
+
+    base = sqlite3.connect(model.output_db)
+    paths = []
+    for i, scenario in enumerate(scenarios):
+        path = _scenario_path(model.output_db, i)
+        if os.path.exists(path):
+            os.remove(path)
+        conn = sqlite3.connect(path)
+        base.backup(conn)
+        apply_scenario(conn, model, scenario, growth_method)
+        conn.close()
+        paths.append(path)
+    base.close()
+
+    return paths
@@ -0,0 +1,129 @@
+"""
+This file contains the ``BuildSession``, which builds many PyGenesys input
+files in one Python process.
+
+``driver.load_infile`` imports an input file as a regular module, so a
+second build in the same process reuses the cached module and the library
+objects (e.g. ``ELC_DEMAND`` or ``NUCLEAR_ELC``) modified by the first
+build. A ``BuildSession`` executes each input file in its own namespace
+with fresh copies of the technology and commodity libraries. Parsed time
+series and aggregated profiles are cached in ``pygenesys.utils.tsprocess``
+and stay warm between builds.
+"""
+
+import importlib.util
+import itertools
+import os
+import sys
+
+from pygenesys import driver
+from pygenesys.catalog import fresh_library
+
+
+class BuildSession(object):
+    """
+    This class builds PyGenesys input files in isolated namespaces
+    while keeping the time series caches warm between builds.
+    """
+
+    def __init__(self):
+        """
+        Initialize the build session.
+        """
+        self._counter = itertools.count()
+
+        return
+
+    def load(self, infile_path):
+        """
+        Executes an input file in its own namespace with fresh
+        library objects.
+
+        Modules imported from the input file's directory (e.g. helper
+        files next to the input file) are also loaded anew.
+
+        Parameters
+        ----------
+        infile_path : string
+            The path to the PyGenesys input file.
+
+        Returns
+        -------
+        infile : Python module
+            The executed input file. It is not added to ``sys.modules``.
+        """
+        infile_path = os.path.abspath(infile_path)
+        if not infile_path.endswith('.py'):
+            infile_path += '.py'
+        file_dir = os.path.dirname(infile_path)
+
+        base = os.path.splitext(os.path.basename(infile_path))[0]
+        name = f'pygenesys_session_{next(self._counter)}_{base}'
+        spec = importlib.util.spec_from_file_location(name, infile_path)
+        infile = importlib.util.module_from_spec(spec)
+
+        def is_local(module):
+            path = getattr(module, '__file__', None)
+            return (path is not None) and \
+                (os.path.dirname(os.path.abspath(path)) == file_dir)
+
+        local = {n: m for n, m in sys.modules.items() if is_local(m)}
+        for n in local:
+            del sys.modules[n]
+
+        sys.path.insert(0, file_dir)
+        try:
+            with fresh_library():
+                spec.loader.exec_module(infile)
+        finally:
+            sys.path.remove(file_dir)
+            for n in [n for n, m in sys.modules.items() if is_local(m)]:
+                del sys.modules[n]
+            sys.modules.update(local)
+
+        return infile
+
+    def build(self, infile_path, output_db=None, write_config=True):
+        """
+        Loads an input file and writes its database.
+
+        Parameters
+        ----------
+        infile_path : string
+            The path to the PyGenesys input file.
+        output_db : string
+            The path to the output database. Default is
+            ``database_filename`` in the input file.
+        write_config : boolean
+            Also write the Temoa config file. Default is True.
+
+        Returns
+        -------
+        model : ``ModelInfo``
+            The model written to the database.
+        """
+        infile = self.load(infile_path)
+        model = driver.build_model(infile, output_db=output_db)
+        if write_config:
+            driver.write_config(infile)
+
+        return model
+
+    def build_many(self, infile_paths, write_config=True):
+        """
+        Builds a list of input files.
+
+        Parameters
+        ----------
+        infile_paths : list of strings
+            The paths to the PyGenesys input files.
+        write_config : boolean
+            Also write the Temoa config files. Default is True.
+
+        Returns
+        -------
+        models : list of ``ModelInfo``
+            The models written to the databases.
+        """
+        return [self.build(path, write_config=write_config)
+                for path in infile_paths]
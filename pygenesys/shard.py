@@ -0,0 +1,191 @@
+"""
+This file builds a model in parallel, one group of regions at a time.
+
+Every ``create_*`` function in ``db_creator`` writes all regions through
+one connection. For models with many regions, ``build_sharded`` splits the
+regions into groups and writes each group to its own shard database in
+a separate process. The shards are then merged into the final database
+by attaching them and copying each table with ``INSERT ... SELECT``.
+
+Each shard keeps the time periods, regions, and sectors of the whole
+model, so the global tables (e.g. ``time_season``, ``commodities``,
+``technologies``) are the same in every shard and are only copied once.
+An exchange technology in region ``'A-B'`` is written with the group of
+region ``A``.
+
+```bash
+$ genesys --infile my_model.py --shards 8
+```
+"""
+
+import copy
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def region_groups(regions, N_groups):
+    """
+    Splits a list of regions into ``N_groups`` groups of similar size.
+    """
+    N_groups = max(1, min(N_groups, len(regions)))
+
+    return [[str(r) for r in group]
+            for group in np.array_split(list(regions), N_groups)]
+
+
+def _home_region(region):
+    return region.split('-', 1)[0]
+
+
+def shard_model(model, regions, output_db):
+    """
+    Returns a copy of a model with only the data of some regions.
+
+    Parameters
+    ----------
+    model : ``ModelInfo``
+        The full model.
+    regions : list of strings
+        The regions in the shard.
+    output_db : string
+        The path of the shard database.
+
+    Returns
+    -------
+    shard : ``ModelInfo``
+        The model of the shard.
+    """
+    regions = set(regions)
+    shard = copy.copy(model)
+    shard.output_db = output_db
+
+    technologies = []
+    for tech in model.technologies:
+        # technologies without regions are added to the first shard
+        if len(tech.regions) == 0:
+            continue
+        kept = [r for r in tech.regions if _home_region(r) in regions]
+        if len(kept) == len(tech.regions):
+            technologies.append(tech)
+        elif len(kept) > 0:
+            new = tech.instance()
+            new.parameters = tech.parameters.subset(kept)
+            technologies.append(new)
+    shard.technologies = technologies
+
+    def select(data):
+        return {r: value for r, value in data.items() if r in regions}
+
+    demands = []
+    for comm in model.commodities['demand']:
+        new = comm.instance()
+        new.demand = select(comm.demand)
+        new.distribution = select(comm.distribution)
+        new.seg_frac = select(comm.seg_frac)
+        demands.append(new)
+    emissions = []
+    for comm in model.commodities['emissions']:
+        new = comm.instance()
+        new.emissions_limit = select(comm.emissions_limit)
+        emissions.append(new)
+    shard.commodities = dict(model.commodities,
+                             demand=demands,
+                             emissions=emissions)
+    if isinstance(model.reserve_margin, dict):
+        shard.reserve_margin = select(model.reserve_margin)
+
+    return shard
+
+
+def merge_databases(shard_paths, output_db):
+    """
+    Merges shard databases into one database. Rows of the tables
+    without a ``regions`` column (e.g. ``technologies``), and of the
+    ``regions`` table, are only copied once.
+
+    Parameters
+    ----------
+    shard_paths : list of strings
+        The shard databases. All must have the same tables.
+    output_db : string
+        The path to the merged database.
+    """
+    conn = sqlite3.connect(output_db)
+    conn.execute('ATTACH DATABASE ? AS shard', (shard_paths[0],))
+    tables = conn.execute("SELECT name, sql FROM shard.sqlite_master "
+                          "WHERE type = 'table'").fetchall()
+    conn.execute('DETACH DATABASE shard')
+    for name, sql in tables:
+        conn.execute(sql)
+
+    # rows of regional tables are only in the shard of their region
+    regional = [name for name, sql in tables if name != 'regions' and
+                'regions' in [row[1] for row in
+                              conn.execute(f'PRAGMA table_info("{name}")')]]
+
+    for path in shard_paths:
+        conn.execute('ATTACH DATABASE ? AS shard', (path,))
+        for name, sql in tables:
+            command = f'INSERT INTO main."{name}" SELECT * FROM shard."{name}"'
+            if name not in regional:
+                command += f' EXCEPT SELECT * FROM main."{name}"'
+            conn.execute(command)
+        conn.commit()
+        conn.execute('DETACH DATABASE shard')
+    conn.close()
+
+    return
+
+
+def _write_shard(shard):
+    shard._write_sqlite_database()
+
+    return shard.output_db
+
+
+def build_sharded(model, N_shards=None, max_workers=None):
+    """
+    Writes a model's database by building groups of regions in
+    parallel processes and merging them.
+
+    Parameters
+    ----------
+    model : ``ModelInfo``
+        The model to write.
+    N_shards : integer
+        The number of region groups. Default is the number of CPUs.
+    max_workers : integer
+        The number of processes. Default is the number of CPUs.
+
+    Returns
+    -------
+    output_db : string
+        The path to the merged database.
+    """
+    model.validate()
+    if N_shards is None:
+        N_shards = os.cpu_count()
+    # technologies without regions are written with the first shard
+    regions = list(model.regions)
+    for tech in model.technologies:
+        regions += [_home_region(r) for r in tech.regions
+                    if _home_region(r) not in regions]
+    groups = region_groups(regions, N_shards)
+
+    with tempfile.TemporaryDirectory() as shard_dir:
+        shards = [shard_model(model,
+                              group,
+                              os.path.join(shard_dir, f'shard_{i}.sqlite'))
+                  for i, group in enumerate(groups)]
+        shards[0].technologies += [t for t in model.technologies
+                                   if len(t.regions) == 0]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            paths = list(executor.map(_write_shard, shards))
+        merge_databases(paths, model.output_db)
+
+    return model.output_db
@@ -0,0 +1,202 @@
+"""
+This file extracts a smaller, consistent database from a database written
+by PyGenesys, e.g. one region of a 50-region model for debugging.
+
+The subset is copied with SQL only: the source database is attached to
+the new one and every table is filled with one ``INSERT ... SELECT``.
+The input file is not needed. Foreign keys are followed as follows:
+    * Efficiency is copied first, for the chosen regions, technologies,
+      and vintages. Only the technologies left in Efficiency are kept.
+    * Every table with a ``regions``, ``tech``, ``periods``, or
+      ``vintage`` column is filtered by the kept values. Exchange
+      regions (``'A-B'``) are kept if both regions are.
+    * ``time_periods`` keeps the existing vintages, the chosen periods,
+      and the year the last chosen period ends.
+    * ``commodities`` keeps the commodities used by the copied rows.
+
+```bash
+$ python -m pygenesys.subset model.sqlite debug.sqlite --regions IL
+```
+"""
+
+import argparse
+import os
+import sqlite3
+
+# row filters, by column name
+column_filters = {
+    'regions': 'regions IN (SELECT value FROM temp.row_regions)',
+    'tech': 'tech IN (SELECT value FROM temp.keep_techs)',
+    'periods': 'periods IN (SELECT value FROM temp.keep_periods)',
+    't_periods': 't_periods IN (SELECT value FROM temp.keep_periods)',
+    'vintage': 'vintage IN (SELECT value FROM temp.keep_vintages)',
+}
+
+# columns that refer to the commodities table
+commodity_columns = ['input_comm',
+                     'output_comm',
+                     'emis_comm',
+                     'demand_comm',
+                     'demand_name',
+                     'emissions_comm']
+
+
+def _key_table(conn, name, values, query):
+    """
+    Creates a temporary table of kept values, from a list or, if the
+    list is None, from a query on the source database.
+    """
+    conn.execute(f'CREATE TEMP TABLE {name} (value PRIMARY KEY)')
+    if values is None:
+        conn.execute(f'INSERT OR IGNORE INTO temp.{name} {query}')
+    else:
+        conn.executemany(f'INSERT OR IGNORE INTO temp.{name} VALUES (?)',
+                         [(v,) for v in values])
+
+    return
+
+
+def _columns(conn, table):
+    return [row[1] for row in
+            conn.execute(f'PRAGMA src.table_info("{table}")')]
+
+
+def _where(columns):
+    conditions = [column_filters[c] for c in columns if c in column_filters]
+    if len(conditions) == 0:
+        return ''
+
+    return ' WHERE ' + ' AND '.join(conditions)
+
+
+def extract_subset(source_db,
+                   output_db,
+                   regions=None,
+                   technologies=None,
+                   periods=None):
+    """
+    Writes a subset of a PyGenesys database to a new database.
+
+    Parameters
+    ----------
+    source_db : string
+        The path to the existing database.
+    output_db : string
+        The path to the new database. Must not exist.
+    regions : list of strings
+        The regions to keep. Default is all regions.
+    technologies : list of strings
+        The technologies to keep. Default is all technologies.
+    periods : list of integers
+        The future periods to keep. Default is all periods.
+
+    Returns
+    -------
+    rows : dictionary
+        The number of rows in each table of the new database.
+    """
+    if os.path.exists(output_db):
+        raise ValueError(f"{output_db} already exists.")
+    if not os.path.exists(source_db):
+        raise ValueError(f"{source_db} does not exist.")
+
+    conn = sqlite3.connect(output_db)
+    conn.execute('ATTACH DATABASE ? AS src', (source_db,))
+    tables = conn.execute("SELECT name, sql FROM src.sqlite_master "
+                          "WHERE type = 'table'").fetchall()
+    for name, sql in tables:
+        conn.execute(sql)
+
+    _key_table(conn, 'keep_regions', regions,
+               'SELECT regions FROM src.regions')
+    _key_table(conn, 'keep_techs', technologies,
+               'SELECT tech FROM src.technologies')
+    _key_table(conn, 'keep_periods', periods,
+               "SELECT t_periods FROM src.time_periods WHERE flag = 'f' "
+               "AND t_periods < (SELECT MAX(t_periods) "
+               "FROM src.time_periods)")
+
+    # exchange regions 'A-B' are kept if A and B are kept
+    conn.execute('CREATE TEMP TABLE row_regions (value PRIMARY KEY)')
+    conn.execute('INSERT INTO temp.row_regions '
+                 'SELECT value FROM temp.keep_regions')
+    conn.execute("""
+        INSERT OR IGNORE INTO temp.row_regions
+        SELECT DISTINCT regions FROM src.Efficiency
+        WHERE instr(regions, '-') > 0
+        AND substr(regions, 1, instr(regions, '-') - 1)
+            IN (SELECT value FROM temp.keep_regions)
+        AND substr(regions, instr(regions, '-') + 1)
+            IN (SELECT value FROM temp.keep_regions)""")
+
+    conn.execute("""
+        CREATE TEMP TABLE keep_vintages AS
+        SELECT t_periods AS value FROM src.time_periods WHERE flag = 'e'
+        UNION SELECT value FROM temp.keep_periods""")
+    conn.execute("""
+        CREATE TEMP TABLE keep_time AS
+        SELECT value FROM temp.keep_vintages
+        UNION SELECT MIN(t_periods) FROM src.time_periods
+        WHERE t_periods > (SELECT MAX(value) FROM temp.keep_periods)""")
+
+    # technologies follow the processes left in Efficiency
+    conn.execute('INSERT INTO main.Efficiency SELECT * FROM src.Efficiency' +
+                 _where(_columns(conn, 'Efficiency')))
+    conn.execute('DELETE FROM temp.keep_techs WHERE value NOT IN '
+                 '(SELECT tech FROM main.Efficiency)')
+
+    special = ['Efficiency', 'time_periods', 'commodities']
+    for name, sql in tables:
+        if name in special:
+            continue
+        conn.execute(f'INSERT INTO main."{name}" SELECT * FROM src."{name}"'
+                     + _where(_columns(conn, name)))
+
+    conn.execute('INSERT INTO main.time_periods SELECT * FROM '
+                 'src.time_periods WHERE t_periods IN '
+                 '(SELECT value FROM temp.keep_time)')
+
+    used = []
+    for name, sql in tables:
+        for column in _columns(conn, name):
+            if column in commodity_columns:
+                used.append(f'SELECT "{column}" FROM main."{name}"')
+    conn.execute('INSERT INTO main.commodities SELECT * FROM '
+                 'src.commodities WHERE comm_name IN (' +
+                 ' UNION '.join(used) + ')')
+    conn.commit()
+
+    rows = {name: conn.execute(f'SELECT COUNT(*) FROM main."{name}"'
+                               ).fetchone()[0]
+            for name, sql in tables}
+    conn.execute('DETACH DATABASE src')
+    conn.close()
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Extract a subset of a PyGenesys database')
+    parser.add_argument('source_db', help='the existing database')
+    parser.add_argument('output_db', help='the new database')
+    parser.add_argument('--regions', nargs='+', default=None,
+                        help='the regions to keep')
+    parser.add_argument('--techs', nargs='+', default=None,
+                        help='the technologies to keep')
+    parser.add_argument('--periods', nargs='+', type=int, default=None,
+                        help='the future periods to keep')
+    args = parser.parse_args()
+
+    rows = extract_subset(args.source_db,
+                          args.output_db,
+                          regions=args.regions,
+                          technologies=args.techs,
+                          periods=args.periods)
+    print(f"Wrote {sum(rows.values())} rows to {args.output_db}")
+
+    return
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,45 @@
 # Defines Technology
 # =============================================================================
 # =============================================================================
-import numpy as np
+from pygenesys.utils import template
+from pygenesys.utils.parameters import ParameterStore, ParameterView
+
+# per-region parameters, stored in a ``ParameterStore``
+regional_parameters = ['input_comm',
+                       'output_comm',
+                       'efficiency',
+                       'existing_capacity',
+                       'tech_lifetime',
+                       'loan_lifetime',
+                       'cost_variable',
+                       'cost_fixed',
+                       'cost_invest',
+                       'capacity_factor_tech',
+                       'ramp_up',
+                       'ramp_down',
+                       'storage_duration',
+                       'emissions',
+                       'max_capacity',
+                       'min_capacity',
+                       ]
+
+# keyword arguments of ``add_regional_data`` that differ from
+# the parameter name
+regional_keywords = {'existing': 'existing_capacity'}
+
+
+def _parameter_property(name):
+    def getter(self):
+        return ParameterView(self.parameters, name)
+
+    def setter(self, values):
+        template.check_mutable(self)
+        view = ParameterView(self.parameters, name)
+        view.clear()
+        view.update(values)
+
+    return property(getter, setter)
+
 
 class Technology(object):
     """
@@ -12,7 +50,26 @@ class Technology(object):
     in a Temoa simulation. A ``Technology`` transforms
     one energy carrier into another. E.g. a nuclear plant
     might transform a uranium commodity into heat or electricity.
+
+    The per-region parameters (e.g. ``efficiency``) are stored in
+    ``parameters`` and read like dictionaries keyed by region.
     """
+    __slots__ = ('_type',
+                 'tech_name',
+                 'tech_sector',
+                 'tech_label',
+                 'description',
+                 'units',
+                 'capacity_to_activity',
+                 'category',
+                 'reserve_tech',
+                 'ramping_tech',
+                 'storage_tech',
+                 'curtailed_tech',
+                 'exchange_tech',
+                 'parameters',
+                 '_frozen',
+                 )
 
     def __init__(self,
                  tech_name,
@@ -89,32 +146,46 @@ class Technology(object):
         self.storage_tech = storage_tech
         self.curtailed_tech = curtailed_tech
         self.exchange_tech = exchange_tech
-        self.regions = []
-        self.input_comm = {}
-        self.output_comm = {}
-        self.efficiency = {}
-        self.existing_capacity = {}
-        self.tech_lifetime = {}
-        self.loan_lifetime = {}
-        self.cost_variable = {}
-        self.cost_fixed = {}
-        self.cost_invest = {}
-        self.capacity_factor_tech = {}
-        self.ramp_up = {}
-        self.ramp_down = {}
-        self.storage_duration = {}
-        self.emissions = {}
-        self.max_capacity = {}
-        self.min_capacity = {}
+        self.parameters = ParameterStore(regional_parameters)
 
         return
 
+    @property
+    def regions(self):
+        """
+        The regions of this technology, in the order they were added.
+        The list is a copy, so regions are only added with
+        ``add_regional_data``. Catalog templates return a tuple.
+        """
+        if self.parameters.frozen:
+            return tuple(self.parameters.regions)
+
+        return list(self.parameters.regions)
+
     def __repr__(self):
         return (f"{self._type}" +
                 f"(\"{self.tech_name}\"," +
                 f"\"{self.tech_label}\"," +
                 f"\"{self.units}\")")
 
+    def __setattr__(self, name, value):
+        template.check_mutable(self)
+        object.__setattr__(self, name, value)
+
+    def freeze(self):
+        """
+        Makes this technology an immutable template. Returns the
+        technology.
+        """
+        return template.freeze(self)
+
+    def instance(self):
+        """
+        Returns a mutable copy of this technology that shares
+        its per-region parameters until they are replaced.
+        """
+        return template.instance(self)
+
     def _db_entry(self):
         return (self.tech_name,
                 self.tech_label,
@@ -131,51 +202,26 @@ class Technology(object):
 
 
         """
-        attr_dict = {
-            "input_comm": self.input_comm,
-            "output_comm": self.output_comm,
-            "regions": self.regions,
-            "tech_lifetime": self.tech_lifetime,
-            "loan_lifetime": self.loan_lifetime,
-            "cost_variable": self.cost_variable,
-            "cost_fixed": self.cost_fixed,
-            "cost_invest": self.cost_invest,
-            "efficiency": self.efficiency,
-            "existing": self.existing_capacity,
-            "capacity_factor_tech": self.capacity_factor_tech,
-            "ramp_up": self.ramp_up,
-            "ramp_down": self.ramp_down,
-            "storage_duration": self.storage_duration,
-            "emissions": self.emissions,
-            "max_capacity":self.max_capacity,
-            "min_capacity":self.min_capacity,
-        }
-
-        # check if region is a list or a string
+        template.check_mutable(self)
+        names = [regional_keywords.get(kw, kw) for kw in kwargs]
+        for name in names:
+            if name not in self.parameters.names:
+                raise KeyError(name)
+
         if isinstance(region, str):
-            if region in self.regions:
-                pass
-            else:
-                self.regions.append(region)
-            for kw in kwargs:
-                # print(kw, kwargs[kw])
-                attribute = attr_dict[kw]
-                attribute[region] = kwargs[kw]
-
-        elif isinstance(region, list):
-            self.regions += region
-            self.regions = list(np.unique(self.regions))
-            for kw in kwargs:
-                # print(kw, kwargs[kw])
-                attribute = attr_dict[kw]
-                for pl in region:
-                    attribute[pl] = kwargs[kw]
-
-        # print(self.input_comm)
-        # print(self.output_comm)
-        # print(self.efficiency)
+            region = [region]
+        for pl in region:
+            self.parameters.add_region(pl)
+            for name, value in zip(names, kwargs.values()):
+                self.parameters.set(name, pl, value)
+
         return
 
 
+for _name in regional_parameters:
+    setattr(Technology, _name, _parameter_property(_name))
+del _name
+
+
 if __name__ == '__main__':
     pass
@@ -0,0 +1,99 @@
+from pygenesys import driver
+from pygenesys.session import BuildSession
+import numpy as np
+import pytest
+
+
+base_infile = """
+import os
+curr_dir = os.path.dirname(__file__)
+folder = '.'
+database_filename = 'session.sqlite'
+scenario_name = 'test'
+start_year = 2025
+end_year = 2035
+N_years = 3
+N_seasons = 4
+N_hours = 24
+reserve_margin = {}
+discount_rate = 0.05
+
+from pygenesys.commodity.demand import ELC_DEMAND
+from pygenesys.commodity.resource import ethos
+from pygenesys.technology.transmission import TRANSMISSION
+
+ELC_DEMAND.add_demand(region='A', init_demand=100, start_year=start_year,
+                      end_year=end_year, N_years=N_years)
+TRANSMISSION.add_regional_data(region='A', input_comm=ethos,
+                               output_comm=ELC_DEMAND, efficiency=1.0,
+                               tech_lifetime=1000)
+"""
+
+second_region = """
+ELC_DEMAND.add_demand(region='B', init_demand=300, start_year=start_year,
+                      end_year=end_year, N_years=N_years)
+TRANSMISSION.add_regional_data(region='B', input_comm=ethos,
+                               output_comm=ELC_DEMAND, efficiency=1.0,
+                               tech_lifetime=1000)
+"""
+
+
+@pytest.fixture
+def infile_text():
+    """
+    A small input file: one region 'A', one demand, one technology,
+    and three periods.
+    """
+    return base_infile
+
+
+@pytest.fixture
+def two_regions():
+    """
+    Adds region 'B' to ``infile_text``.
+    """
+    return second_region
+
+
+@pytest.fixture
+def write_infile(tmp_path, infile_text):
+    """
+    Returns a function that writes an input file to ``tmp_path`` and
+    returns its path. The text is ``infile_text`` plus ``extra``.
+    """
+    def write(extra='', text=None, name='infile'):
+        path = tmp_path / f'{name}.py'
+        path.write_text((infile_text if text is None else text) + extra)
+
+        return path
+
+    return write
+
+
+@pytest.fixture
+def load_infile(write_infile):
+    """
+    Returns a function that writes and loads an input file, with a
+    uniform demand distribution in every region.
+    """
+    def load(extra='', text=None, name='infile'):
+        module = BuildSession().load(str(write_infile(extra, text, name)))
+        for region in module.ELC_DEMAND.demand:
+            module.ELC_DEMAND.distribution[region] = np.ones(96) / 96
+
+        return module
+
+    return load
+
+
+@pytest.fixture
+def load_model(load_infile):
+    """
+    Returns a function that writes and loads an input file and returns
+    its ``ModelInfo``, without writing the database.
+    """
+    def load(extra='', text=None, name='infile', output_db=None):
+        return driver.create_model(load_infile(extra, text, name),
+                                   output_db)
+
+    return load
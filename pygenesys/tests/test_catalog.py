@@ -0,0 +1,61 @@
+from pygenesys import catalog
+from pygenesys.technology.technology import Technology
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+
+
+def test_template_immutable():
+    template = catalog.get_template('NUCLEAR_ELC')
+
+    with pytest.raises(ValueError):
+        template.add_regional_data(region='A', efficiency=1.0)
+    with pytest.raises(ValueError):
+        template.tech_name = 'REACTOR'
+    with pytest.raises(ValueError):
+        catalog.get_template('ELC_DEMAND').set_demands(['A'], [[1.0]])
+    with pytest.raises(ValueError):
+        catalog.get_template('FUSION_ELC')
+
+    return
+
+
+def test_instances_independent():
+    first = catalog.instance('NUCLEAR_ELC')
+    second = catalog.instance('NUCLEAR_ELC')
+    first.add_regional_data(region='A', efficiency=1.0)
+
+    assert first.regions == ['A']
+    assert second.regions == []
+    assert catalog.get_template('NUCLEAR_ELC').regions == ()
+
+    return
+
+
+def test_instance_shares_data():
+    base = Technology(tech_name='PV', units='MW', capacity_to_activity=8.76)
+    profile = np.ones(96)
+    base.add_regional_data(region='A', capacity_factor_tech=profile)
+    variant = base.instance()
+    variant.add_regional_data(region='A', efficiency=0.9)
+    variant.add_regional_data(region='B', capacity_factor_tech=0.2)
+
+    assert variant.capacity_factor_tech['A'] is profile
+    assert base.regions == ['A']
+    assert base.efficiency == {}
+
+    return
+
+
+def test_concurrent_instances():
+    def build(region):
+        tech = catalog.instance('SOLAR_FARM')
+        tech.add_regional_data(region=region, efficiency=1.0)
+        return tech
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        techs = list(executor.map(build, ['A', 'B', 'C', 'D']))
+
+    assert [t.regions for t in techs] == [['A'], ['B'], ['C'], ['D']]
+
+    return
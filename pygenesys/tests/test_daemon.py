@@ -0,0 +1,72 @@
+from pygenesys.daemon import BuildDaemon
+from pygenesys.utils import tsprocess
+import json
+import os
+import sqlite3
+import urllib.request
+
+
+def count_demand(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT * FROM Demand").fetchall()
+    conn.close()
+
+    return len(rows)
+
+
+def test_daemon_rebuilds_on_change(write_infile, infile_text):
+    infile = write_infile()
+    tsprocess.clear_cache()
+    daemon = BuildDaemon(str(infile))
+
+    first = daemon.build()
+    assert first['status'] == 'ok'
+    assert first['changed'] == [str(infile)]
+    assert daemon.poll() is None
+
+    # a longer time horizon, written with a later modification time
+    write_infile(text=infile_text.replace('N_years = 3', 'N_years = 6'))
+    mtime = os.stat(infile).st_mtime
+    os.utime(infile, (mtime + 10, mtime + 10))
+    second = daemon.poll()
+
+    assert second['status'] == 'ok'
+    assert count_demand(second['output_db']) == 6
+    assert not os.path.exists(second['output_db'] + '.building')
+
+    return
+
+
+def test_daemon_reports_errors(write_infile):
+    infile = write_infile("\nraise RuntimeError('typo')\n")
+    daemon = BuildDaemon(str(infile))
+
+    result = daemon.build()
+
+    assert result['status'] == 'error'
+    assert 'typo' in result['error']
+
+    return
+
+
+def test_daemon_http_api(write_infile):
+    infile = write_infile()
+    daemon = BuildDaemon(str(infile))
+    host, port = daemon.serve(port=0)
+
+    try:
+        request = urllib.request.Request(f'http://{host}:{port}/build',
+                                         method='POST')
+        with urllib.request.urlopen(request) as response:
+            build = json.loads(response.read())
+        with urllib.request.urlopen(f'http://{host}:{port}/status') as \
+                response:
+            status = json.loads(response.read())
+    finally:
+        daemon.stop()
+
+    assert build['status'] == 'ok'
+    assert status['N_builds'] == 1
+    assert status['last_build']['output_db'] == build['output_db']
+
+    return
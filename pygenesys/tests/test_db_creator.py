@@ -72,3 +72,22 @@ def test_create_time_periods():
 
     os.remove(test_db)
     return
+
+
+def test_create_segfrac_array():
+    # set up
+    conn = establish_connection(test_db)
+    hours = [['H1'], ['H2']]
+    segfrac = np.array([[0.1, 0.15]] * N_seasons)
+    create_segfrac(conn, segfrac, seasons, hours)
+    cursor = conn.cursor()
+    table_data = list(cursor.execute("SELECT * FROM SegFrac"))
+    conn.close()
+
+    # tests
+    assert(len(table_data) == N_seasons * len(hours))
+    assert(table_data[0][:3] == ('S1', 'H1', 0.1))
+    assert(table_data[1][:3] == ('S1', 'H2', 0.15))
+
+    os.remove(test_db)
+    return
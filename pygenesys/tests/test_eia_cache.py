@@ -0,0 +1,128 @@
+from pygenesys.data import eia_data
+import os
+import pandas as pd
+import pytest
+
+
+def write_workbook(path):
+    """
+    Writes a small workbook in the format of EIA form 860M.
+    """
+    data = pd.DataFrame({
+        "Entity ID": [1, 2, 3, 4],
+        "Entity Name": ["A", "B", "C", "D"],
+        "Plant Name": ["P1", "P2", "P3", "P4"],
+        "Sector": ["IPP", "IPP", "Utility", "Utility"],
+        "Plant State": ["IL", "IL", "IL", "WI"],
+        "Nameplate Capacity (MW)": [1000.0, 500.0, 20.0, 30.0],
+        "Technology": ["Nuclear", "Nuclear", "Solar Photovoltaic",
+                       "Nuclear"],
+        "Operating Year": [1970, 1970, 2016, 1980],
+        "Status": ["(OP) Operating"] * 4,
+        "Balancing Authority Code": ["PJM", "PJM", "MISO", "MISO"],
+        "County": ["Will", "Will", "Champaign", "Kewaunee"],
+    })
+    with pd.ExcelWriter(path) as writer:
+        data.to_excel(writer, sheet_name="Operating",
+                      startrow=2, index=False)
+        footer = pd.DataFrame([["Note"], ["Source"]])
+        footer.to_excel(writer, sheet_name="Operating",
+                        startrow=len(data) + 3, index=False, header=False)
+
+    return
+
+
+def test_cache_eia_generators(tmp_path):
+    workbook = str(tmp_path / "april_generator2021.xlsx")
+    write_workbook(workbook)
+    cache = str(tmp_path / "cache")
+
+    path = eia_data.cache_eia_generators(workbook, directory=cache)
+
+    assert os.path.exists(path)
+    assert "april_generator2021" in path
+
+    df = eia_data.get_eia_generators(month="april",
+                                     year=2021,
+                                     offline=True,
+                                     directory=cache)
+
+    assert len(df) == 4
+    assert df.index.name == "Entity ID"
+    assert df["Operating Year"].dtype == int
+    assert eia_data.get_existing_capacity(df, "IL", "Nuclear") == {
+        1970: 1500.0}
+
+    return
+
+
+def test_get_eia_generators_columns(tmp_path):
+    workbook = str(tmp_path / "april_generator2021.xlsx")
+    write_workbook(workbook)
+    cache = str(tmp_path / "cache")
+    eia_data.cache_eia_generators(workbook, directory=cache)
+
+    columns = ["Plant State", "Technology"]
+    df = eia_data.get_eia_generators(month="april",
+                                     year=2021,
+                                     columns=columns,
+                                     offline=True,
+                                     directory=cache)
+
+    assert list(df.columns) == columns
+
+    return
+
+
+def test_get_eia_generators_offline_missing(tmp_path):
+    with pytest.raises(ValueError):
+        eia_data.get_eia_generators(month="may",
+                                    year=2021,
+                                    offline=True,
+                                    directory=str(tmp_path))
+
+    return
+
+
+def test_cache_eia_generators_bad_name(tmp_path):
+    with pytest.raises(ValueError):
+        eia_data.cache_eia_generators(str(tmp_path / "generators.xlsx"),
+                                      directory=str(tmp_path))
+
+    return
+
+
+def test_capacity_cube_matches_get_existing_capacity(tmp_path):
+    workbook = str(tmp_path / "april_generator2021.xlsx")
+    write_workbook(workbook)
+    df = eia_data.read_eia_workbook(workbook)
+    cube = eia_data.CapacityCube(df)
+
+    for region in ["IL", "wi", "will", "Champaign"]:
+        for tech in ["Nuclear", "solar photovoltaic"]:
+            try:
+                expected = eia_data.get_existing_capacity(df, region, tech)
+            except ValueError:
+                with pytest.raises(ValueError):
+                    cube.existing_capacity(region, tech)
+                continue
+            assert cube.existing_capacity(region, tech) == expected
+
+    with pytest.raises(ValueError):
+        cube.existing_capacity("QU", "Nuclear")
+
+    return
+
+
+def test_capacity_cube_bulk(tmp_path):
+    workbook = str(tmp_path / "april_generator2021.xlsx")
+    write_workbook(workbook)
+    cube = eia_data.CapacityCube(eia_data.read_eia_workbook(workbook))
+
+    existing = cube.bulk_existing_capacity(["IL", "WI"])
+
+    assert existing == {"Nuclear": {"IL": {1970: 1500.0},
+                                    "WI": {1980: 30.0}},
+                        "Solar Photovoltaic": {"IL": {2016: 20.0}}}
+
+    return
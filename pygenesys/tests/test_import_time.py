@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+
+# cold start budget for the driver, in seconds
+import_budget = 0.5
+
+# modules that should only be imported on the code paths that use them
+lazy_modules = ['pandas', 'jinja2']
+
+
+def import_times(module):
+    """
+    Imports a module in a fresh interpreter with ``python -X importtime``
+    and returns the cumulative import time of every module, in seconds.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime',
+                             '-c', f'import {module}'],
+                            capture_output=True,
+                            text=True,
+                            check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative_us) * 1e-6
+
+    return times
+
+
+def test_driver_lazy_imports():
+    times = import_times('pygenesys.driver')
+
+    for module in lazy_modules:
+        assert module not in times
+
+    return
+
+
+def test_library_lazy_imports():
+    times = import_times('pygenesys.technology.electric, '
+                         'pygenesys.commodity.demand')
+
+    for module in lazy_modules:
+        assert module not in times
+
+    return
+
+
+def test_driver_import_budget():
+    # the fastest of a few runs, to ignore a busy machine
+    best = min(import_times('pygenesys.driver')['pygenesys.driver']
+               for i in range(3))
+
+    assert best < import_budget
+
+    return
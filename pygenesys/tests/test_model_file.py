@@ -0,0 +1,163 @@
+from pygenesys import model_file
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import sqlite3
+
+
+spec = {
+    "model": {"database_filename": "model.sqlite",
+              "scenario_name": "test",
+              "start_year": 2025,
+              "end_year": 2035,
+              "N_years": 3,
+              "N_seasons": 4,
+              "N_hours": 24},
+    "commodities": {
+        "ethos": {"catalog": "ethos"},
+        "ELC": {"type": "demand", "units": "GWh",
+                "demand": {"A": {"init_demand": 100.0,
+                                 "growth_rate": 0.01}}},
+        "co2": {"type": "emission", "units": "kt"},
+    },
+    "technologies": {
+        "PV": {"units": "MW",
+               "capacity_to_activity": 31.536,
+               "regions": {"A": {"input_comm": "ethos",
+                                 "output_comm": "ELC",
+                                 "efficiency": 1.0,
+                                 "tech_lifetime": 25,
+                                 "cost_invest": {"2025": 1.5,
+                                                 "2030": 1.2,
+                                                 "2035": 1.0},
+                                 "emissions": {"co2": 0.0},
+                                 "capacity_factor_tech": {"data":
+                                                          "pv.csv"}}}},
+    },
+}
+
+toml_text = """
+[model]
+database_filename = "model.sqlite"
+scenario_name = "test"
+start_year = 2025
+end_year = 2035
+N_years = 3
+N_seasons = 4
+N_hours = 24
+
+[commodities.ethos]
+catalog = "ethos"
+
+[commodities.ELC]
+type = "demand"
+units = "GWh"
+demand.A = {init_demand = 100.0, growth_rate = 0.01}
+
+[commodities.co2]
+type = "emission"
+units = "kt"
+
+[technologies.PV]
+units = "MW"
+capacity_to_activity = 31.536
+
+[technologies.PV.regions.A]
+input_comm = "ethos"
+output_comm = "ELC"
+efficiency = 1.0
+tech_lifetime = 25
+cost_invest = {2025 = 1.5, 2030 = 1.2, 2035 = 1.0}
+emissions = {co2 = 0.0}
+capacity_factor_tech = {data = "pv.csv"}
+"""
+
+
+def write_data(path):
+    hours = pd.date_range('2019-01-01', '2019-12-31 23:00', freq='H')
+    data = pd.DataFrame({'kw': (hours.hour >= 12).astype(float)},
+                        index=pd.Index(hours, name='time'))
+    data.to_csv(path)
+
+    return
+
+
+def test_load_json_model(tmp_path):
+    write_data(tmp_path / "pv.csv")
+    path = tmp_path / "model.json"
+    path.write_text(json.dumps(spec))
+
+    model = model_file.load_model_file(str(path))
+    model._write_sqlite_database()
+
+    assert model.output_db == str(tmp_path / "model.sqlite")
+    conn = sqlite3.connect(model.output_db)
+    demand = conn.execute("SELECT * FROM Demand").fetchall()
+    cf = conn.execute("SELECT cf_tech FROM CapacityFactorTech").fetchall()
+    costs = conn.execute("SELECT * FROM CostInvest").fetchall()
+    conn.close()
+
+    assert len(demand) == 3
+    assert np.array(cf).reshape(4, 24)[0, 11:13] == pytest.approx([0, 1])
+    assert len(costs) == 3
+
+    return
+
+
+def test_toml_matches_json(tmp_path):
+    write_data(tmp_path / "pv.csv")
+    path = tmp_path / "model.toml"
+    path.write_text(toml_text)
+    from_toml = model_file.read_model_file(str(path))
+
+    assert model_file.model_hash(from_toml, str(tmp_path)) == \
+        model_file.model_hash(spec, str(tmp_path))
+
+    return
+
+
+def test_hash_tracks_data(tmp_path):
+    write_data(tmp_path / "pv.csv")
+    before = model_file.model_hash(spec, str(tmp_path))
+    (tmp_path / "pv.csv").write_text("time,kw\n")
+
+    assert model_file.model_hash(spec, str(tmp_path)) != before
+
+    return
+
+
+def test_validate_model(tmp_path):
+    bad = json.loads(json.dumps(spec))
+    del bad['model']['N_hours']
+    bad['technologies']['PV']['regions']['A']['output_comm'] = 'STEAM'
+    bad['technologies']['PV']['regions']['A']['colour'] = 'blue'
+
+    with pytest.raises(ValueError) as error:
+        model_file.validate_model(bad, str(tmp_path))
+
+    message = str(error.value)
+    assert 'model.N_hours' in message
+    assert 'STEAM' in message
+    assert 'colour' in message
+    assert 'pv.csv' in message
+
+    return
+
+
+def test_validate_commodity_data(tmp_path):
+    write_data(tmp_path / "pv.csv")
+    bad = json.loads(json.dumps(spec))
+    bad['commodities']['co2']['demand'] = {'A': {'init_demand': 1.0}}
+    bad['commodities']['ethos']['limits'] = {'A': {'2050': 0.0}}
+    bad['commodities']['ELC']['demand']['B'] = {'growth_rate': 0.01}
+
+    with pytest.raises(ValueError) as error:
+        model_file.validate_model(bad, str(tmp_path))
+
+    message = str(error.value)
+    assert 'Commodity co2: only DemandCommodity accepts demand' in message
+    assert 'Commodity ethos: only EmissionsCommodity accepts limits' in message
+    assert 'demand in B' in message
+
+    return
@@ -0,0 +1,106 @@
+from pygenesys import driver
+import numpy as np
+import os
+import sqlite3
+
+
+def test_estimate_size_exact_rows(load_infile):
+    module = load_infile()
+    module.TRANSMISSION.add_regional_data(region='A',
+                                          capacity_factor_tech=0.9)
+
+    model = driver.create_model(module)
+    estimate = model.estimate_size()
+    assert not os.path.exists(model.output_db)
+
+    model._write_sqlite_database()
+    conn = sqlite3.connect(model.output_db)
+    for table, rows in estimate['tables'].items():
+        count = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()
+        assert count[0] == rows
+    conn.close()
+
+    assert estimate['tables']['CapacityFactorTech'] == 96
+    # vintages 2025, 2030, and 2035 are active in 3, 2, and 1 periods
+    assert estimate['variables']['V_FlowOut'] == 6 * 96
+    assert estimate['variables']['V_Capacity'] == 3
+    assert 0.5 < estimate['bytes'] / os.path.getsize(model.output_db) < 1.5
+
+    return
+
+
+def test_skip_default_capacity_factors(load_infile):
+    module = load_infile("\nskip_default_cf = True\n")
+    profile = np.ones(96)
+    profile[:10] = 0.5
+    module.TRANSMISSION.add_regional_data(region='A',
+                                          capacity_factor_tech=profile)
+
+    model = driver.create_model(module)
+    estimate = model.estimate_size()
+    model._write_sqlite_database()
+    conn = sqlite3.connect(model.output_db)
+    rows = conn.execute('SELECT cf_tech FROM CapacityFactorTech').fetchall()
+    conn.close()
+
+    assert estimate['tables']['CapacityFactorTech'] == 10
+    assert rows == [(0.5,)] * 10
+
+    return
+
+
+def test_vintage_bins(load_infile):
+    module = load_infile("\nvintage_bins = 5\n")
+    existing = {year: 1.0 for year in range(1990, 2025)}
+    module.TRANSMISSION.add_regional_data(region='A', existing=existing)
+
+    model = driver.create_model(module)
+    model._write_sqlite_database()
+    conn = sqlite3.connect(model.output_db)
+    vintages = conn.execute('SELECT vintage, exist_cap FROM ExistingCapacity'
+                            ).fetchall()
+    conn.close()
+
+    assert len(vintages) == 7
+    assert sum(cap for year, cap in vintages) == 35.0
+    assert model.vintage_report[('TRANSMISSION', 'A')]['vintages'] == (35, 7)
+    assert module.TRANSMISSION.existing_capacity['A'] is existing
+
+    return
+
+
+def test_vintage_tolerance(load_model):
+    extra = ("\nvintage_bins = 100\n"
+             "TRANSMISSION.add_regional_data(region='A', tech_lifetime=30,\n"
+             "    existing={year: 1.0 for year in range(1996, 2025)})\n")
+
+    wide = load_model(extra, name='wide')
+    split = load_model(extra + "vintage_tolerance = 0.05\n", name='split')
+    wide = wide.vintage_report[('TRANSMISSION', 'A')]
+    split = split.vintage_report[('TRANSMISSION', 'A')]
+
+    assert wide['vintages'] == (29, 1)
+    assert wide['error'] > 0.05
+    assert split['vintages'][1] > 1
+    assert split['error'] <= 0.05
+
+    return
+
+
+def test_region_map(load_infile, two_regions):
+    module = load_infile(two_regions + "region_map = {'A': 'Z', 'B': 'Z'}\n")
+
+    model = driver.create_model(module)
+    model._write_sqlite_database()
+    conn = sqlite3.connect(model.output_db)
+    regions = conn.execute('SELECT regions FROM regions').fetchall()
+    demand = conn.execute('SELECT regions, demand FROM Demand').fetchall()
+    efficiency = conn.execute('SELECT regions FROM Efficiency').fetchall()
+    conn.close()
+
+    assert regions == [('Z',)]
+    assert demand[0] == ('Z', 400.0)
+    assert set(efficiency) == {('Z',)}
+    assert module.TRANSMISSION.regions == ['A', 'B']
+
+    return
@@ -0,0 +1,62 @@
+from pygenesys.myopic import build_windows, myopic_windows
+import pytest
+import sqlite3
+
+
+@pytest.fixture
+def window_model(load_model, infile_text):
+    """
+    Returns a function that loads a model with five periods.
+    """
+    text = (infile_text.replace('N_years = 3', 'N_years = 5')
+            .replace('end_year = 2035', 'end_year = 2045'))
+
+    def load(extra=''):
+        return load_model(extra, text=text)
+
+    return load
+
+
+def test_myopic_windows(window_model):
+    model = window_model()
+    windows = myopic_windows(model, 2)
+
+    assert [list(w.time_horizon) for w in windows] == [[2025, 2030],
+                                                       [2035, 2040],
+                                                       [2045]]
+    assert [w.boundary_year for w in windows] == [2035, 2045, None]
+    assert len(windows[1].commodities['demand'][0].demand['A']) == 2
+    assert len(model.commodities['demand'][0].demand['A']) == 5
+    assert len(myopic_windows(model, 3, step=1)) == 3
+
+    return
+
+
+def test_build_windows(window_model):
+    model = window_model()
+    paths = build_windows(model, 2, max_workers=2)
+
+    conn = sqlite3.connect(paths[1])
+    periods = conn.execute("SELECT t_periods FROM time_periods "
+                           "WHERE flag = 'f'").fetchall()
+    demand = conn.execute("SELECT periods FROM Demand").fetchall()
+    conn.close()
+
+    assert len(paths) == 3
+    assert periods == [(2035,), (2040,), (2045,)]
+    assert demand == [(2035,), (2040,)]
+
+    return
+
+
+def test_myopic_base_year(window_model):
+    model = window_model("\nmyopic_periods = 2\n")
+    model._write_sqlite_database()
+
+    conn = sqlite3.connect(model.output_db)
+    base_year = conn.execute("SELECT * FROM MyopicBaseyear").fetchall()
+    conn.close()
+
+    assert base_year == [(2025.0, '')]
+
+    return
@@ -0,0 +1,54 @@
+from pygenesys.network import CommodityNetwork
+from pygenesys.technology.technology import Technology
+from pygenesys.commodity.commodity import Commodity, DemandCommodity
+
+
+def small_network():
+    ethos = Commodity(comm_name='ethos', units='NULL')
+    gas = Commodity(comm_name='NG', units='MWh')
+    coal = Commodity(comm_name='COAL', units='MWh')
+    steam = Commodity(comm_name='STEAM', units='MWh')
+    elc = Commodity(comm_name='ELC', units='MWh')
+    demand = DemandCommodity(comm_name='ELC_DEMAND', units='MWh')
+    demand.demand['A'] = [1.0]
+    demand.demand['B'] = [1.0]
+
+    def tech(name, inp, out, regions, exchange_tech=False):
+        tech = Technology(tech_name=name, units='MW', capacity_to_activity=1,
+                          exchange_tech=exchange_tech)
+        tech.add_regional_data(region=regions, input_comm=inp,
+                               output_comm=out, efficiency=1.0)
+        return tech
+
+    techs = [tech('IMP_NG', ethos, gas, ['A']),
+             tech('NG_PLANT', gas, elc, ['A', 'B']),
+             tech('COAL_PLANT', coal, elc, ['A']),
+             tech('BOILER', gas, steam, ['A']),
+             tech('ELC_EX', elc, elc, ['A-B'], exchange_tech=True),
+             tech('TRANSMISSION', elc, demand, ['A', 'B'])]
+
+    return CommodityNetwork(techs)
+
+
+def test_dead_ends_and_unreachable():
+    network = small_network()
+
+    assert network.dead_ends() == [('BOILER', 'A')]
+    assert network.unreachable() == [('COAL_PLANT', 'A'),
+                                     ('NG_PLANT', 'B')]
+    assert len(network.commodities) == 6
+
+    return
+
+
+def test_prune():
+    network = small_network()
+    techs = network.prune()
+    names = [t.tech_name for t in techs]
+
+    assert names == ['IMP_NG', 'NG_PLANT', 'ELC_EX', 'TRANSMISSION']
+    assert techs[1].regions == ['A']
+    assert network.technologies[1].regions == ['A', 'B']
+    assert techs[3] is network.technologies[5]
+
+    return
@@ -0,0 +1,138 @@
+from pygenesys.data import nrel_data
+from pytest import approx
+import pandas as pd
+import pytest
+import os
+
+
+def write_atb(path, offset=0.0):
+    """
+    Writes a small file in the format of the NREL ATB. ``offset`` is
+    added to every nuclear CAPEX value.
+    """
+    rows = []
+    for atb_year in [2020, 2021]:
+        for year, capex in [(2020, 6000.0), (2030, 5000.0), (2040, 4000.0)]:
+            for scenario in ['Moderate', 'Advanced']:
+                for case in ['Market', 'R&D']:
+                    rows.append([atb_year, 'CAPEX', case, 'Nuclear',
+                                 'NuclearLarge', scenario, year,
+                                 capex + atb_year - 2021 + offset,
+                                 '$/kW'])
+                    rows.append([atb_year, 'CAPEX', case, 'UtilityPV',
+                                 'Class1', scenario, year,
+                                 capex / 4, '$/kW'])
+                    rows.append([atb_year, 'CAPEX', case, 'UtilityPV',
+                                 'Class5', scenario, year,
+                                 capex / 2, '$/kW'])
+                    rows.append([atb_year, 'Fixed O&M', case, 'Nuclear',
+                                 'NuclearLarge', scenario, year,
+                                 120.0, '$/kW-yr'])
+    df = pd.DataFrame(rows, columns=['atb_year',
+                                     'core_metric_parameter',
+                                     'core_metric_case',
+                                     'technology',
+                                     'techdetail',
+                                     'scenario',
+                                     'core_metric_variable',
+                                     'value',
+                                     'units'])
+    df.to_csv(path, index=False)
+
+    return
+
+
+def test_load_atb_filters(tmp_path):
+    csv = str(tmp_path / "ATBe.csv")
+    write_atb(csv)
+
+    df = nrel_data.load_atb(atb_year=2021,
+                            technology='Nuclear',
+                            scenario='Moderate',
+                            core_metric_parameter='CAPEX',
+                            csv=csv,
+                            directory=str(tmp_path / "store"))
+
+    assert len(df) == 6
+    assert df.index.names == nrel_data.atb_index
+    assert df.index.is_monotonic_increasing
+    assert list(df['core_metric_case'].cat.categories) == ['Market', 'R&D']
+
+    return
+
+
+def test_load_atb_rebuilds_stale_store(tmp_path):
+    csv = str(tmp_path / "ATBe.csv")
+    store = str(tmp_path / "store")
+    write_atb(csv)
+
+    def nuclear_capex(**kwargs):
+        df = nrel_data.load_atb(technology='Nuclear',
+                                scenario='Moderate',
+                                core_metric_parameter='CAPEX',
+                                core_metric_case='Market',
+                                directory=store,
+                                **kwargs)
+        return df['value'].tolist()
+
+    assert nuclear_capex(csv=csv) == [6000.0, 5000.0, 4000.0]
+
+    # the same file, modified
+    write_atb(csv, offset=100.0)
+    mtime = os.path.getmtime(csv) + 10
+    os.utime(csv, (mtime, mtime))
+    assert nuclear_capex(csv=csv) == [6100.0, 5100.0, 4100.0]
+    assert nuclear_capex() == [6100.0, 5100.0, 4100.0]
+
+    # a different file
+    other = str(tmp_path / "other.csv")
+    write_atb(other, offset=200.0)
+    assert nuclear_capex(csv=other) == [6200.0, 5200.0, 4200.0]
+
+    return
+
+
+def test_nrel_cost_projection_time_horizon(tmp_path):
+    csv = str(tmp_path / "ATBe.csv")
+    write_atb(csv)
+    store = str(tmp_path / "store")
+    nrel_data.build_atb_store(csv, store)
+
+    projection = nrel_data.nrel_cost_projection('Nuclear',
+                                                'CAPEX',
+                                                time_horizon=[2015, 2025,
+                                                              2050],
+                                                scale=1e-3,
+                                                directory=store)
+
+    assert list(projection.keys()) == [2015, 2025, 2050]
+    assert projection[2015] == approx(6.0)
+    assert projection[2025] == approx(5.5)
+    assert projection[2050] == approx(4.0)
+
+    return
+
+
+def test_nrel_cost_projection_many_techs(tmp_path):
+    csv = str(tmp_path / "ATBe.csv")
+    write_atb(csv)
+    store = str(tmp_path / "store")
+    nrel_data.build_atb_store(csv, store)
+
+    projection = nrel_data.nrel_cost_projection(['Nuclear', 'UtilityPV'],
+                                                'CAPEX',
+                                                tech_detail={'UtilityPV':
+                                                             'Class5'},
+                                                directory=store)
+
+    assert projection['Nuclear'] == {2020: 6000.0,
+                                     2030: 5000.0,
+                                     2040: 4000.0}
+    assert projection['UtilityPV'][2030] == approx(2500.0)
+
+    with pytest.raises(ValueError):
+        nrel_data.nrel_cost_projection(['Nuclear', 'CSP'],
+                                       'CAPEX',
+                                       directory=store)
+
+    return
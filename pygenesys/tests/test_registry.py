@@ -0,0 +1,93 @@
+from pygenesys.registry import ModelRegistry
+from pygenesys.technology.technology import Technology
+from pygenesys.commodity.commodity import (Commodity,
+                                           DemandCommodity,
+                                           EmissionsCommodity)
+import numpy as np
+import pytest
+import types
+
+
+def build_module():
+    """
+    Returns an input file module with two technologies.
+    """
+    uranium = Commodity(comm_name='URANIUM', units='kg', description='')
+    elc = DemandCommodity(comm_name='ELC', units='MWh', description='')
+    co2 = EmissionsCommodity(comm_name='CO2', units='kt', description='')
+
+    plant = Technology(tech_name='PLANT', units='MW',
+                       capacity_to_activity=8.76)
+    plant.add_regional_data(region='A',
+                            input_comm=uranium,
+                            output_comm=elc,
+                            emissions={co2: 1.0})
+    mine = Technology(tech_name='MINE', units='MW',
+                      capacity_to_activity=8.76)
+    mine.add_regional_data(region=['A', 'B'],
+                           input_comm=[uranium],
+                           output_comm=uranium)
+
+    module = types.ModuleType('infile')
+    module.PLANT = plant
+    module.MINE = mine
+    module.tech_list = [plant]
+    module.profile = np.zeros((1000, 1000))
+
+    return module
+
+
+def test_collect_dedup():
+    module = build_module()
+    registry = ModelRegistry()
+    registry.collect(module)
+    registry.add(module.PLANT, [module.MINE])
+
+    assert len(registry) == 2
+    assert registry.technologies == [module.PLANT, module.MINE]
+
+    return
+
+
+def test_commodity_discovery():
+    module = build_module()
+    registry = ModelRegistry(technologies=[module.PLANT, module.MINE])
+
+    assert [c.comm_name for c in registry.demands] == ['ELC']
+    assert [c.comm_name for c in registry.resources] == ['URANIUM']
+    assert [c.comm_name for c in registry.emissions] == ['CO2']
+
+    return
+
+
+def test_add_invalid():
+    registry = ModelRegistry()
+
+    with pytest.raises(ValueError):
+        registry.add('PLANT')
+
+    return
+
+
+def test_commodities_by_name():
+    module = build_module()
+    elc = DemandCommodity(comm_name='ELC', units='MWh', description='')
+    grid = Technology(tech_name='GRID', units='MW',
+                      capacity_to_activity=8.76)
+    grid.add_regional_data(region='B',
+                           input_comm=Commodity(comm_name='URANIUM',
+                                                units='kg',
+                                                description=''),
+                           output_comm=elc)
+    registry = ModelRegistry(technologies=[module.PLANT, module.MINE, grid])
+
+    assert [c.comm_name for c in registry.demands] == ['ELC']
+    assert [c.comm_name for c in registry.resources] == ['URANIUM']
+    assert registry.demands[0] is module.PLANT.output_comm['A']
+
+    # a resource with the name of a demand
+    registry.add(Commodity(comm_name='ELC', units='MWh', description=''))
+    with pytest.raises(ValueError):
+        registry.commodities
+
+    return
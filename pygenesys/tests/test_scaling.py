@@ -0,0 +1,70 @@
+from pygenesys.scaling import (coefficient_ranges, rescale_database,
+                               suggest_factors, technology_ranges)
+import numpy as np
+import pytest
+import sqlite3
+
+
+def scaling_db():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE CostInvest (regions text, tech text, '
+                 'vintage integer, cost_invest real)')
+    conn.execute('CREATE TABLE CapacityToActivity (regions text, '
+                 'tech text, c2a real)')
+    conn.execute('CREATE TABLE ExistingCapacity (regions text, tech text, '
+                 'vintage integer, exist_cap real)')
+    conn.executemany('INSERT INTO CostInvest VALUES (?,?,?,?)',
+                     [('A', 'X', 2025, 0.002), ('A', 'Y', 2025, 5.0)])
+    conn.executemany('INSERT INTO CapacityToActivity VALUES (?,?,?)',
+                     [('A', 'X', 8.76), ('A', 'Y', 0.0)])
+    conn.execute("INSERT INTO ExistingCapacity VALUES ('A', 'X', 2000, 4)")
+    conn.execute('CREATE TABLE MaxActivity (regions text, periods integer, '
+                 'tech text, maxact real)')
+    conn.execute("INSERT INTO MaxActivity VALUES ('A', 2025, 'X', 50)")
+
+    return conn
+
+
+def test_coefficient_ranges():
+    conn = scaling_db()
+    ranges = coefficient_ranges(conn)
+    techs = technology_ranges(conn)
+
+    assert ranges[('CostInvest', 'cost_invest')] == (0.002, 5.0, 2)
+    assert ranges[('CapacityToActivity', 'c2a')] == (8.76, 8.76, 1)
+    assert techs['X'] == (0.002, 50.0, 4)
+
+    return
+
+
+def test_rescale_database():
+    conn = scaling_db()
+    rescale_database(conn, cost=10.0, capacity=1000.0)
+    rescale_database(conn, capacity=2.0)
+
+    cost = conn.execute('SELECT cost_invest FROM CostInvest').fetchall()
+    c2a = conn.execute('SELECT c2a FROM CapacityToActivity').fetchone()[0]
+    existing = conn.execute('SELECT exist_cap FROM ExistingCapacity'
+                            ).fetchone()[0]
+    factors = dict(conn.execute('SELECT quantity, factor '
+                                'FROM ScalingFactors').fetchall())
+
+    assert np.allclose([c[0] for c in cost], [0.002 / 200, 5.0 / 200])
+    assert np.isclose(c2a, 8.76 / 2000)
+    assert np.isclose(existing, 8000)
+    # activity = c2a * capacity is unchanged
+    assert np.isclose(c2a * existing, 8.76 * 4)
+    assert factors == {'cost': 10.0, 'capacity': 2000.0, 'activity': 1.0}
+
+    factors = suggest_factors(conn)
+    assert all(np.isclose(np.log10(f), np.round(np.log10(f)))
+               for f in factors.values())
+
+    rescale_database(conn, activity=0.1)
+    assert np.isclose(conn.execute('SELECT maxact FROM MaxActivity'
+                                   ).fetchone()[0], 5.0)
+
+    with pytest.raises(ValueError):
+        rescale_database(conn, cost=-1.0)
+
+    return
@@ -0,0 +1,52 @@
+from pygenesys.scenarios import build_scenarios, sample_scenarios
+import pytest
+import sqlite3
+
+
+def test_sample_scenarios():
+    scenarios = sample_scenarios({'discount_rate': ('uniform', 0.03, 0.07),
+                                  ('cost_invest', 'X'): ('normal', 1, 0.1)},
+                                 N_samples=50, seed=1)
+
+    assert len(scenarios) == 50
+    assert all(0.03 <= s['discount_rate'] < 0.07 for s in scenarios)
+    assert scenarios == sample_scenarios({'discount_rate':
+                                          ('uniform', 0.03, 0.07),
+                                          ('cost_invest', 'X'):
+                                          ('normal', 1, 0.1)},
+                                         N_samples=50, seed=1)
+    with pytest.raises(ValueError):
+        sample_scenarios({'discount_rate': ('bogus', 0, 1)}, 1)
+
+    return
+
+
+def test_build_scenarios(tmp_path, load_model, infile_text):
+    model = load_model(name='base',
+                       output_db=str(tmp_path / "base.sqlite"))
+    paths = build_scenarios(model, [{('growth_rate', 'ELC_DEMAND'): 0.1,
+                                     'discount_rate': 0.07,
+                                     'reserve_margin': {'A': 0.15}}])
+    # the same change, built from scratch
+    text = (infile_text.replace('N_years=N_years)',
+                                'N_years=N_years, growth_rate=0.1)')
+            .replace('discount_rate = 0.05', 'discount_rate = 0.07')
+            .replace('reserve_margin = {}', "reserve_margin = {'A': 0.15}"))
+    full = load_model(text=text, name='full',
+                      output_db=str(tmp_path / "full.sqlite"))
+    full._write_sqlite_database()
+
+    query = ('SELECT * FROM Demand', 'SELECT * FROM GlobalDiscountRate',
+             'SELECT * FROM PlanningReserveMargin')
+    scenario = sqlite3.connect(paths[0])
+    expected = sqlite3.connect(full.output_db)
+    for q in query:
+        assert scenario.execute(q).fetchall() == expected.execute(q
+                                                                  ).fetchall()
+    scenario.close()
+    expected.close()
+
+    with pytest.raises(ValueError):
+        build_scenarios(model, [{'bogus': 1.0}], build=False)
+
+    return
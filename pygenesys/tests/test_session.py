@@ -0,0 +1,29 @@
+from pygenesys.session import BuildSession
+from pygenesys.technology.transmission import TRANSMISSION
+import os
+import sqlite3
+
+
+def test_build_session_isolation(tmp_path, write_infile):
+    infile = write_infile()
+
+    session = BuildSession()
+    first = session.build(str(infile))
+    second = session.build(str(infile),
+                           output_db=str(tmp_path / "second.sqlite"),
+                           write_config=False)
+
+    # each build has its own library objects
+    assert first.technologies[0] is not second.technologies[0]
+    assert second.technologies[0].regions == ['A']
+    assert len(second.commodities['demand'][0].demand['A']) == 3
+    # the library in this process is untouched
+    assert TRANSMISSION.regions == []
+
+    assert os.path.exists(tmp_path / "run_session.txt")
+    conn = sqlite3.connect(tmp_path / "second.sqlite")
+    rows = conn.execute("SELECT * FROM Demand").fetchall()
+    conn.close()
+    assert len(rows) == 3
+
+    return
@@ -0,0 +1,47 @@
+from pygenesys.shard import build_sharded, region_groups
+import sqlite3
+
+
+def dump(path):
+    conn = sqlite3.connect(path)
+    tables = [row[0] for row in
+              conn.execute("SELECT name FROM sqlite_master "
+                           "WHERE type = 'table'")]
+    rows = {table: sorted(conn.execute(f'SELECT * FROM "{table}"'
+                                       ).fetchall(), key=repr)
+            for table in tables}
+    conn.close()
+
+    return rows
+
+
+def test_region_groups():
+    assert region_groups(['A', 'B', 'C'], 2) == [['A', 'B'], ['C']]
+    assert region_groups(['A'], 4) == [['A']]
+
+    return
+
+
+def compare_sharded(tmp_path, load_model, extra):
+    serial = load_model(extra, output_db=str(tmp_path / "serial.sqlite"))
+    serial._write_sqlite_database()
+    sharded = load_model(extra, output_db=str(tmp_path / "sharded.sqlite"))
+    build_sharded(sharded, N_shards=2, max_workers=2)
+
+    assert dump(sharded.output_db) == dump(serial.output_db)
+
+    return
+
+
+def test_build_sharded(tmp_path, load_model, two_regions):
+    compare_sharded(tmp_path, load_model, two_regions)
+
+    return
+
+
+def test_build_sharded_regionless_tech(tmp_path, load_model, two_regions):
+    # imp_natgas is imported but has no regions
+    compare_sharded(tmp_path, load_model, two_regions +
+                    "from pygenesys.technology.supply import imp_natgas\n")
+
+    return
@@ -0,0 +1,33 @@
+from pygenesys.subset import extract_subset
+import pytest
+import sqlite3
+
+
+def test_extract_subset(tmp_path, load_model, two_regions):
+    model = load_model(two_regions)
+    model._write_sqlite_database()
+
+    subset_db = str(tmp_path / "subset.sqlite")
+    rows = extract_subset(model.output_db, subset_db,
+                          regions=['B'], periods=[2030])
+
+    conn = sqlite3.connect(subset_db)
+    regions = conn.execute('SELECT DISTINCT regions FROM Efficiency'
+                           ).fetchall()
+    periods = conn.execute('SELECT t_periods FROM time_periods').fetchall()
+    problems = [conn.execute(f'PRAGMA foreign_key_check("{table}")'
+                             ).fetchall()
+                for table in rows if not table.startswith('Output')]
+    conn.close()
+
+    assert regions == [('B',)]
+    assert periods == [(2024,), (2030,), (2035,)]
+    assert rows['Demand'] == 1
+    assert rows['DemandSpecificDistribution'] == 96
+    assert rows['commodities'] == 2
+    assert all(len(p) == 0 for p in problems)
+
+    with pytest.raises(ValueError):
+        extract_subset(model.output_db, subset_db, regions=['A'])
+
+    return
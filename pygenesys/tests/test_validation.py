@@ -0,0 +1,40 @@
+from pygenesys import driver
+from pygenesys.validation import validate
+import numpy as np
+import os
+import pytest
+
+
+def test_validate_reports_all(load_infile):
+    module = load_infile()
+    profile = np.full(96, 0.5)
+    profile[[3, 30]] = [1.5, -0.1]
+    module.TRANSMISSION.add_regional_data(region='A',
+                                          capacity_factor_tech=profile,
+                                          efficiency=0.0,
+                                          cost_fixed={2025: 1.0})
+    module.ELC_DEMAND.distribution['A'] = np.ones(96) / 48
+    module.TRANSMISSION.add_regional_data(region='B', efficiency=1.0)
+
+    model = driver.create_model(module)
+    errors = validate(model)
+
+    assert len(errors) == 5
+    assert errors[0].startswith('CapacityFactorTech: TRANSMISSION in A')
+    assert 'season 0 hour 3 (1.5)' in errors[0]
+    assert 'season 1 hour 6 (-0.1)' in errors[0]
+    assert 'sums to 2' in errors[2]
+    assert "['B']" in errors[3]
+    assert '[2030, 2035]' in errors[4]
+
+    with pytest.raises(ValueError):
+        model._write_sqlite_database()
+    assert not os.path.exists(model.output_db)
+
+    return
+
+
+def test_validate_valid_model(load_model):
+    assert validate(load_model()) == []
+
+    return
@@ -84,3 +84,60 @@ def test_logistic_growth_unit():
                                       1.7615941559557646])))
 
     return
+
+
+def test_logistic_growth_start_year():
+    """
+    Logistic growth starts at the initial value for
+    any start year.
+    """
+
+    growth = growth_model.logistic_growth(1, 2020, 2022, 3, 1, 2)
+
+    assert(growth == approx(np.array([1.,
+                                      1.4621171572600098,
+                                      1.7615941559557646])))
+
+    return
+
+
+def test_project_growth_shape():
+    """
+    Test that the inputs are broadcast to
+    (scenario x region x year).
+    """
+
+    init_values = np.array([1., 2., 3.])
+    growth_rates = np.array([[0.], [0.1]])
+    growth = growth_model.project_growth(init_values,
+                                         growth_rates,
+                                         2020,
+                                         2050,
+                                         7)
+
+    assert(growth.shape == (2, 3, 7))
+    assert(growth[0] == approx(np.repeat(init_values[:, None], 7, axis=1)))
+
+    return
+
+
+def test_project_growth_matches_scalar():
+    """
+    Test that the batched projection matches each
+    growth method.
+    """
+
+    for method in ['linear', 'exponential']:
+        batch = growth_model.project_growth([1., 2.], 0.05, 2020, 2050, 7,
+                                            growth_method=method)
+        scalar = growth_model.choose_growth_method(method)(2., 2020, 2050,
+                                                           7, 0.05)
+        assert(batch[1] == approx(scalar))
+
+    batch = growth_model.project_growth([1., 2.], 0.5, 2020, 2050, 7,
+                                        growth_method='logistic',
+                                        caps=4.)
+    scalar = growth_model.logistic_growth(2., 2020, 2050, 7, 0.5, 4.)
+    assert(batch[1] == approx(scalar))
+
+    return
@@ -0,0 +1,80 @@
+from pygenesys.utils.parameters import ParameterStore, ParameterView
+from pygenesys.technology.technology import Technology
+import numpy as np
+import pytest
+
+
+def test_regions_ordered_set():
+    tech = Technology(tech_name='PV', units='MW', capacity_to_activity=8.76)
+    tech.add_regional_data(region=['B', 'A'], efficiency=1.0)
+    tech.add_regional_data(region='B', tech_lifetime=25)
+    tech.add_regional_data(region='C', existing={2020: 1.0})
+
+    assert tech.regions == ['B', 'A', 'C']
+    assert tech.existing_capacity == {'C': {2020: 1.0}}
+    assert dict(tech.tech_lifetime) == {'B': 25}
+
+    return
+
+
+def test_store_integers():
+    store = ParameterStore(['tech_lifetime', 'loan_lifetime'])
+    store.set('tech_lifetime', 'A', 60)
+    store.set('tech_lifetime', 'B', np.int64(40))
+    store.set('loan_lifetime', 'A', 30)
+    store.set('loan_lifetime', 'B', 12.5)
+
+    assert type(store.get('tech_lifetime', 'A')) is int
+    assert store.column('tech_lifetime')[1].dtype == np.int64
+    assert type(store.copy().get('loan_lifetime', 'A')) is int
+    assert store.column('loan_lifetime')[1].dtype == np.float64
+
+    store.set('tech_lifetime', 'A', 60.0)
+    assert type(store.get('tech_lifetime', 'A')) is not int
+
+    return
+
+
+def test_store_column():
+    store = ParameterStore(['efficiency', 'capacity_factor_tech'])
+    profile = np.ones(96)
+    for i in range(10):
+        store.set('efficiency', f'R{i}', i / 10)
+    store.set('efficiency', 'R3', {2020: 0.5})
+    store.set('capacity_factor_tech', 'R1', profile)
+    regions, values = store.column('efficiency')
+
+    assert len(store.regions) == 10
+    assert 'R3' not in regions
+    assert np.allclose(values, [i / 10 for i in range(10) if i != 3])
+    assert store.get('capacity_factor_tech', 'R1') is profile
+
+    return
+
+
+def test_view_mapping():
+    store = ParameterStore(['ramp_up'])
+    view = ParameterView(store, 'ramp_up')
+    view['A'] = 0.5
+    view['B'] = 0.25
+    del view['A']
+
+    assert list(view) == ['B']
+    assert len(view) == 1
+    assert 'A' not in view
+    assert view.get('A', 1.0) == 1.0
+    with pytest.raises(KeyError):
+        view['A']
+
+    return
+
+
+def test_unknown_parameter():
+    tech = Technology(tech_name='PV', units='MW', capacity_to_activity=8.76)
+
+    with pytest.raises(KeyError):
+        tech.add_regional_data(region='A', efficiency=1.0, color='blue')
+    with pytest.raises(AttributeError):
+        tech.color = 'blue'
+
+    return
@@ -0,0 +1,77 @@
+from pygenesys.utils import regions
+from pygenesys.technology.technology import Technology
+from pygenesys.commodity.commodity import DemandCommodity
+from pytest import approx
+import numpy as np
+
+
+region_map = {'A': 'Z', 'B': 'Z', 'C': 'Y'}
+
+
+def test_merge_values():
+    assert regions.merge_values([1.0, 3.0], [1, 3]) == approx(2.5)
+    assert regions.merge_values([1.0, 3.0], [0, 0]) == approx(2.0)
+    merged = regions.merge_values([{2020: 1.0}, {2020: 2.0, 2010: 1.0}],
+                                  [1, 1], how='sum')
+    assert merged == {2020: 3.0, 2010: 1.0}
+    profile = regions.merge_values([np.zeros(4), 1.0], [1, 1])
+    assert np.allclose(profile, 0.5)
+
+    return
+
+
+def test_aggregate_technology():
+    tech = Technology(tech_name='PV', units='MW', capacity_to_activity=8.76)
+    tech.add_regional_data(region='A', existing={2010: 1.0},
+                           capacity_factor_tech=0.2, tech_lifetime=25)
+    tech.add_regional_data(region='B', existing={2010: 3.0, 2015: 4.0},
+                           capacity_factor_tech=0.4, tech_lifetime=25)
+    tech.add_regional_data(region='C', capacity_factor_tech=0.3)
+    new = regions.aggregate_technology(tech, region_map)
+
+    assert new.regions == ['Z', 'Y']
+    assert new.existing_capacity['Z'] == {2010: 4.0, 2015: 4.0}
+    assert new.capacity_factor_tech['Z'] == approx(0.375)
+    assert tech.regions == ['A', 'B', 'C']
+
+    return
+
+
+def test_aggregate_without_existing():
+    tech = Technology(tech_name='PV', units='MW', capacity_to_activity=8.76)
+    tech.add_regional_data(region='A', existing={2010: 4.0},
+                           capacity_factor_tech=0.2, cost_invest=1.0)
+    tech.add_regional_data(region='B', capacity_factor_tech=0.6,
+                           cost_invest=3.0)
+    new = regions.aggregate_technology(tech, region_map)
+
+    # B has no existing capacity but still counts for new capacity
+    assert new.existing_capacity['Z'] == {2010: 4.0}
+    assert new.capacity_factor_tech['Z'] == approx(0.4)
+    assert new.cost_invest['Z'] == approx(2.0)
+
+    return
+
+
+def test_aggregate_exchange():
+    tech = Technology(tech_name='ELC_EX', units='MW',
+                      capacity_to_activity=8.76, exchange_tech=True)
+    tech.add_regional_data(region=['A-B', 'A-C', 'B-C'], efficiency=0.9)
+    new = regions.aggregate_technology(tech, region_map)
+
+    assert new.regions == ['Z-Y']
+
+    return
+
+
+def test_aggregate_demand():
+    demand = DemandCommodity(comm_name='ELC_DEMAND', units='MWh')
+    demand.demand = {'A': np.array([1.0, 1.0]), 'B': np.array([3.0, 3.0])}
+    demand.distribution = {'A': np.array([1.0, 0.0]),
+                           'B': np.array([0.0, 1.0])}
+    new = regions.aggregate_demand(demand, region_map)
+
+    assert np.allclose(new.demand['Z'], [4.0, 4.0])
+    assert np.allclose(new.distribution['Z'], [0.25, 0.75])
+
+    return
@@ -0,0 +1,56 @@
+from pygenesys.utils import resolution
+import numpy as np
+import pandas as pd
+
+
+hours = pd.date_range('2019-01-01', '2019-12-31 23:00', freq='H')
+# a daily cycle with no seasonal variation
+flat_data = pd.DataFrame({'kw': 10 + np.sin(2 * np.pi * hours.hour / 24)},
+                         index=pd.Index(hours, name='time'))
+
+
+def test_candidate_resolutions_skip_day_segments():
+    candidates = resolution.candidate_resolutions(groupings=('day',))
+
+    assert len(candidates) == 1
+    assert candidates[0]['N_seasons'] == 365
+
+    return
+
+
+def test_candidate_resolutions_segments():
+    candidates = resolution.candidate_resolutions(groupings=('season',))
+    N_seasons = sorted([c['N_seasons'] for c in candidates])
+
+    assert N_seasons == [4, 8, 8, 12]
+
+    return
+
+
+def test_evaluate_resolutions_exact():
+    """
+    A profile that repeats every day is reproduced exactly
+    by four seasons.
+    """
+    candidates = resolution.candidate_resolutions(groupings=('season',),
+                                                  add_peak=(False,),
+                                                  add_weekend=(False,))
+    results = resolution.evaluate_resolutions(flat_data,
+                                              candidates=candidates,
+                                              N_profiles=2)
+
+    assert len(results) == 1
+    assert results['max_error'][0] < 1e-6
+    assert results['db_rows'][0] == 96 * 3
+
+    return
+
+
+def test_select_resolution_smallest():
+    best, results = resolution.select_resolution(flat_data, tolerance=0.01)
+
+    assert best['groupby'] == 'season'
+    assert best['N_slices'] == 96
+    assert len(results) == 13
+
+    return
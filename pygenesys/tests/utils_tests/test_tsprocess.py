@@ -0,0 +1,155 @@
+from pygenesys.utils import tsprocess
+from pytest import approx
+import numpy as np
+import pandas as pd
+import os
+import pytest
+
+
+hours = pd.date_range('2019-01-01', '2019-12-31 23:00', freq='H')
+hourly_data = pd.DataFrame({'kw': hours.hour + 1.0},
+                           index=pd.Index(hours, name='time'))
+
+
+def test_hour_blocks_uniform():
+    blocks = tsprocess.hour_blocks(6)
+
+    assert (np.bincount(blocks) == 4).all()
+    assert blocks[0] == 0
+    assert blocks[-1] == 5
+
+    return
+
+
+def test_hour_blocks_boundaries():
+    blocks = tsprocess.hour_blocks(3, boundaries=[0, 8, 20])
+
+    assert (np.bincount(blocks) == np.array([8, 12, 4])).all()
+
+    return
+
+
+def test_hour_blocks_bad_boundaries():
+    with pytest.raises(ValueError):
+        tsprocess.hour_blocks(3, boundaries=[0, 8])
+    with pytest.raises(ValueError):
+        tsprocess.hour_blocks(2, boundaries=[1, 8])
+    with pytest.raises(ValueError):
+        tsprocess.hour_blocks(30)
+
+    return
+
+
+def test_hour_fractions():
+    fractions = tsprocess.hour_fractions(3, boundaries=[0, 8, 20])
+
+    assert fractions == approx(np.array([8, 12, 4]) / 24)
+    assert fractions.sum() == approx(1.0)
+
+    return
+
+
+def test_downsample_hours():
+    profile = np.tile(np.arange(24.0), (2, 1))
+    block_profile = tsprocess.downsample_hours(profile, 2)
+
+    assert block_profile.shape == (2, 2)
+    assert block_profile[0] == approx(np.array([5.5, 17.5]))
+
+    return
+
+
+def test_aggregate_hour_blocks_cf():
+    profile = tsprocess.aggregate(hourly_data,
+                                  N_seasons=4,
+                                  N_hours=6,
+                                  kind='cf')
+
+    assert profile.shape == (4, 6)
+    assert profile[0] == approx(np.array([2.5, 6.5, 10.5,
+                                          14.5, 18.5, 22.5]) / 24)
+
+    return
+
+
+def test_aggregate_hour_blocks_demand():
+    """
+    Longer blocks hold a larger share of the demand.
+    """
+    profile = tsprocess.aggregate(hourly_data,
+                                  N_seasons=12,
+                                  N_hours=2,
+                                  kind='demand',
+                                  groupby='month',
+                                  hour_boundaries=[0, 18])
+
+    assert profile.sum() == approx(1.0)
+    assert profile[0, 0] / profile[0, 1] == approx(171 / 129)
+
+    return
+
+
+def test_aggregate_weights_peak_weekend():
+    """
+    The peak day represents one day per season and the weekend
+    represents the weekend days.
+    """
+    profile, weights = tsprocess.aggregate(hourly_data,
+                                           N_seasons=12,
+                                           N_hours=24,
+                                           kind='cf',
+                                           add_peak=True,
+                                           add_weekend=True,
+                                           return_weights=True)
+
+    assert weights.shape == (12, 24)
+    assert weights.sum() == approx(1.0)
+    # one peak day per season
+    assert weights[1::3].sum() == approx(4 / 365)
+    # 2019 has 104 weekend days, two of them are peak days
+    # (June 1 and September 1)
+    assert weights[2::3].sum() == approx(102 / 365)
+
+    return
+
+
+def test_aggregate_demand_energy_share():
+    """
+    The demand distribution is the share of annual demand when each
+    slice is weighted by the hours it represents.
+    """
+    profile, weights = tsprocess.aggregate(hourly_data,
+                                           N_seasons=8,
+                                           N_hours=24,
+                                           kind='none',
+                                           add_peak=True,
+                                           return_weights=True)
+    demand = tsprocess.aggregate(hourly_data,
+                                 N_seasons=8,
+                                 N_hours=24,
+                                 kind='demand',
+                                 add_peak=True)
+
+    assert (profile * weights).sum() == approx(hourly_data['kw'].mean())
+    assert demand == approx(profile * weights / (profile * weights).sum())
+
+    return
+
+
+def test_aggregate_file_cache(tmp_path):
+    path = str(tmp_path / "data.csv")
+    hourly_data.to_csv(path)
+    tsprocess.clear_cache()
+
+    first = tsprocess.aggregate(path, N_seasons=4, N_hours=6, kind='cf')
+    first[:] = 0.0
+    second = tsprocess.aggregate(path, N_seasons=4, N_hours=6, kind='cf')
+
+    assert tsprocess.cached_files() == [os.path.abspath(path)]
+    assert len(tsprocess._profile_cache) == 1
+    assert second == approx(tsprocess.aggregate(hourly_data,
+                                                N_seasons=4,
+                                                N_hours=6,
+                                                kind='cf'))
+
+    return
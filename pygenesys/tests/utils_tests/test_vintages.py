@@ -0,0 +1,61 @@
+from pygenesys.utils import vintages
+from pytest import approx
+import numpy as np
+import pytest
+
+
+existing = {year: 10.0 for year in range(1980, 2020)}
+
+
+def test_bin_vintages_width():
+    binned = vintages.bin_vintages(existing, 5, start_year=2020)
+
+    assert len(binned) == 8
+    assert sum(binned.values()) == approx(400.0)
+    assert min(binned) == 1982
+    assert max(binned) == 2017
+
+    return
+
+
+def test_bin_vintages_edges():
+    data = dict(existing)
+    data[2020] = 5.0
+    binned = vintages.bin_vintages(data, [1990, 2010], start_year=2020)
+
+    # 1980-2009 and 2010-2019 are binned, 2020 is a model vintage
+    assert list(binned) == [1994, 2014, 2020]
+    assert binned[1994] == approx(300.0)
+
+    return
+
+
+def test_retirement_error():
+    periods = np.array([2020, 2025, 2030, 2035])
+    binned = vintages.bin_vintages(existing, 5, start_year=2020)
+    error = vintages.retirement_error(existing, binned, 40, periods)
+
+    assert 0 < error < 0.05
+    assert vintages.retirement_error(existing, existing, 40, periods) == 0
+
+    return
+
+
+def test_bin_vintages_tolerance():
+    periods = np.array([2020, 2025, 2030, 2035])
+    # one wide bin retires all 400 MW at once
+    wide = vintages.bin_vintages(existing, 100, start_year=2020)
+    error = vintages.retirement_error(existing, wide, 25, periods)
+    binned = vintages.bin_vintages(existing, 100, start_year=2020,
+                                   tolerance=0.1, lifetime=25,
+                                   periods=periods)
+
+    assert len(wide) == 1
+    assert error > 0.1
+    assert 1 < len(binned) < len(existing)
+    assert sum(binned.values()) == approx(400.0)
+    assert vintages.retirement_error(existing, binned, 25, periods) <= 0.1
+    with pytest.raises(ValueError):
+        vintages.bin_vintages(existing, 100, start_year=2020, tolerance=0.1)
+
+    return
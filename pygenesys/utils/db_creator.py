@@ -6,6 +6,9 @@ from pygenesys.commodity.commodity import *
 
 comm_types = np.array([EmissionsCommodity, Commodity, DemandCommodity])
 
+# values Temoa uses when a row is missing from a table
+temoa_defaults = {'CapacityFactorTech': 1.0}
+
 
 def establish_connection(output_db):
     """
@@ -72,7 +75,10 @@ def create_time_season(connector, N_seasons):
     return seasons
 
 
-def create_time_periods(connector, future_years, existing_years):
+def create_time_periods(connector,
+                        future_years,
+                        existing_years,
+                        boundary_year=None):
     """
     This function writes the time_periods table to an sqlite
     database. Only "future" time periods will be written.
@@ -89,6 +95,11 @@ def create_time_periods(connector, future_years, existing_years):
 
     future_years : list or array
         The yearly resolution of the energy system model.
+    existing_years : list or array
+        The vintages of existing capacity.
+    boundary_year : integer
+        The year the last period ends. Default is one year after the
+        last future year.
 
     Returns
     -------
@@ -112,7 +123,9 @@ def create_time_periods(connector, future_years, existing_years):
         past_horizon = [(int(year), 'e') for year in existing_years]
     future_horizon = [(int(year), 'f') for year in future_years]
     # set boundary year
-    future_horizon.append((int(future_years[-1] + 1), 'f'))
+    if boundary_year is None:
+        boundary_year = future_years[-1] + 1
+    future_horizon.append((int(boundary_year), 'f'))
     entries = past_horizon + future_horizon
 
     cursor = connector.cursor()
@@ -207,8 +220,9 @@ def create_segfrac(connector, segfrac, seasons, hours):
     ----------
     connector : sqlite3 connection object
         Used to connect to and write to an sqlite database.
-    segfrac : float
-        The fraction-of-a-year represented by each time slice.
+    segfrac : float or numpy array
+        The fraction-of-a-year represented by each time slice. If an
+        array, it must have one row per season and one column per hour.
     seasons : list
         The list of seasons in the simulation.
     hours : list
@@ -233,8 +247,9 @@ def create_segfrac(connector, segfrac, seasons, hours):
                      INSERT INTO "SegFrac" VALUES (?,?,?,?)
                      """
     time_slices = itertools.product(seasons, hours)
-    entries = [(ts[0][0], ts[1][0], segfrac, 'fraction of year')
-               for ts in time_slices]
+    segfrac = np.broadcast_to(segfrac, (len(seasons), len(hours))).flatten()
+    entries = [(ts[0][0], ts[1][0], float(frac), 'fraction of year')
+               for ts, frac in zip(time_slices, segfrac)]
 
     cursor = connector.cursor()
     cursor.execute(table_command)
@@ -703,25 +718,23 @@ def create_existing_capacity(connector, technology_list, time_horizon):
                      """
 
     entries = []
+    first_year = time_horizon[0]
     for tech in technology_list:
-        first_year = time_horizon[0]
-        for place in tech.regions:
-            lifetime = tech.tech_lifetime[place]
-            try:
-                years = np.array(list(tech.existing_capacity[place].keys()))
-            except BaseException:
-                continue
+        store = tech.parameters
+        regions = [r for r in store.present_regions('existing_capacity')
+                   if isinstance(store.get('existing_capacity', r), dict)]
+        for place, lifetime in zip(regions, _lifetimes(store, regions)):
+            existing = store.get('existing_capacity', place)
+            years = np.array(list(existing.keys()), dtype=int)
+            capacity = np.array(list(existing.values()), dtype=float)
             # only keep the vintages that will exist in the first sim year
-            years = years[(first_year - years) < lifetime]
-            # caps = list(tech.existing_capacity[place].values())
-
-            data = [(place,
-                     tech.tech_name,
-                     int(year),
-                     tech.existing_capacity[place][year],
-                     tech.units,
-                     '') for year in years]
-            entries += data
+            alive = (first_year - years) < lifetime
+            entries += zip(itertools.repeat(place),
+                           itertools.repeat(tech.tech_name),
+                           years[alive].tolist(),
+                           capacity[alive].tolist(),
+                           itertools.repeat(tech.units),
+                           itertools.repeat(''))
 
     if len(entries) > 0:
         cursor = connector.cursor()
@@ -734,6 +747,95 @@ def create_existing_capacity(connector, technology_list, time_horizon):
     return table_command
 
 
+def _regional_column(technology_list, parameter):
+    """
+    Returns the (region, tech, value) rows of a scalar per-region
+    parameter. Each technology's values are read as one NumPy column
+    from its parameter store.
+    """
+    entries = []
+    for tech in technology_list:
+        regions, values = tech.parameters.column(parameter)
+        entries += zip(regions,
+                       itertools.repeat(tech.tech_name),
+                       values.tolist())
+
+    return entries
+
+
+def _period_values(store, parameter, periods):
+    """
+    Returns the regions where a parameter is set and a (region x period)
+    array of its values. Constants are read as one NumPy column and
+    ``{year: value}`` dictionaries are read by period. Other values are
+    skipped.
+    """
+    regions, values = store.column(parameter)
+    rows = [np.broadcast_to(values[:, None], (len(regions), len(periods)))]
+    for region in store.present_regions(parameter):
+        value = store.get(parameter, region)
+        if isinstance(value, dict):
+            regions.append(region)
+            rows.append([[value[year] for year in periods]])
+
+    return regions, np.concatenate(rows).astype(float)
+
+
+def _lifetimes(store, regions):
+    """
+    Returns the lifetime of a technology in each region as an array.
+    """
+    lifetime = dict(zip(*store.column('tech_lifetime')))
+
+    return np.array([lifetime[r] for r in regions], dtype=float)
+
+
+def _vintage_rows(technology_list, parameter, time_horizon):
+    """
+    Returns the (region, period, tech, vintage, value, units, notes) rows
+    of a cost paid by every vintage still operating in each period. The
+    regions without existing capacity share the future vintages, so
+    their rows are selected with one (region x period x vintage) mask.
+    """
+    periods = np.asarray(time_horizon)
+    entries = []
+    for tech in technology_list:
+        store = tech.parameters
+        regions, costs = _period_values(store, parameter, periods)
+        if len(regions) == 0:
+            continue
+        lifetimes = _lifetimes(store, regions)
+
+        groups = []
+        future_only = []
+        for i, region in enumerate(regions):
+            existing = None
+            if store.has('existing_capacity', region):
+                existing = store.get('existing_capacity', region)
+            if isinstance(existing, dict):
+                vintages = np.concatenate([list(existing.keys()), periods])
+                vintages = vintages[(periods[0] - vintages) < lifetimes[i]]
+                groups.append((vintages.astype(int), [i]))
+            else:
+                future_only.append(i)
+        groups.append((periods, future_only))
+
+        for vintages, index in groups:
+            index = np.array(index, dtype=int)
+            age = periods[:, None] - vintages[None, :]
+            active = (age >= 0) & (age < lifetimes[index, None, None])
+            r, p, v = np.nonzero(active)
+            entries += zip([regions[k] for k in index[r]],
+                           periods[p].tolist(),
+                           itertools.repeat(tech.tech_name),
+                           vintages[v].tolist(),
+                           costs[index[r], p].tolist(),
+                           itertools.repeat(''),
+                           itertools.repeat(''))
+
+    return entries
+
+
 def create_lifetime_tech(connector, technology_list):
     """
     This function writes the lifetime tech table in Temoa.
@@ -753,16 +855,8 @@ def create_lifetime_tech(connector, technology_list):
     insert_command = """
                      INSERT INTO "LifetimeTech" VALUES (?,?,?,?)
                      """
-    entries = []
-
-    for tech in technology_list:
-        tech_name = tech.tech_name
-        data = [(place,
-                 tech_name,
-                 tech.tech_lifetime[place],
-                 'NULL') for place in tech.regions]
-
-        entries += data
+    entries = [row + ('NULL',)
+               for row in _regional_column(technology_list, 'tech_lifetime')]
 
     cursor = connector.cursor()
     cursor.execute(table_command)
@@ -808,54 +902,7 @@ def create_variable_cost(connector, technology_list, time_horizon):
     insert_command = """
                      INSERT INTO "CostVariable" VALUES (?,?,?,?,?,?,?)
                      """
-    entries = []
-    for tech in technology_list:
-        # check that cost exists
-        if len(tech.cost_variable) > 0:
-            pass
-        else:
-            continue
-
-        # loop through regions
-        for place in tech.regions:
-            # check if particular region has cost_data
-            try:
-                cost_variable = tech.cost_variable[place]
-                # print(f'Success. Cost variable is {cost_variable}')
-            except BaseException:
-                continue
-            lifetime = float(tech.tech_lifetime[place])
-            # if there are existing vintages of the technology
-            try:
-                years = list(tech.existing_capacity[place].keys()) + \
-                    list(time_horizon)
-                years = [y for y in years if (time_horizon[0] - y) < lifetime]
-            except BaseException:
-                years = time_horizon
-            # generate future/vintage pairs
-            year_pairs = itertools.product(time_horizon, years)
-            if isinstance(cost_variable, dict):
-                db_entry = [(place,
-                             int(year),
-                             tech.tech_name,
-                             int(vintage),
-                             cost_variable[year],
-                             "",
-                             "") for year, vintage in year_pairs
-                            if (year - vintage) < lifetime
-                            and (year - vintage) >= 0]
-                entries += db_entry
-            elif (isinstance(cost_variable, float)) or (isinstance(cost_variable, int)):
-                db_entry = [(place,
-                             int(year),
-                             tech.tech_name,
-                             int(vintage),
-                             cost_variable,
-                             "",
-                             "") for year, vintage in year_pairs
-                            if (year - vintage) < lifetime
-                            and (year - vintage) >= 0]
-                entries += db_entry
+    entries = _vintage_rows(technology_list, 'cost_variable', time_horizon)
     cursor = connector.cursor()
     cursor.execute(table_command)
     cursor.executemany(insert_command, entries)
@@ -891,33 +938,18 @@ def create_invest_cost(connector, technology_list, time_horizon):
     insert_command = """
                      INSERT INTO "CostInvest" VALUES (?,?,?,?,?,?)
                      """
+    periods = np.asarray(time_horizon).tolist()
     entries = []
     for tech in technology_list:
-        if len(tech.cost_invest) > 0:
-            pass
-        else:
-            continue
-        for place in tech.regions:
-            try:
-                cost_invest = tech.cost_invest[place]
-            except BaseException:
-                continue
-            if isinstance(cost_invest, dict):
-                data = [(place,
-                         tech.tech_name,
-                         int(year),
-                         cost_invest[year],
-                         "",
-                         "") for year in time_horizon]
-                entries += data
-            elif (isinstance(cost_invest, float)) or (isinstance(cost_invest, int)):
-                data = [(place,
-                         tech.tech_name,
-                         int(year),
-                         cost_invest,
-                         "",
-                         "") for year in time_horizon]
-                entries += data
+        regions, costs = _period_values(tech.parameters,
+                                        'cost_invest',
+                                        periods)
+        entries += zip(np.repeat(regions, len(periods)).tolist(),
+                       itertools.repeat(tech.tech_name),
+                       periods * len(regions),
+                       costs.ravel().tolist(),
+                       itertools.repeat(''),
+                       itertools.repeat(''))
 
     cursor = connector.cursor()
     cursor.execute(table_command)
@@ -962,53 +994,7 @@ def create_fixed_cost(connector, technology_list, time_horizon):
     insert_command = """
                      INSERT INTO "CostFixed" VALUES (?,?,?,?,?,?,?)
                      """
-    entries = []
-    for tech in technology_list:
-        # check that cost exists
-        if len(tech.cost_fixed) > 0:
-            pass
-        else:
-            continue
-
-        # loop through regions
-        for place in tech.regions:
-            # check if particular region has cost_data
-            try:
-                cost_fixed = tech.cost_fixed[place]
-            except BaseException:
-                continue
-            lifetime = float(tech.tech_lifetime[place])
-            # if there are existing vintages of the technology
-            try:
-                years = list(tech.existing_capacity[place].keys()) + \
-                    list(time_horizon)
-                years = [y for y in years if (time_horizon[0] - y) < lifetime]
-            except BaseException:
-                years = time_horizon
-            # generate future/vintage pairs
-            year_pairs = itertools.product(time_horizon, years)
-            if isinstance(cost_fixed, dict):
-                db_entry = [(place,
-                             int(year),
-                             tech.tech_name,
-                             int(vintage),
-                             cost_fixed[year],
-                             "",
-                             "") for year, vintage in year_pairs
-                            if (year - vintage) < lifetime
-                            and (year - vintage) >= 0]
-                entries += db_entry
-            elif (isinstance(cost_fixed, float)) or (isinstance(cost_fixed, int)):
-                db_entry = [(place,
-                             int(year),
-                             tech.tech_name,
-                             int(vintage),
-                             cost_fixed,
-                             "",
-                             "") for year, vintage in year_pairs
-                            if (year - vintage) < lifetime
-                            and (year - vintage) >= 0]
-                entries += db_entry
+    entries = _vintage_rows(technology_list, 'cost_fixed', time_horizon)
     cursor = connector.cursor()
     cursor.execute(table_command)
     cursor.executemany(insert_command, entries)
@@ -1017,7 +1003,43 @@ def create_fixed_cost(connector, technology_list, time_horizon):
     return table_command
 
 
-def create_capacity_factor_tech(connector, technology_list, seasons, hours):
+def capacity_factor_values(data, N_slices):
+    """
+    Returns the capacity factor of each time slice. A constant capacity
+    factor is repeated for every time slice and profiles are truncated
+    to ``N_slices``.
+    """
+    if (isinstance(data, int)) or (isinstance(data, float)):
+        return np.ones(N_slices) * data
+
+    return np.ravel(np.asarray(data, dtype=float))[:N_slices]
+
+
+def create_capacity_factor_tech(connector,
+                                technology_list,
+                                seasons,
+                                hours,
+                                skip_default=False):
+    """
+    This function writes the ``CapacityFactorTech`` table in Temoa.
+
+    Parameters
+    ----------
+    connector : sqlite3 connection object
+        Used to connect to and write to an sqlite database.
+    technology_list : list of ``Technology`` objects
+        All of the technologies initialized in the input file
+    seasons : list
+        The list of time of day names.
+    hours : list
+        The list of season names.
+    skip_default : boolean
+        Skips rows equal to Temoa's default capacity factor of one.
+        Temoa uses the default for every missing time slice, so the
+        model is unchanged. Other values, including constant capacity
+        factors below one, are written for every time slice. Default
+        is False.
+    """
     table_command = """
         CREATE TABLE "CapacityFactorTech" (
         	"regions"	text,
@@ -1039,30 +1061,44 @@ def create_capacity_factor_tech(connector, technology_list, seasons, hours):
     cursor = connector.cursor()
     cursor.execute(table_command)
 
+    time_slices = list(itertools.product(hours, seasons))
+    first_names = np.array([t[0][0] for t in time_slices], dtype=object)
+    second_names = np.array([t[1][0] for t in time_slices], dtype=object)
+    N_slices = len(time_slices)
+    default = temoa_defaults['CapacityFactorTech']
+    N_skipped = 0
     for tech in technology_list:
-        cft_dict = tech.capacity_factor_tech
-        # loops over each region where the commodity is defined
-        for place in cft_dict:
-            time_slices = itertools.product(hours, seasons)
-            data = cft_dict[place]
-            if (isinstance(data, list)) or (isinstance(data, np.ndarray)):
-                data = data.flatten()
-            elif (isinstance(data, int)) or (isinstance(data, float)):
-                # for constant capacity factor, must be on the interval [0,1]
-                data = np.ones(len(hours) * len(seasons)) * data
-            # print(tech.tech_name)
-            # breakpoint()
-            db_entry = [(place,
-                         ts[0][0],
-                         ts[1][0],
-                         tech.tech_name,
-                         float(d),
-                         '') for d,
-                        ts in zip(data, time_slices)]
-            # breakpoint()
-            cursor.executemany(insert_command, db_entry)
+        store = tech.parameters
+        # constant capacity factors are one (region x time slice) block,
+        # profiles are one block each
+        regions, constants = store.column('capacity_factor_tech')
+        blocks = [(regions, np.broadcast_to(constants[:, None],
+                                            (len(regions), N_slices)))]
+        for place in store.present_regions('capacity_factor_tech'):
+            data = store.get('capacity_factor_tech', place)
+            if place not in regions:
+                blocks.append(([place],
+                               capacity_factor_values(data, N_slices)[None]))
+
+        for places, data in blocks:
+            keep = np.ones(data.shape, dtype=bool)
+            if skip_default:
+                keep = data != default
+                N_skipped += keep.size - np.count_nonzero(keep)
+            r, i = np.nonzero(keep)
+            cursor.executemany(insert_command,
+                               zip(np.asarray(places, dtype=object)[r],
+                                   first_names[i],
+                                   second_names[i],
+                                   itertools.repeat(tech.tech_name),
+                                   data[r, i].tolist(),
+                                   itertools.repeat('')))
 
     connector.commit()
+    if skip_default:
+        print(f"Skipped {N_skipped} CapacityFactorTech rows equal to "
+              f"Temoa's default of {default}.")
+
     return table_command
 
 
@@ -1376,14 +1412,7 @@ def create_tech_ramping(connector, technology_list):
                      """
     cursor.execute(table_command)
 
-    entries = []
-    for tech in ramping_techs:
-        db_entry = [(place,
-                     tech.tech_name,
-                     up_rate)
-                    for place, up_rate in zip(list(tech.ramp_up.keys()),
-                                              list(tech.ramp_up.values()))]
-        entries += db_entry
+    entries = _regional_column(ramping_techs, 'ramp_up')
 
     cursor.executemany(insert_command, entries)
     connector.commit()
@@ -1402,14 +1431,7 @@ def create_tech_ramping(connector, technology_list):
 
     cursor.execute(table_command)
 
-    entries = []
-    for tech in ramping_techs:
-        db_entry = [(place,
-                     tech.tech_name,
-                     up_rate)
-                    for place, up_rate in zip(list(tech.ramp_down.keys()),
-                                              list(tech.ramp_down.values()))]
-        entries += db_entry
+    entries = _regional_column(ramping_techs, 'ramp_down')
     cursor.executemany(insert_command, entries)
     connector.commit()
     return
@@ -1436,15 +1458,8 @@ def create_tech_storage(connector, technology_list):
                      """
     cursor.execute(table_command)
 
-    entries = []
-    for tech in storage_techs:
-        db_entry = [(place,
-                     tech.tech_name,
-                     storage,
-                     '')
-                    for place, storage in zip(list(tech.storage_duration.keys()),
-                                              list(tech.storage_duration.values()))]
-        entries += db_entry
+    entries = [row + ('',)
+               for row in _regional_column(storage_techs, 'storage_duration')]
 
     cursor.executemany(insert_command, entries)
     connector.commit()
@@ -1468,15 +1483,9 @@ def create_loan_lifetime(connector, technology_list):
     cursor = connector.cursor()
     cursor.execute(table_command)
 
-    entries = []
-    for tech in technology_list:
-        db_entry = [(place,
-                     tech.tech_name,
-                     int(loan),
-                     '')
-                    for place, loan in zip(list(tech.loan_lifetime.keys()),
-                                           list(tech.loan_lifetime.values()))]
-        entries += db_entry
+    entries = [(place, tech_name, int(loan), '')
+               for place, tech_name, loan
+               in _regional_column(technology_list, 'loan_lifetime')]
 
     cursor.executemany(insert_command, entries)
     connector.commit()
@@ -1773,18 +1782,29 @@ def create_tech_exchange(connector, technology_list):
     return
 
 
-def create_MyopicBaseYear(connector):
+def create_MyopicBaseYear(connector, base_year=None):
     """
     Creates the MyopicBaseYear table.
+
+    Parameters
+    ----------
+    connector : sqlite3 connection object
+        Used to connect to and write to an sqlite database.
+    base_year : integer
+        The first period of a myopic run. Default is None, which
+        leaves the table empty.
     """
     table_command = """CREATE TABLE "MyopicBaseyear" (
-                	"year"	real
+                	"year"	real,
                 	"notes"	text
                     );
                  """
 
     cursor = connector.cursor()
     cursor.execute(table_command)
+    if base_year is not None:
+        cursor.execute('INSERT INTO "MyopicBaseyear" VALUES (?,?)',
+                       (int(base_year), ''))
     connector.commit()
     return
 
@@ -1,6 +1,35 @@
+import functools
 import numpy as np
 
 
+@functools.lru_cache(maxsize=None)
+def model_years(start_year, end_year, N_years):
+    """
+    Returns the years simulated between ``start_year`` and ``end_year``.
+    The result is cached and read-only, so repeated growth projections
+    over the same horizon do not rebuild it.
+
+    Parameters
+    ----------
+    start_year : integer
+        The first year of the simulation.
+    end_year : integer
+        The last year of the simulation.
+    N_years : integer
+        The number of years simulated between ``start_year`` and
+        ``end_year``.
+
+    Returns
+    -------
+    years : numpy array
+        The simulated years.
+    """
+    years = np.linspace(start_year, end_year, N_years).astype('int')
+    years.flags.writeable = False
+
+    return years
+
+
 def choose_growth_method(method_name='linear'):
     """
     This function returns a function that calculates the growth of
@@ -48,7 +77,7 @@ def linear_growth(init_value, start_year, end_year, N_years, growth_rate):
 
     def model(x, init_val, start, rate): return rate * \
         init_val * (x - start) + init_val
-    years = np.linspace(start_year, end_year, N_years).astype('int')
+    years = model_years(start_year, end_year, N_years)
     growth_data = model(years, init_value, start_year, growth_rate)
 
     return growth_data
@@ -82,7 +111,7 @@ def exponential_growth(init_value, start_year, end_year, N_years, growth_rate):
 
     def model(x, init_val, start, rate): return init_val * \
         np.exp(rate * (x - start))
-    years = np.linspace(start_year, end_year, N_years).astype('int')
+    years = model_years(start_year, end_year, N_years)
     growth_data = model(years, init_value, start_year, growth_rate)
 
     return growth_data
@@ -98,7 +127,8 @@ def logistic_growth(
     """
     This function returns a numpy array representing the growth
     of a quantity in each given year. Use this function if the growth
-    is expected to be logistic.
+    is expected to be logistic. Time is measured from ``start_year``, so
+    the value in ``start_year`` is ``init_value``.
 
     Parameters
     ----------
@@ -126,7 +156,70 @@ def logistic_growth(
     def model(x, rate, cap, sigmoid): return cap * \
         1/(1 + np.exp(-rate * (x - sigmoid)))
     sigmoid = 1/growth_rate * np.log(cap/init_value - 1)
-    years = np.linspace(start_year, end_year, N_years).astype('int')
-    growth_data = model(years, growth_rate, cap, sigmoid)
+    years = model_years(start_year, end_year, N_years)
+    growth_data = model(years - start_year, growth_rate, cap, sigmoid)
+
+    return growth_data
+
+
+def project_growth(init_values,
+                   growth_rates,
+                   start_year,
+                   end_year,
+                   N_years,
+                   growth_method='linear',
+                   caps=None):
+    """
+    This function projects the growth of many quantities at once, e.g.
+    the demand in many regions under many scenarios. The inputs are
+    broadcast against each other, so a (scenario x region) array of
+    growth rates can be combined with a (region,) array of initial values.
+
+    Parameters
+    ----------
+    init_values : float or array
+        The initial values.
+    growth_rates : float or array
+        The rates of growth.
+    start_year : integer
+        The first year of the simulation.
+    end_year : integer
+        The last year of the simulation.
+    N_years : integer
+        The number of years simulated between ``start_year`` and
+        ``end_year``.
+    growth_method : string
+        The name of the growth method. Accepts: linear, exponential,
+        logistic.
+    caps : float or array
+        The "carrying capacity" for each quantity. Only used for
+        logistic growth.
+
+    Returns
+    -------
+    growth_data : numpy array
+        An array with the broadcast shape of the inputs plus a
+        last axis for the years, e.g. (scenario x region x year).
+    """
+    years = model_years(start_year, end_year, N_years)
+    elapsed = years - start_year
+
+    init_values = np.asarray(init_values, dtype=float)[..., np.newaxis]
+    growth_rates = np.asarray(growth_rates, dtype=float)[..., np.newaxis]
+
+    if growth_method == 'linear':
+        growth_data = growth_rates * init_values * elapsed + init_values
+    elif growth_method == 'exponential':
+        growth_data = init_values * np.exp(growth_rates * elapsed)
+    elif growth_method == 'logistic':
+        if caps is None:
+            raise ValueError("Logistic growth requires caps.")
+        caps = np.asarray(caps, dtype=float)[..., np.newaxis]
+        sigmoid = 1 / growth_rates * np.log(caps / init_values - 1)
+        growth_data = caps / (1 + np.exp(-growth_rates *
+                                         (elapsed - sigmoid)))
+    else:
+        raise ValueError(f"Growth method {growth_method} not recognized. "
+                         "Accepts: linear, exponential, logistic.")
 
     return growth_data
@@ -0,0 +1,308 @@
+"""
+This file contains the columnar storage for the per-region parameters of
+a ``Technology``.
+
+Each technology keeps an ordered set of its regions, each with an integer
+code. Scalar parameters (e.g. ``efficiency`` or ``tech_lifetime``) are
+stored in one NumPy array per parameter, indexed by the region code.
+Integers are flagged, so they are returned as integers.
+Other values (commodities, cost dictionaries, capacity factor profiles)
+are stored by reference, so a profile array is shared rather than copied.
+
+``ParameterView`` exposes one parameter as a dictionary keyed by region,
+so ``tech.efficiency[region]`` works as before. ``ParameterStore.column``
+returns a whole parameter at once for the database writers.
+"""
+
+from collections.abc import MutableMapping
+from numbers import Integral, Real
+
+import numpy as np
+
+
+class RegionIndex(object):
+    """
+    An ordered set of region names. Each region has an integer code
+    given by the order in which it was added.
+    """
+    __slots__ = ('names', '_codes')
+
+    def __init__(self, names=()):
+        self.names = []
+        self._codes = {}
+        for name in names:
+            self.add(name)
+
+        return
+
+    def add(self, name):
+        """
+        Adds a region if it is new. Returns the code of the region.
+        """
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self.names)
+            self._codes[name] = code
+            self.names.append(name)
+
+        return code
+
+    def code(self, name):
+        """
+        Returns the code of a region. Raises a ``KeyError`` if the
+        region is unknown.
+        """
+        return self._codes[name]
+
+    def copy(self):
+        new = RegionIndex()
+        new.names = list(self.names)
+        new._codes = dict(self._codes)
+
+        return new
+
+    def __contains__(self, name):
+        return name in self._codes
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+
+def _is_scalar(value):
+    """
+    Returns True if the value is stored in a NumPy column.
+    """
+    return isinstance(value, Real) and not isinstance(value, bool)
+
+
+class ParameterStore(object):
+    """
+    This class holds the per-region parameters of one technology.
+    """
+    __slots__ = ('regions', 'names', 'frozen',
+                 '_values', '_present', '_integer', '_objects')
+
+    def __init__(self, names):
+        """
+        Initialize the store.
+
+        Parameters
+        ----------
+        names : list of strings
+            The names of the parameters.
+        """
+        self.regions = RegionIndex()
+        self.names = tuple(names)
+        self.frozen = False
+        self._values = {name: np.empty(0) for name in self.names}
+        self._present = {name: np.zeros(0, dtype=bool)
+                         for name in self.names}
+        self._integer = {name: np.zeros(0, dtype=bool)
+                         for name in self.names}
+        self._objects = {name: {} for name in self.names}
+
+        return
+
+    def _grow(self, N_regions):
+        """
+        Makes room for at least ``N_regions`` regions. The arrays grow
+        by doubling, so adding regions one at a time stays linear.
+        """
+        size = len(self._present[self.names[0]])
+        if size >= N_regions:
+            return
+        new_size = max(N_regions, 2 * size, 4)
+        for name in self.names:
+            values = np.full(new_size, np.nan)
+            values[:size] = self._values[name]
+            present = np.zeros(new_size, dtype=bool)
+            present[:size] = self._present[name]
+            integer = np.zeros(new_size, dtype=bool)
+            integer[:size] = self._integer[name]
+            self._values[name] = values
+            self._present[name] = present
+            self._integer[name] = integer
+
+        return
+
+    def check_mutable(self):
+        if self.frozen:
+            raise ValueError(("This technology is a catalog template and "
+                              "cannot be changed. Use .instance() to get "
+                              "a copy."))
+
+        return
+
+    def add_region(self, region):
+        """
+        Adds a region without data. Returns the code of the region.
+        """
+        self.check_mutable()
+        code = self.regions.add(region)
+        self._grow(len(self.regions))
+
+        return code
+
+    def set(self, name, region, value):
+        """
+        Sets the value of a parameter in a region.
+        """
+        code = self.add_region(region)
+        if _is_scalar(value):
+            self._values[name][code] = value
+            self._integer[name][code] = isinstance(value, Integral)
+            self._objects[name].pop(code, None)
+        else:
+            self._values[name][code] = np.nan
+            self._integer[name][code] = False
+            self._objects[name][code] = value
+        self._present[name][code] = True
+
+        return
+
+    def get(self, name, region):
+        """
+        Returns the value of a parameter in a region. Raises a
+        ``KeyError`` if the parameter is not set in the region.
+        """
+        code = self.regions._codes.get(region)
+        if (code is None) or (not self._present[name][code]):
+            raise KeyError(region)
+        objects = self._objects[name]
+        if code in objects:
+            return objects[code]
+        if self._integer[name][code]:
+            return int(self._values[name][code])
+
+        return self._values[name][code]
+
+    def remove(self, name, region):
+        """
+        Removes the value of a parameter in a region. The region
+        itself is kept.
+        """
+        self.check_mutable()
+        code = self.regions._codes.get(region)
+        if (code is None) or (not self._present[name][code]):
+            raise KeyError(region)
+        self._present[name][code] = False
+        self._integer[name][code] = False
+        self._values[name][code] = np.nan
+        self._objects[name].pop(code, None)
+
+        return
+
+    def has(self, name, region):
+        code = self.regions._codes.get(region)
+
+        return (code is not None) and bool(self._present[name][code])
+
+    def present_regions(self, name):
+        """
+        Returns the regions where a parameter is set, in region order.
+        """
+        N = len(self.regions)
+        codes = np.flatnonzero(self._present[name][:N])
+
+        return [self.regions.names[code] for code in codes]
+
+    def column(self, name):
+        """
+        Returns the regions where a parameter has a scalar value and
+        the values as a NumPy array.
+
+        Returns
+        -------
+        regions : list of strings
+            The regions, in region order.
+        values : NumPy array
+            The parameter values. Integers if every value was set as
+            an integer, otherwise floats.
+        """
+        N = len(self.regions)
+        scalar = self._present[name][:N].copy()
+        scalar[list(self._objects[name])] = False
+        codes = np.flatnonzero(scalar)
+        regions = [self.regions.names[code] for code in codes]
+        values = self._values[name][codes]
+        if (len(codes) > 0) and self._integer[name][codes].all():
+            values = values.astype(np.int64)
+
+        return regions, values
+
+    def copy(self):
+        """
+        Returns a mutable copy of the store. Non-scalar values, such as
+        capacity factor profiles, are shared with the original.
+        """
+        new = ParameterStore.__new__(ParameterStore)
+        new.regions = self.regions.copy()
+        new.names = self.names
+        new.frozen = False
+        new._values = {name: array.copy()
+                       for name, array in self._values.items()}
+        new._present = {name: array.copy()
+                        for name, array in self._present.items()}
+        new._integer = {name: array.copy()
+                        for name, array in self._integer.items()}
+        new._objects = {name: dict(objects)
+                        for name, objects in self._objects.items()}
+
+        return new
+
+    def subset(self, regions):
+        """
+        Returns a mutable copy of the store with only the given regions.
+        """
+        new = ParameterStore(self.names)
+        for region in regions:
+            new.add_region(region)
+            for name in self.names:
+                if self.has(name, region):
+                    new.set(name, region, self.get(name, region))
+
+        return new
+
+
+class ParameterView(MutableMapping):
+    """
+    A dictionary-like view of one parameter in a ``ParameterStore``,
+    keyed by region.
+    """
+    __slots__ = ('_store', '_name')
+
+    def __init__(self, store, name):
+        self._store = store
+        self._name = name
+
+        return
+
+    def __getitem__(self, region):
+        return self._store.get(self._name, region)
+
+    def __setitem__(self, region, value):
+        self._store.set(self._name, region, value)
+
+        return
+
+    def __delitem__(self, region):
+        self._store.remove(self._name, region)
+
+        return
+
+    def __contains__(self, region):
+        return self._store.has(self._name, region)
+
+    def __iter__(self):
+        return iter(self._store.present_regions(self._name))
+
+    def __len__(self):
+        N = len(self._store.regions)
+
+        return int(np.count_nonzero(self._store._present[self._name][:N]))
+
+    def __repr__(self):
+        return repr(dict(self.items()))
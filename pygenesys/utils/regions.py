@@ -0,0 +1,238 @@
+"""
+This file merges the regions of a model into larger zones.
+
+A region map, e.g. ``{'Champaign': 'central', 'Cook': 'north', ...}``,
+assigns each region to a zone. Regions missing from the map are kept as
+they are. The data of the regions in a zone are combined as follows:
+    * demands, existing capacity, capacity limits, and emissions limits
+      are summed,
+    * demand distributions, time slice fractions, and the planning
+      reserve margin are weighted by the total demand of each region,
+    * capacity factors, costs, efficiencies, lifetimes, and the other
+      numeric technology parameters are weighted by the existing
+      capacity of each region. A region without existing capacity is
+      weighted as if it had the mean existing capacity of the other
+      regions, so its new capacity still counts (equal weights if no
+      region has any),
+    * commodities are taken from the first region.
+
+An exchange technology in region ``'A-B'`` is moved to the zones of
+``A`` and ``B``. Exchanges within one zone are removed.
+
+The technologies and commodities are copied, so the input file objects
+are not changed.
+"""
+
+import numpy as np
+
+from pygenesys.utils.parameters import ParameterStore
+
+# technology parameters that are summed over the regions in a zone
+summed_parameters = ['existing_capacity', 'max_capacity', 'min_capacity']
+
+
+def zone_of(region, region_map, exchange=False):
+    """
+    Returns the zone of a region. For an exchange technology, region
+    ``'A-B'`` becomes ``'zone A-zone B'``, or None if both regions are
+    in the same zone.
+    """
+    if exchange and ('-' in region):
+        origin, destination = region.split('-', 1)
+        origin = region_map.get(origin, origin)
+        destination = region_map.get(destination, destination)
+        if origin == destination:
+            return None
+        return f'{origin}-{destination}'
+
+    return region_map.get(region, region)
+
+
+def _is_numeric(value):
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float, np.number)):
+        return True
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return np.asarray(value).dtype.kind in 'iuf'
+
+    return False
+
+
+def merge_values(values, weights, how='mean'):
+    """
+    Combines the values of a parameter in several regions.
+
+    Parameters
+    ----------
+    values : list
+        The value in each region. Numbers and arrays are combined
+        element-wise, dictionaries key by key. Anything else (e.g. a
+        commodity) is taken from the first region.
+    weights : list of floats
+        The weight of each region.
+    how : string
+        'sum' or 'mean' (weighted mean).
+
+    Returns
+    -------
+    value : the combined value
+    """
+    weights = np.asarray(weights, dtype=float)
+    if weights.sum() <= 0:
+        weights = np.ones(len(values))
+
+    if all(isinstance(v, dict) for v in values):
+        keys = []
+        for v in values:
+            keys += [k for k in v if k not in keys]
+        merged = {}
+        for key in keys:
+            present = [i for i, v in enumerate(values) if key in v]
+            merged[key] = merge_values([values[i][key] for i in present],
+                                       weights[present],
+                                       how)
+        return merged
+
+    if all(_is_numeric(v) for v in values):
+        scalar = all(np.ndim(v) == 0 for v in values)
+        arrays = np.broadcast_arrays(*[np.asarray(v, dtype=float)
+                                       for v in values])
+        table = np.stack(arrays)
+        if how == 'sum':
+            merged = table.sum(axis=0)
+        else:
+            merged = np.average(table, axis=0, weights=weights)
+        return float(merged) if scalar else merged
+
+    for v in values[1:]:
+        if v is not values[0]:
+            print(f'Warning: regions in a zone have different values '
+                  f'({values[0]} and {v}). Using the first one.')
+            break
+
+    return values[0]
+
+
+def _group(regions, region_map, exchange=False):
+    """
+    Returns ``{zone: [regions]}``, with zones in order of appearance.
+    """
+    zones = {}
+    for region in regions:
+        zone = zone_of(region, region_map, exchange)
+        if zone is not None:
+            zones.setdefault(zone, []).append(region)
+
+    return zones
+
+
+def _existing_total(tech, region):
+    existing = tech.existing_capacity.get(region, {})
+    if isinstance(existing, dict):
+        return float(np.sum(list(existing.values())))
+
+    return 0.0
+
+
+def _technology_weights(tech, regions):
+    """
+    Returns the weight of each region of a technology in a zone: its
+    existing capacity, or the mean existing capacity of the regions
+    that have some if it has none.
+    """
+    weights = np.array([_existing_total(tech, r) for r in regions])
+    if np.any(weights > 0):
+        weights[weights <= 0] = weights[weights > 0].mean()
+
+    return list(weights)
+
+
+def aggregate_technology(tech, region_map):
+    """
+    Returns a copy of a technology with its regions merged into zones.
+    Returns None if no region is left.
+    """
+    zones = _group(tech.regions, region_map, tech.exchange_tech)
+    if len(zones) == 0:
+        return None
+
+    store = tech.parameters
+    new = tech.instance()
+    new.parameters = ParameterStore(store.names)
+    for zone, members in zones.items():
+        weights = _technology_weights(tech, members)
+        new.parameters.add_region(zone)
+        for name in store.names:
+            present = [i for i, r in enumerate(members)
+                       if store.has(name, r)]
+            if len(present) == 0:
+                continue
+            how = 'sum' if name in summed_parameters else 'mean'
+            value = merge_values([store.get(name, members[i])
+                                  for i in present],
+                                 [weights[i] for i in present],
+                                 how)
+            new.parameters.set(name, zone, value)
+
+    return new
+
+
+def region_weights(demands):
+    """
+    Returns the total demand of each region, over all demand
+    commodities and years.
+    """
+    weights = {}
+    for demand in demands:
+        for region, data in demand.demand.items():
+            weights[region] = weights.get(region, 0.0) + np.sum(data)
+
+    return weights
+
+
+def _merge_regional(data, region_map, weights, how):
+    merged = {}
+    for zone, members in _group(data, region_map).items():
+        merged[zone] = merge_values([data[r] for r in members],
+                                    [weights.get(r, 0.0) for r in members],
+                                    how)
+
+    return merged
+
+
+def aggregate_demand(demand, region_map):
+    """
+    Returns a copy of a demand commodity with its regions merged into
+    zones. Distributions and time slice fractions are weighted by the
+    demand in each region.
+    """
+    weights = {r: np.sum(data) for r, data in demand.demand.items()}
+    new = demand.instance()
+    new.demand = _merge_regional(demand.demand, region_map, weights, 'sum')
+    new.distribution = _merge_regional(demand.distribution, region_map,
+                                       weights, 'mean')
+    new.seg_frac = _merge_regional(demand.seg_frac, region_map,
+                                   weights, 'mean')
+
+    return new
+
+
+def aggregate_emissions(emissions, region_map):
+    """
+    Returns a copy of an emissions commodity with its limits summed
+    into zones.
+    """
+    new = emissions.instance()
+    new.emissions_limit = _merge_regional(emissions.emissions_limit,
+                                          region_map, {}, 'sum')
+
+    return new
+
+
+def aggregate_reserve_margin(reserve_margin, region_map, weights):
+    """
+    Returns the planning reserve margin of each zone, weighted by the
+    total demand of each region.
+    """
+    return _merge_regional(reserve_margin, region_map, weights, 'mean')
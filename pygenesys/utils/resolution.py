@@ -0,0 +1,244 @@
+"""
+This file contains tools for choosing the time resolution of a model.
+
+Choosing ``N_seasons`` and ``N_hours`` by hand is guesswork. The functions
+below evaluate candidate resolutions, built with ``tsprocess.aggregate``,
+against the full hourly time series and report the smallest resolution that
+reproduces the data within a user tolerance.
+"""
+
+import itertools
+import numpy as np
+import pandas as pd
+from pygenesys.utils.tsprocess import (aggregate,
+                                       read_time_series,
+                                       timeseries_preprocess)
+
+N_per_year = {'season': 4,
+              'month': 12,
+              'week': 52,
+              'day': 365}
+
+error_metrics = ['energy_error', 'peak_error', 'ramp_error']
+
+
+def candidate_resolutions(groupings=('season', 'month', 'week', 'day'),
+                          hours=(24,),
+                          add_peak=(False, True),
+                          add_weekend=(False, True)):
+    """
+    Generates the list of candidate resolutions to evaluate.
+
+    Peak days and weekends are not added to ``day`` groupings, since
+    each group is already a single day.
+
+    Parameters
+    ----------
+    groupings : iterable of strings
+        The groupings passed to ``tsprocess.aggregate``. Accepts
+        'season', 'month', 'week', and 'day'.
+    hours : iterable of integers
+        The number of hours (time of day blocks) in each season. E.g.
+        ``(24, 12, 6)`` compares hourly, two-hour, and four-hour blocks.
+    add_peak : iterable of booleans
+        Whether to include peak days.
+    add_weekend : iterable of booleans
+        Whether to include average weekends.
+
+    Returns
+    -------
+    candidates : list of dictionaries
+        Each dictionary holds the keyword arguments ``groupby``,
+        ``N_seasons``, ``N_hours``, ``add_peak``, and ``add_weekend``.
+    """
+    candidates = []
+    for groupby, N_hours, peak, weekend in itertools.product(groupings,
+                                                             hours,
+                                                             add_peak,
+                                                             add_weekend):
+        if (groupby == 'day') and (peak or weekend):
+            continue
+        N_segments = 1 + int(peak) + int(weekend)
+        candidates.append({'groupby': groupby,
+                           'N_seasons': N_per_year[groupby] * N_segments,
+                           'N_hours': N_hours,
+                           'add_peak': peak,
+                           'add_weekend': weekend})
+
+    return candidates
+
+
+def _max_ramp(profile):
+    """
+    Returns the largest hour-to-hour change within the rows of a profile.
+    """
+    profile = np.atleast_2d(profile)
+    if profile.shape[1] < 2:
+        return 0.0
+
+    return np.abs(np.diff(profile, axis=1)).max()
+
+
+def score_resolution(time_series,
+                     groupby='season',
+                     N_seasons=4,
+                     N_hours=24,
+                     add_peak=False,
+                     add_weekend=False):
+    """
+    Scores one resolution against the full hourly time series.
+
+    Each error is relative to the value calculated from the full
+    time series.
+        * ``energy_error`` : the error in the annual energy (or mean
+          value) when each time slice is weighted by the fraction of
+          the year it represents (its SegFrac).
+        * ``peak_error`` : the error in the peak value.
+        * ``ramp_error`` : the error in the largest hourly ramp.
+
+    Parameters
+    ----------
+    time_series : pandas.DataFrame
+        The hourly time series with a datetime index. Should already be
+        processed with ``tsprocess.timeseries_preprocess``.
+    groupby : string
+        Indicates how the time series should be grouped.
+    N_seasons : integer
+        The number of seasons in the energy system model.
+    N_hours : integer
+        The hourly resolution of the energy system model.
+    add_peak : boolean
+        Indicates whether time slices include peak days.
+    add_weekend : boolean
+        Indicates whether time slices include weekends.
+
+    Returns
+    -------
+    scores : dictionary
+        The error metrics for this resolution.
+    """
+    profile, seg_frac = aggregate(time_series,
+                                  N_seasons=N_seasons,
+                                  N_hours=N_hours,
+                                  kind='none',
+                                  groupby=groupby,
+                                  add_peak=add_peak,
+                                  add_weekend=add_weekend,
+                                  return_weights=True)
+
+    data = time_series.iloc[:, 0].values
+    actual_mean = data.mean()
+    actual_peak = data.max()
+    actual_ramp = np.abs(np.diff(data)).max()
+
+    energy_error = np.abs((profile * seg_frac).sum() -
+                          actual_mean) / actual_mean
+    peak_error = np.abs(profile.max() - actual_peak) / actual_peak
+    if actual_ramp > 0:
+        ramp_error = np.abs(_max_ramp(profile) - actual_ramp) / actual_ramp
+    else:
+        ramp_error = 0.0
+
+    scores = {'energy_error': energy_error,
+              'peak_error': peak_error,
+              'ramp_error': ramp_error}
+
+    return scores
+
+
+def evaluate_resolutions(dataframe, candidates=None, N_profiles=1):
+    """
+    Evaluates a set of candidate resolutions against a time series.
+
+    Parameters
+    ----------
+    dataframe : string, or pandas dataframe
+        The path to the time series data or a pandas dataframe
+            * must be a ``.csv`` file
+            * must have a column ``time`` that is a pandas datetime column
+    candidates : list of dictionaries
+        The resolutions to evaluate. Default is every resolution
+        from ``candidate_resolutions``.
+    N_profiles : integer
+        The number of time sliced profiles in the model, i.e. the number of
+        (region, demand) distributions plus (region, technology) capacity
+        factors. Used to estimate the number of rows in the database.
+
+    Returns
+    -------
+    results : pandas.DataFrame
+        One row per candidate, sorted by the number of time slices.
+        Includes the error metrics, the largest error, the number of
+        time slices, and the number of time sliced rows in the database.
+    """
+    if isinstance(dataframe, str):
+        time_series = read_time_series(dataframe)
+    elif isinstance(dataframe, pd.DataFrame):
+        time_series = dataframe
+
+    time_series = timeseries_preprocess(time_series)
+
+    if candidates is None:
+        candidates = candidate_resolutions()
+
+    rows = []
+    for candidate in candidates:
+        scores = score_resolution(time_series, **candidate)
+        N_slices = candidate['N_seasons'] * candidate['N_hours']
+        row = dict(candidate)
+        row.update(scores)
+        row['max_error'] = max(scores.values())
+        row['N_slices'] = N_slices
+        # SegFrac plus one row per slice for every profile
+        row['db_rows'] = N_slices * (1 + N_profiles)
+        rows.append(row)
+
+    results = pd.DataFrame(rows)
+    results.sort_values(by=['N_slices', 'max_error'],
+                        inplace=True,
+                        ignore_index=True)
+
+    return results
+
+
+def select_resolution(dataframe, tolerance=0.05, candidates=None,
+                      N_profiles=1):
+    """
+    Returns the smallest resolution whose errors are all below
+    the tolerance.
+
+    Parameters
+    ----------
+    dataframe : string, or pandas dataframe
+        The path to the time series data or a pandas dataframe.
+    tolerance : float
+        The largest acceptable relative error for every metric.
+        E.g. 0.05 corresponds to 5 percent.
+    candidates : list of dictionaries
+        The resolutions to evaluate. Default is every resolution
+        from ``candidate_resolutions``.
+    N_profiles : integer
+        The number of time sliced profiles in the model.
+
+    Returns
+    -------
+    best : dictionary
+        The smallest acceptable resolution and its scores. If no
+        candidate meets the tolerance, the candidate with the smallest
+        maximum error is returned instead and a warning is printed.
+    results : pandas.DataFrame
+        The scores for every candidate.
+    """
+    results = evaluate_resolutions(dataframe,
+                                   candidates=candidates,
+                                   N_profiles=N_profiles)
+
+    acceptable = results[results['max_error'] <= tolerance]
+    if len(acceptable) > 0:
+        best = acceptable.iloc[0].to_dict()
+    else:
+        print(f'Warning: No resolution meets the tolerance {tolerance}. '
+              'Returning the most accurate resolution.')
+        best = results.loc[results['max_error'].idxmin()].to_dict()
+
+    return best, results
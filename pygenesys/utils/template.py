@@ -0,0 +1,96 @@
+"""
+This file contains tools that turn technologies and commodities into
+immutable templates and make cheap copies of them.
+
+A frozen object cannot be changed: its per-region dictionaries become
+read-only views and its parameter store is locked. ``instance`` returns a
+mutable copy that has new per-region containers but shares the values
+in them (e.g. capacity factor or demand arrays). Methods such as
+``add_regional_data`` replace a region's value instead of modifying it,
+so the shared values are only copied when they are written.
+"""
+
+import types
+
+from pygenesys.utils.parameters import ParameterStore
+
+
+def _state(obj):
+    """
+    Returns the attributes of an object that uses ``__slots__``,
+    ``__dict__``, or both.
+    """
+    state = dict(getattr(obj, '__dict__', {}))
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if (name not in state) and hasattr(obj, name):
+                state[name] = getattr(obj, name)
+
+    return state
+
+
+def check_mutable(obj):
+    """
+    Raises a ``ValueError`` if the object is a frozen template.
+    """
+    if getattr(obj, '_frozen', False):
+        name = getattr(obj, 'tech_name', getattr(obj, 'comm_name', obj))
+        raise ValueError((f"{name} is a catalog template and cannot be "
+                          "changed. Use .instance() to get a copy."))
+
+    return
+
+
+def freeze(obj):
+    """
+    Makes a technology or commodity immutable.
+
+    Parameters
+    ----------
+    obj : ``Technology`` or ``Commodity``
+        The object to freeze.
+
+    Returns
+    -------
+    obj : ``Technology`` or ``Commodity``
+        The same object, now frozen.
+    """
+    for name, value in _state(obj).items():
+        if isinstance(value, dict):
+            object.__setattr__(obj, name, types.MappingProxyType(value))
+        elif isinstance(value, ParameterStore):
+            value.frozen = True
+    object.__setattr__(obj, '_frozen', True)
+
+    return obj
+
+
+def instance(obj):
+    """
+    Returns a mutable copy of a technology or commodity. The copy has
+    its own per-region containers, which share their values with the
+    original object.
+
+    Parameters
+    ----------
+    obj : ``Technology`` or ``Commodity``
+        The object to copy. May be frozen.
+
+    Returns
+    -------
+    new : ``Technology`` or ``Commodity``
+        The copy.
+    """
+    new = type(obj).__new__(type(obj))
+    for name, value in _state(obj).items():
+        if name == '_frozen':
+            continue
+        if isinstance(value, (dict, types.MappingProxyType)):
+            value = dict(value)
+        elif isinstance(value, ParameterStore):
+            value = value.copy()
+        elif isinstance(value, list):
+            value = list(value)
+        object.__setattr__(new, name, value)
+
+    return new
@@ -1,6 +1,63 @@
 import numpy as np
 import pandas as pd
 import datetime as dt
+import os
+
+# parsed time series and aggregated profiles, kept for the life of the
+# process so repeated builds do not re-read the same files
+_series_cache = {}
+_profile_cache = {}
+
+
+def _file_key(path):
+    """
+    Identifies a file by its absolute path and modification time, so
+    cached data are refreshed when the file changes.
+    """
+    return (os.path.abspath(path), os.path.getmtime(path))
+
+
+def read_time_series(path):
+    """
+    Reads a time series ``.csv`` file with a ``time`` column. The parsed
+    data are cached, so each file is only read once per process.
+
+    Parameters
+    ----------
+    path : string
+        The path to the time series data.
+
+    Returns
+    -------
+    time_series : pandas dataframe
+        A copy of the time series, indexed by time.
+    """
+    key = _file_key(path)
+    if key not in _series_cache:
+        _series_cache[key] = pd.read_csv(path,
+                                         usecols=[0, 1],
+                                         index_col=['time'],
+                                         parse_dates=True,
+                                         )
+
+    return _series_cache[key].copy()
+
+
+def clear_cache():
+    """
+    Empties the time series and profile caches.
+    """
+    _series_cache.clear()
+    _profile_cache.clear()
+
+    return
+
+
+def cached_files():
+    """
+    Returns the paths of the time series files in the cache, sorted.
+    """
+    return sorted({path for path, mtime in _series_cache})
 
 
 def timeseries_preprocess(ts):
@@ -98,13 +155,178 @@ def get_season_masks(df):
     return seasons
 
 
+def hour_blocks(N_hours=24, boundaries=None):
+    """
+    Returns the time of day block for each hour of the day.
+
+    Parameters
+    ----------
+    N_hours : integer
+        The number of time of day blocks. Must be between 1 and 24.
+    boundaries : list of integers
+        The first hour of each block, e.g. ``[0, 7, 11, 17, 21]`` for
+        night, morning, midday, peak, and evening blocks. Must have
+        ``N_hours`` entries and start at hour 0. If ``None``, the 24 hours
+        are split into ``N_hours`` blocks of (nearly) uniform length.
+
+    Returns
+    -------
+    blocks : numpy array
+        An array of length 24 with the block index of each hour.
+    """
+    if (N_hours < 1) or (N_hours > 24):
+        raise ValueError(f"N_hours must be between 1 and 24, got {N_hours}.")
+
+    if boundaries is None:
+        blocks = np.arange(24) * N_hours // 24
+    else:
+        boundaries = np.sort(np.unique(boundaries))
+        if len(boundaries) != N_hours:
+            raise ValueError(f"Expected {N_hours} hour boundaries, "
+                             f"got {len(boundaries)}.")
+        if (boundaries[0] != 0) or (boundaries[-1] > 23):
+            raise ValueError("Hour boundaries must start at 0 and "
+                             "be less than 24.")
+        blocks = np.searchsorted(boundaries, np.arange(24), side='right') - 1
+
+    return blocks
+
+
+def hour_fractions(N_hours=24, boundaries=None):
+    """
+    Returns the fraction of a day represented by each time of day block.
+
+    Parameters
+    ----------
+    N_hours : integer
+        The number of time of day blocks.
+    boundaries : list of integers
+        The first hour of each block. See ``hour_blocks``.
+
+    Returns
+    -------
+    fractions : numpy array
+        An array of length ``N_hours`` that sums to one.
+    """
+    blocks = hour_blocks(N_hours, boundaries)
+    fractions = np.bincount(blocks, minlength=N_hours) / 24
+
+    return fractions
+
+
+def downsample_hours(profile, N_hours=24, boundaries=None):
+    """
+    Averages hourly profiles into time of day blocks.
+
+    Parameters
+    ----------
+    profile : numpy array
+        The hourly data. The last axis must have length 24.
+    N_hours : integer
+        The number of time of day blocks.
+    boundaries : list of integers
+        The first hour of each block. See ``hour_blocks``.
+
+    Returns
+    -------
+    block_profile : numpy array
+        The data averaged over each block. The last axis has
+        length ``N_hours``.
+    """
+    profile = np.asarray(profile, dtype=float)
+    if (N_hours == 24) and (boundaries is None):
+        return profile
+
+    blocks = hour_blocks(N_hours, boundaries)
+    block_map = np.zeros((24, N_hours))
+    block_map[np.arange(24), blocks] = 1.0
+    block_profile = (profile @ block_map) / block_map.sum(axis=0)
+
+    return block_profile
+
+
+def representative_days(dataframe,
+                        N_hours=24,
+                        add_peak=False,
+                        add_weekend=False,
+                        hour_boundaries=None):
+    """
+    Calculates the representative days of one group (e.g. a season)
+    of a time series and the number of real hours each one represents.
+
+    The first representative day is the average day. If a peak day or
+    an average weekend is added, the hours on those days are represented
+    by their own profile and are removed from the average day.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame
+        The hourly time series for one group, with a datetime index.
+    N_hours : integer
+        The number of time of day blocks.
+    add_peak : boolean
+        Adds the peak day.
+    add_weekend : boolean
+        Adds the average weekend day.
+    hour_boundaries : list of integers
+        The first hour of each time of day block. See ``hour_blocks``.
+
+    Returns
+    -------
+    profiles : numpy array
+        The profile of each representative day, one row per day.
+    represented_hours : numpy array
+        The number of hours in the data that each time slice of
+        ``profiles`` represents. Same shape as ``profiles``.
+    """
+    time_series = dataframe
+    blocks = hour_blocks(N_hours, hour_boundaries)
+    hour_of_day = time_series.index.hour.values
+
+    peak_mask = np.zeros(len(time_series), dtype=bool)
+    weekend_mask = np.zeros(len(time_series), dtype=bool)
+    if add_peak:
+        peak_date = get_peak_day(time_series).index.date[0]
+        peak_mask = (time_series.index.date == peak_date)
+    if add_weekend:
+        weekend_mask = (time_series.index.weekday >= 5) & (~peak_mask)
+    base_mask = ~(peak_mask | weekend_mask)
+    if not base_mask.any():
+        base_mask = np.ones(len(time_series), dtype=bool)
+
+    base_df = time_series[base_mask]
+    profiles = [base_df.groupby(
+        base_df.index.hour).mean().values.reshape((24,))]
+    masks = [base_mask]
+
+    if add_peak:
+        profiles.append(get_peak_day(time_series).values.reshape((24,)))
+        masks.append(peak_mask)
+
+    if add_weekend:
+        weekend_df = time_series[weekend_mask]
+        if len(weekend_df) == 0:
+            weekend_df = time_series[time_series.index.weekday >= 5]
+        profiles.append(get_weekends(weekend_df).values.reshape((24,)))
+        masks.append(weekend_mask)
+
+    profiles = downsample_hours(np.array(profiles), N_hours, hour_boundaries)
+    represented_hours = np.array([
+        np.bincount(blocks[hour_of_day[mask]], minlength=N_hours)
+        for mask in masks], dtype=float)
+
+    return profiles, represented_hours
+
+
 def four_seasons_hourly(dataframe,
                         N_seasons=4,
                         N_hours=24,
                         kind='demand',
                         add_peak=False,
                         add_weekend=False,
-                        how=None, N_segments=1):
+                        how=None, N_segments=1,
+                        hour_boundaries=None,
+                        return_weights=False):
     """
     This function calculates a seasonal trend based on the
     input data. Answers the question: what fraction of the annual
@@ -132,19 +354,23 @@ def four_seasons_hourly(dataframe,
     how : string
         The time series aggregation method. Only used in ``tsprocess.create_timeslices``
         which depends on the ``tsam`` package.
+    hour_boundaries : list of integers
+        The first hour of each time of day block. See ``hour_blocks``.
+    return_weights : boolean
+        If ``True``, also returns the fraction of the year represented
+        by each time slice.
 
     Returns
     -------
     distribution : numpy array
         The time series data distributed over the specified time
         slices.
+    weights : numpy array
+        The fraction of the year represented by each time slice. Only
+        returned if ``return_weights`` is ``True``.
     """
     if isinstance(dataframe, str):
-        time_series = pd.read_csv(dataframe,
-                                  usecols=[0, 1],
-                                  index_col=['time'],
-                                  parse_dates=True,
-                                  )
+        time_series = read_time_series(dataframe)
     elif isinstance(dataframe, pd.DataFrame):
         time_series = dataframe
 
@@ -152,29 +378,32 @@ def four_seasons_hourly(dataframe,
     seasons = get_season_masks(time_series)
 
     seasonal_hourly_profile = np.zeros((N_seasons, N_hours))
+    represented_hours = np.zeros((N_seasons, N_hours))
     for i, season in enumerate(list(seasons.values())):
         season_df = time_series[season]
         idx = int(N_segments * i)
-        seasonal_hourly_profile[idx] = season_df.groupby(
-            season_df.index.hour).mean().values.reshape((24,))
+        profiles, hours = representative_days(season_df,
+                                              N_hours,
+                                              add_peak,
+                                              add_weekend,
+                                              hour_boundaries)
+        seasonal_hourly_profile[idx:idx + N_segments] = profiles
+        represented_hours[idx:idx + N_segments] = hours
 
-        if add_peak:
-            idx += 1
-            peak_day = get_peak_day(season_df).values.reshape((24,))
-            seasonal_hourly_profile[idx] = peak_day
-
-        if add_weekend:
-            idx += 1
-            weekend = get_weekends(season_df).values.reshape((24,))
-            seasonal_hourly_profile[idx] = weekend
+    weights = represented_hours / represented_hours.sum()
 
     if kind.lower() == "demand":
+        # the share of annual demand in each slice
+        seasonal_hourly_profile = seasonal_hourly_profile * weights
         seasonal_hourly_profile = (
             seasonal_hourly_profile / (seasonal_hourly_profile.sum()))
     elif kind.lower() == "cf":
         seasonal_hourly_profile = (
             seasonal_hourly_profile / (time_series.iloc[:, 0].max()))
 
+    if return_weights:
+        return seasonal_hourly_profile, weights
+
     return seasonal_hourly_profile
 
 
@@ -185,7 +414,9 @@ def aggregate(dataframe,
               groupby='season',
               add_peak=False,
               add_weekend=False,
-              how=None):
+              how=None,
+              hour_boundaries=None,
+              return_weights=False):
     """
     This function calculates a seasonal trend based on the
     input data. Answers the question: what fraction of the annual
@@ -224,34 +455,54 @@ def aggregate(dataframe,
         Indicates whether desired time slices include peak days.
     add_weekend : boolean
         Indicates whether desired time slices include weekends.
+    hour_boundaries : list of integers
+        The first hour of each time of day block, e.g. ``[0, 7, 11, 17, 21]``.
+        If ``None``, the day is split into ``N_hours`` uniform blocks.
+        See ``hour_blocks``.
+    return_weights : boolean
+        If ``True``, also returns the fraction of the year represented
+        by each time slice. These weights are the SegFrac values
+        consistent with the returned profile.
 
     Returns
     -------
     distribution : numpy array
         The time series data distributed over the specified time
         slices.
+    weights : numpy array
+        The fraction of the year represented by each time slice, based
+        on how many hours in the data each slice stands for. Only
+        returned if ``return_weights`` is ``True``.
     """
-    # read in the data
+    # profiles calculated from files are cached
     if isinstance(dataframe, str):
-        time_series = pd.read_csv(dataframe,
-                                  usecols=[0, 1],
-                                  index_col=['time'],
-                                  parse_dates=True,
-                                  )
-    elif isinstance(dataframe, pd.DataFrame):
-        time_series = dataframe
-
-    time_series = timeseries_preprocess(time_series)
+        if hour_boundaries is not None:
+            hour_boundaries = tuple(hour_boundaries)
+        key = (_file_key(dataframe), N_seasons, N_hours, kind, groupby,
+               add_peak, add_weekend, how, hour_boundaries)
+        if key not in _profile_cache:
+            _profile_cache[key] = aggregate(read_time_series(dataframe),
+                                            N_seasons=N_seasons,
+                                            N_hours=N_hours,
+                                            kind=kind,
+                                            groupby=groupby,
+                                            add_peak=add_peak,
+                                            add_weekend=add_weekend,
+                                            how=how,
+                                            hour_boundaries=hour_boundaries,
+                                            return_weights=True)
+        distribution, weights = _profile_cache[key]
+        if return_weights:
+            return distribution.copy(), weights.copy()
+        return distribution.copy()
+
+    time_series = timeseries_preprocess(dataframe)
 
     # how many period segments to calculate
     N_segments = 1 + int(add_peak) + int(add_weekend)
 
-    N_per_year = {'season': 4,
-                  'month': 12,
-                  'week': 52,
-                  'day': 365}
-                  
     hourly_profiles = np.zeros((N_seasons, N_hours))
+    represented_hours = np.zeros((N_seasons, N_hours))
 
     # group the time series
     if groupby == 'season':
@@ -261,7 +512,9 @@ def aggregate(dataframe,
                                               kind=kind,
                                               add_peak=add_peak,
                                               add_weekend=add_weekend,
-                                              N_segments=N_segments)
+                                              N_segments=N_segments,
+                                              hour_boundaries=hour_boundaries,
+                                              return_weights=return_weights)
         return hourly_profiles
 
     # all other cases
@@ -280,25 +533,26 @@ def aggregate(dataframe,
         group_df = grouped.get_group(group)
 
         idx = int(N_segments * i)
-        hourly_profiles[idx] = group_df.groupby(
-            group_df.index.hour).mean().values.reshape(
-            (24,))
+        profiles, hours = representative_days(group_df,
+                                              N_hours,
+                                              add_peak,
+                                              add_weekend,
+                                              hour_boundaries)
+        hourly_profiles[idx:idx + N_segments] = profiles
+        represented_hours[idx:idx + N_segments] = hours
 
-        if add_peak:
-            idx += 1
-            peak_day = get_peak_day(group_df).values.reshape((24,))
-            hourly_profiles[idx] = peak_day
-
-        if add_weekend:
-            idx += 1
-            weekend = get_weekends(group_df).values.reshape((24,))
-            hourly_profiles[idx] = weekend
+    weights = represented_hours / represented_hours.sum()
 
     if kind.lower() == "demand":
+        # the share of annual demand in each slice
+        hourly_profiles = hourly_profiles * weights
         hourly_profiles = (hourly_profiles / (hourly_profiles.sum()))
     elif kind.lower() == "cf":
         hourly_profiles = (hourly_profiles / (time_series.iloc[:, 0].max()))
 
+    if return_weights:
+        return hourly_profiles, weights
+
     return hourly_profiles
 
 
@@ -345,11 +599,7 @@ def create_timeslices(
     """
 
     if isinstance(dataframe, str):
-        time_series = pd.read_csv(dataframe,
-                                  usecols=[0, 1],
-                                  index_col=['time'],
-                                  parse_dates=True,
-                                  )
+        time_series = read_time_series(dataframe)
     elif isinstance(dataframe, pd.DataFrame):
         time_series = dataframe
 
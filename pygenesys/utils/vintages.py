@@ -0,0 +1,172 @@
+"""
+This file merges the vintages of existing capacity into bins.
+
+``eia_data.get_existing_capacity`` returns one vintage per operating year,
+and every vintage that survives to the first model period becomes its own
+row in the Efficiency, cost, and emission tables and its own time period.
+Binning merges the vintages in each bin into one vintage at the
+capacity-weighted mean year of the bin. The total capacity is unchanged,
+and the retirement of each bin happens at the average retirement year of
+the capacity in it. A wide bin can retire much of its capacity too early
+or too late; with a ``tolerance``, such bins are split until the error in
+surviving capacity is small enough.
+
+Bins are given as
+    * an integer width in years, with bin edges aligned to the first
+      model year (e.g. ``5`` gives 2015-2019, 2010-2014, ... for a
+      model that starts in 2020),
+    * a list of bin edges, e.g. ``[1950, 1980, 2000, 2010, 2020]``.
+"""
+
+import numpy as np
+
+
+def bin_index(years, bins, start_year):
+    """
+    Returns the bin of each year. Years on or after ``start_year`` are
+    not binned and get the bin -1.
+
+    Parameters
+    ----------
+    years : NumPy array
+        The vintage years.
+    bins : integer or list of integers
+        The bin width in years, or the bin edges.
+    start_year : integer
+        The first year of the model.
+    """
+    years = np.asarray(years)
+    if np.ndim(bins) == 0:
+        if bins < 1:
+            raise ValueError(f"Bin width must be at least 1. Got {bins}.")
+        index = (start_year - 1 - years) // int(bins)
+    else:
+        edges = np.sort(np.asarray(bins))
+        index = np.digitize(years, edges)
+        # years before the first edge share the first bin
+        index[index == 0] = 1
+
+    index = np.where(years < start_year, index, -1)
+
+    return index
+
+
+def _merge(years, capacity):
+    """
+    Returns the capacity-weighted mean year of some vintages, rounded
+    to a year within them, and their total capacity.
+    """
+    if capacity.sum() > 0:
+        year = np.average(years, weights=capacity)
+    else:
+        year = years.mean()
+    year = int(np.clip(np.round(year), years.min(), years.max()))
+
+    return year, capacity.sum()
+
+
+def bin_vintages(existing,
+                 bins,
+                 start_year,
+                 tolerance=None,
+                 lifetime=np.inf,
+                 periods=None):
+    """
+    Merges the vintages of existing capacity into bins.
+
+    With a ``tolerance``, the bin whose merge changes the surviving
+    capacity the most is split in two, at its middle vintage, until the
+    ``retirement_error`` is within the tolerance.
+
+    Parameters
+    ----------
+    existing : dictionary
+        The existing capacity with years as keys and capacity as values.
+    bins : integer or list of integers
+        The bin width in years, or the bin edges.
+    start_year : integer
+        The first year of the model. Later vintages are not binned.
+    tolerance : float
+        The largest allowed error in surviving capacity, as a fraction
+        of the total existing capacity. Default is None (no limit).
+    lifetime : float
+        The lifetime of the technology. Used with ``tolerance``.
+    periods : array-like
+        The model periods. Required with ``tolerance``.
+
+    Returns
+    -------
+    binned : dictionary
+        The existing capacity of each bin, at the capacity-weighted
+        mean year of the bin.
+    """
+    if len(existing) == 0:
+        return {}
+    if (tolerance is not None) and (periods is None):
+        raise ValueError("Binning with a tolerance requires the periods.")
+
+    years = np.array(list(existing.keys()), dtype=int)
+    capacity = np.array(list(existing.values()), dtype=float)
+    index = bin_index(years, bins, start_year)
+
+    groups = [np.flatnonzero(index == k) for k in np.unique(index[index >= 0])]
+    while True:
+        binned = {}
+        for members in groups:
+            year, cap = _merge(years[members], capacity[members])
+            binned[year] = binned.get(year, 0.0) + cap
+        for year, cap in zip(years[index < 0], capacity[index < 0]):
+            binned[int(year)] = binned.get(int(year), 0.0) + cap
+
+        if (tolerance is None) or (retirement_error(existing,
+                                                    binned,
+                                                    lifetime,
+                                                    periods) <= tolerance):
+            break
+
+        # the largest change in surviving capacity caused by each bin
+        errors = []
+        for members in groups:
+            original = dict(zip(years[members], capacity[members]))
+            merged = dict([_merge(years[members], capacity[members])])
+            errors.append(np.abs(
+                surviving_capacity(merged, lifetime, periods) -
+                surviving_capacity(original, lifetime, periods)).max())
+        worst = int(np.argmax(errors))
+        if errors[worst] == 0:
+            break
+        members = groups.pop(worst)
+        members = members[np.argsort(years[members])]
+        half = len(members) // 2
+        groups += [members[:half], members[half:]]
+
+    return dict(sorted(binned.items()))
+
+
+def surviving_capacity(existing, lifetime, periods):
+    """
+    Returns the existing capacity still operating in each period.
+    """
+    if len(existing) == 0:
+        return np.zeros(len(periods))
+    years = np.array(list(existing.keys()), dtype=float)
+    capacity = np.array(list(existing.values()), dtype=float)
+    age = np.asarray(periods, dtype=float)[:, None] - years[None, :]
+    alive = (age >= 0) & (age < lifetime)
+
+    return (alive * capacity[None, :]).sum(axis=1)
+
+
+def retirement_error(existing, binned, lifetime, periods):
+    """
+    Returns the largest difference in surviving capacity between the
+    original and binned vintages, over the model periods, as a fraction
+    of the total existing capacity.
+    """
+    total = np.sum(list(existing.values()))
+    if total == 0:
+        return 0.0
+    difference = np.abs(surviving_capacity(binned, lifetime, periods) -
+                        surviving_capacity(existing, lifetime, periods))
+
+    return float(difference.max() / total)
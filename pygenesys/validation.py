@@ -0,0 +1,221 @@
+"""
+This file checks a ``ModelInfo`` before its database is written.
+
+Errors in the input data otherwise surface as SQLite CHECK or foreign key
+failures partway through the build, or not at all until Temoa runs. Each
+check collects every violation, with the technology or commodity, the
+region, and the time slice or year, so that all of them can be reported
+at once. Profiles are stacked into one array per check and compared in a
+single NumPy operation.
+
+The checks are
+    * capacity factors are on the interval [0, 1],
+    * efficiencies are positive,
+    * each demand distribution is on [0, 1] and sums to one,
+    * every region of a technology has a lifetime,
+    * cost dictionaries have a value for every model year,
+    * emissions limits are only given for model years.
+"""
+
+import numpy as np
+
+# tolerance for the sum of a demand distribution
+distribution_tolerance = 1e-3
+
+# the number of time slices listed per profile in an error message
+N_listed = 5
+
+
+def _stack(profiles, N_slices):
+    """
+    Stacks profiles into one array with a row per profile. Profiles
+    are truncated to ``N_slices``, as in ``db_creator``, and short
+    profiles are padded.
+
+    Returns
+    -------
+    table : NumPy array
+        The profiles, padded with NaN.
+    filled : NumPy array
+        True where the table holds data.
+    """
+    table = np.full((len(profiles), N_slices), np.nan)
+    filled = np.zeros((len(profiles), N_slices), dtype=bool)
+    for i, profile in enumerate(profiles):
+        data = np.ravel(np.asarray(profile, dtype=float))[:N_slices]
+        table[i, :len(data)] = data
+        filled[i, :len(data)] = True
+
+    return table, filled
+
+
+def _slice_errors(labels, table, bad, N_hours, message):
+    """
+    Returns one error per profile with bad time slices, listing the
+    season and hour of the first few.
+    """
+    errors = []
+    rows, cols = np.nonzero(bad)
+    for row in np.unique(rows):
+        row_cols = cols[rows == row]
+        slices = ', '.join(f'season {col // N_hours} hour {col % N_hours} '
+                           f'({table[row, col]:g})'
+                           for col in row_cols[:N_listed])
+        if len(row_cols) > N_listed:
+            slices += f', and {len(row_cols) - N_listed} more'
+        errors.append(f'{labels[row]}: {message} at {slices}.')
+
+    return errors
+
+
+def check_capacity_factors(technologies, N_seasons, N_hours):
+    """
+    Returns the capacity factors outside of [0, 1].
+    """
+    errors = []
+    labels = []
+    profiles = []
+    for tech in technologies:
+        regions, values = tech.parameters.column('capacity_factor_tech')
+        for region in np.array(regions)[~((values >= 0) & (values <= 1))]:
+            errors.append(f'CapacityFactorTech: {tech.tech_name} in '
+                          f'{region}: {tech.capacity_factor_tech[region]:g} '
+                          'is outside [0, 1].')
+        for region, data in tech.capacity_factor_tech.items():
+            if isinstance(data, (list, np.ndarray)):
+                labels.append(f'CapacityFactorTech: {tech.tech_name} in '
+                              f'{region}')
+                profiles.append(data)
+
+    table, filled = _stack(profiles, N_seasons * N_hours)
+    bad = filled & ~((table >= 0) & (table <= 1))
+    errors += _slice_errors(labels, table, bad, N_hours,
+                            'outside [0, 1]')
+
+    return errors
+
+
+def check_efficiencies(technologies):
+    """
+    Returns the efficiencies that are not positive.
+    """
+    errors = []
+    for tech in technologies:
+        regions, values = tech.parameters.column('efficiency')
+        for region in np.array(regions)[~(values > 0)]:
+            errors.append(f'Efficiency: {tech.tech_name} in {region}: '
+                          f'{tech.efficiency[region]:g} is not positive.')
+        for region, data in tech.efficiency.items():
+            if isinstance(data, (list, tuple, np.ndarray)):
+                data = np.asarray(data, dtype=float)
+                if not np.all(data > 0):
+                    errors.append(f'Efficiency: {tech.tech_name} in '
+                                  f'{region}: {list(data)} are not all '
+                                  'positive.')
+
+    return errors
+
+
+def check_distributions(demands, N_seasons, N_hours):
+    """
+    Returns the demand distributions that are outside of [0, 1] or do
+    not sum to one.
+    """
+    labels = []
+    profiles = []
+    for demand in demands:
+        for region, data in demand.distribution.items():
+            labels.append(f'DemandSpecificDistribution: {demand.comm_name} '
+                          f'in {region}')
+            profiles.append(data)
+
+    table, filled = _stack(profiles, N_seasons * N_hours)
+    bad = filled & ~((table >= 0) & (table <= 1))
+    errors = _slice_errors(labels, table, bad, N_hours, 'outside [0, 1]')
+
+    totals = np.where(filled, table, 0).sum(axis=1)
+    for row in np.flatnonzero(np.abs(totals - 1) > distribution_tolerance):
+        errors.append(f'{labels[row]}: sums to {totals[row]:g}, not 1.')
+
+    return errors
+
+
+def check_lifetimes(technologies):
+    """
+    Returns the technology regions without a lifetime.
+    """
+    errors = []
+    for tech in technologies:
+        missing = [r for r in tech.regions if r not in tech.tech_lifetime]
+        if len(missing) > 0:
+            errors.append(f'LifetimeTech: {tech.tech_name} has no '
+                          f'tech_lifetime in {missing}.')
+
+    return errors
+
+
+def check_costs(technologies, time_horizon):
+    """
+    Returns the cost dictionaries that are missing model years.
+    """
+    errors = []
+    years = np.array(time_horizon)
+    for tech in technologies:
+        for name in ['cost_invest', 'cost_fixed', 'cost_variable']:
+            for region, data in getattr(tech, name).items():
+                if not isinstance(data, dict):
+                    continue
+                missing = years[~np.isin(years, list(data))]
+                if len(missing) > 0:
+                    errors.append(f'{name}: {tech.tech_name} in {region} '
+                                  f'has no cost for {missing.tolist()}.')
+
+    return errors
+
+
+def check_emissions_limits(emissions, time_horizon):
+    """
+    Returns the emissions limits given for years outside the model.
+    """
+    errors = []
+    for emis in emissions:
+        for region, data in emis.emissions_limit.items():
+            years = np.array(list(data))
+            extra = years[~np.isin(years, time_horizon)]
+            if len(extra) > 0:
+                errors.append(f'EmissionLimit: {emis.comm_name} in {region} '
+                              f'has limits for {extra.tolist()}, which are '
+                              'not model years.')
+
+    return errors
+
+
+def validate(model):
+    """
+    Runs every check on a model.
+
+    Parameters
+    ----------
+    model : ``ModelInfo``
+        The model to check.
+
+    Returns
+    -------
+    errors : list of strings
+        The violations found. Empty if the model is valid.
+    """
+    technologies = model.technologies
+    errors = []
+    errors += check_capacity_factors(technologies,
+                                     model.N_seasons,
+                                     model.N_hours)
+    errors += check_efficiencies(technologies)
+    errors += check_distributions(model.commodities['demand'],
+                                  model.N_seasons,
+                                  model.N_hours)
+    errors += check_lifetimes(technologies)
+    errors += check_costs(technologies, model.time_horizon)
+    errors += check_emissions_limits(model.commodities['emissions'],
+                                     model.time_horizon)
+
+    return errors
@@ -36,7 +36,8 @@ opts = dict(name=NAME,
             packages=PACKAGES,
             package_data=PACKAGE_DATA,
             install_requires=REQUIRES,
-            extras_require={'docs': ['m2r2', 'sphinx']},
+            extras_require={'docs': ['m2r2', 'sphinx'],
+                            'parquet': ['pyarrow']},
             python_requires=PYTHON_REQUIRES,
             setup_requires=SETUP_REQUIRES,
             requires=REQUIRES,